@@ -66,10 +66,25 @@ class StorageConfig(BaseModel):
 
 class FFmpegConfig(BaseModel):
     threads: int = 4
+    # Threads given to each heavy libx264 encode (compress/convert). Concurrent encodes
+    # are capped at cpu_count // encode_threads_per_job to avoid oversubscription.
+    encode_threads_per_job: int = 4
+    # Threads per ffmpeg encode in VideoEditorService; 0 = cpu_count divided across
+    # concurrently running editor encodes.
+    threads_per_invocation: int = 0
+    # Most scenes VideoEditorService stitches in one ffmpeg pass. Each scene is its own
+    # seeked input (demuxer + decoder) in that process, so keep this small on
+    # memory-constrained workers; 0 always uses per-scene segment files.
+    single_pass_max_scenes: int = 8
     video_output_format: str = "mp4"
     video_codec: str = "libx264"
     audio_codec: str = "aac"
     video_bitrate: str = "2M"
+    # VideoEditorService encodes: "crf" (quality-targeted, faster) or "bitrate" to
+    # encode at video_bitrate when predictable file sizes matter.
+    video_rate_control: str = "crf"
+    video_crf: int = 23
+    video_preset: str = "veryfast"
 
 
 class ProcessingConfig(BaseModel):
@@ -165,12 +180,22 @@ class VectorMatchingConfig(BaseModel):
     grounding_sample_frames: int = 3  # Frames to analyze per clip
     grounding_weight: float = 0.15  # Reduced from 0.30 (entailment now higher priority)
     grounding_requires_action_binding: bool = True  # NEW: Verify WHO-DOES-WHAT
+    grounding_nlp_batch_size: int = 32  # Script segments per spaCy nlp.pipe() batch
+    grounding_mp_threshold: int = 64  # Uncached segments needed before nlp.pipe() uses multiple processes
+    grounding_concurrency: int = 8  # In-flight Memories.ai frame queries per grounding pass
+    grounding_batch_queries: bool = True  # Ask about uncached frames in batched chat requests
+    grounding_batch_size: int = 10  # Frames per batched grounding request
+    grounding_store_raw_response: bool = False  # Keep a 512-char response snippet in cached frames (debugging)
+    grounding_requests_per_second: float = 10.0  # Memories.ai grounding request rate (0 = unlimited)
+    grounding_request_burst: int = 1  # Requests allowed to start back-to-back before the rate applies
+    grounding_min_candidates: int = 0  # Skip grounding at or below this many candidates (0 = never; opt-in)
     
     # Visual Entailment Settings (NEW - highest priority verification)
     # Based on Chen et al. "Explainable Video Entailment with Grounded Visual Evidence" (ICCV 2021)
     enable_visual_entailment: bool = True
     entailment_threshold: float = 0.70  # Minimum confidence for ENTAIL judgment
     entailment_frame_samples: int = 5  # Frames to sample for entailment check
+    entailment_max_concurrency: int = 8  # In-flight Memories.ai entailment queries per batch
     
     # Rebalanced Weights (entailment prioritized over semantic similarity)
     # Total should sum to ~1.0 for normalized scoring
@@ -419,6 +444,18 @@ class Settings(BaseSettings):
                 threads = get_int("FFMPEG_THREADS")
                 if threads is not None:
                     set_path(("ffmpeg", "threads"), threads)
+            if env.get("FFMPEG_ENCODE_THREADS_PER_JOB") is not None:
+                v = get_int("FFMPEG_ENCODE_THREADS_PER_JOB")
+                if v is not None:
+                    set_path(("ffmpeg", "encode_threads_per_job"), v)
+            if env.get("FFMPEG_THREADS_PER_INVOCATION") is not None:
+                v = get_int("FFMPEG_THREADS_PER_INVOCATION")
+                if v is not None:
+                    set_path(("ffmpeg", "threads_per_invocation"), v)
+            if env.get("FFMPEG_SINGLE_PASS_MAX_SCENES") is not None:
+                v = get_int("FFMPEG_SINGLE_PASS_MAX_SCENES")
+                if v is not None:
+                    set_path(("ffmpeg", "single_pass_max_scenes"), v)
             if env.get("VIDEO_OUTPUT_FORMAT") is not None:
                 set_path(("ffmpeg", "video_output_format"), get("VIDEO_OUTPUT_FORMAT"))
             if env.get("VIDEO_CODEC") is not None:
@@ -427,6 +464,14 @@ class Settings(BaseSettings):
                 set_path(("ffmpeg", "audio_codec"), get("AUDIO_CODEC"))
             if env.get("VIDEO_BITRATE") is not None:
                 set_path(("ffmpeg", "video_bitrate"), get("VIDEO_BITRATE"))
+            if env.get("VIDEO_RATE_CONTROL") is not None:
+                set_path(("ffmpeg", "video_rate_control"), get("VIDEO_RATE_CONTROL"))
+            if env.get("VIDEO_CRF") is not None:
+                v = get_int("VIDEO_CRF")
+                if v is not None:
+                    set_path(("ffmpeg", "video_crf"), v)
+            if env.get("VIDEO_PRESET") is not None:
+                set_path(("ffmpeg", "video_preset"), get("VIDEO_PRESET"))
 
             # Features (legacy vars)
             if env.get("ENABLE_SCENE_MATCHER") is not None:
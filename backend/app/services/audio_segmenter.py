@@ -481,54 +481,44 @@ class AudioSegmenter:
         
         print(f"🔗 Concatenating {len(audio_files)} audio files...", flush=True)
         
-        # Create a temporary file list for FFmpeg concat
-        list_file = output_path + ".list.txt"
-        try:
-            with open(list_file, "w") as f:
-                for audio_file in audio_files:
-                    # FFmpeg concat requires escaped paths
-                    escaped_path = audio_file.replace("'", "'\\''")
-                    f.write(f"file '{escaped_path}'\n")
-            
-            # Use FFmpeg concat demuxer
+        # FFmpeg concat list, assembled once and fed over stdin (no temp list file).
+        # Absolute paths: relative entries can't be resolved against a pipe.
+        listing = "".join(
+            "file '{}'\n".format(os.path.abspath(audio_file).replace("'", "'\\''"))
+            for audio_file in audio_files
+        ).encode("utf-8")
+        concat_input = ["-f", "concat", "-safe", "0", "-protocol_whitelist", "pipe,file", "-i", "pipe:0"]
+
+        # Use FFmpeg concat demuxer
+        cmd = [
+            "ffmpeg",
+            "-y",
+            *concat_input,
+            "-c", "copy",  # Stream copy (fast, no re-encoding)
+            output_path
+        ]
+        
+        result = run_ffmpeg_capture(cmd, check=False, input=listing)
+
+        if result.returncode != 0:
+            print(f"⚠️ Stream copy failed, re-encoding...", flush=True)
             cmd = [
                 "ffmpeg",
                 "-y",
-                "-f", "concat",
-                "-safe", "0",
-                "-i", list_file,
-                "-c", "copy",  # Stream copy (fast, no re-encoding)
+                *concat_input,
+                "-acodec", "libmp3lame",
+                "-ar", "44100",
+                "-ac", "2",
+                "-b:a", "192k",
                 output_path
             ]
-            
-            result = run_ffmpeg_capture(cmd, check=False)
-
-            if result.returncode != 0:
-                print(f"⚠️ Stream copy failed, re-encoding...", flush=True)
-                cmd = [
-                    "ffmpeg",
-                    "-y",
-                    "-f", "concat",
-                    "-safe", "0",
-                    "-i", list_file,
-                    "-acodec", "libmp3lame",
-                    "-ar", "44100",
-                    "-ac", "2",
-                    "-b:a", "192k",
-                    output_path
-                ]
-                run_ffmpeg(cmd)
-            
-            # Get duration of concatenated file
-            duration = self._get_audio_duration(output_path)
-            print(f"✅ Concatenated audio: {duration:.2f}s total", flush=True)
-            
-            return output_path
-            
-        finally:
-            # Clean up temp list file
-            if os.path.exists(list_file):
-                os.remove(list_file)
+            run_ffmpeg_capture(cmd, check=True, input=listing)
+        
+        # Get duration of concatenated file
+        duration = self._get_audio_duration(output_path)
+        print(f"✅ Concatenated audio: {duration:.2f}s total", flush=True)
+        
+        return output_path
     
     def _get_audio_duration(self, file_path: str) -> float:
         """Get duration of an audio file using ffprobe."""
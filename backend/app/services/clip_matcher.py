@@ -115,6 +115,13 @@ class ClipMatcher:
         
         print(f"  📊 Video duration: {video_duration:.1f}s, partitions: {num_partitions}, max per partition: {max_clips_per_partition}", flush=True)
         
+        # Parse every segment's grounding requirements up front in one nlp.pipe() pass
+        segment_requirements = None
+        if self.visual_grounding_filter:
+            segment_requirements = self.visual_grounding_filter.extract_visual_requirements_batch(
+                [seg['text'] for seg in script_segments]
+            )
+        
         for idx, script_seg in enumerate(script_segments):
             print(f"  Matching segment {idx + 1}/{len(script_segments)}", flush=True)
             
@@ -160,7 +167,8 @@ class ClipMatcher:
                     script_segment=script_seg['text'],
                     video_no=video_no,
                     candidate_clips=candidates,
-                    min_grounding_score=grounding_threshold
+                    min_grounding_score=grounding_threshold,
+                    requirements=segment_requirements[idx]
                 )
                 
                 # If no candidates pass strict grounding, try relaxed threshold
@@ -171,7 +179,8 @@ class ClipMatcher:
                         script_segment=script_seg['text'],
                         video_no=video_no,
                         candidate_clips=candidates,
-                        min_grounding_score=relaxed_threshold
+                        min_grounding_score=relaxed_threshold,
+                        requirements=segment_requirements[idx]
                     )
                 
                 # Ultimate fallback: use top semantic match with grounding warning
@@ -200,16 +209,39 @@ class ClipMatcher:
                 entailment_threshold = getattr(self.vector_config, 'entailment_threshold', 0.70)
                 entailment_verified = []
                 
-                # Verify entailment for each candidate
-                from app.services.visual_entailment_verifier import EntailmentJudgment
+                # Verify every candidate in one batch (shared claim extraction, one cache
+                # MGET, concurrent Memories.ai calls); keep decisions are NumPy masks
+                try:
+                    batch = await self.entailment_verifier.verify_entailment_batch(
+                        candidates=validated_candidates,
+                        script_segment=script_seg['text'],
+                        video_no=video_no
+                    )
+                except Exception as e:
+                    print(f"    ⚠️ Entailment verification error: {e}", flush=True)
+                    batch = None
                 
-                for candidate in validated_candidates:
-                    try:
-                        entailment_result = await self.entailment_verifier.verify_entailment(
-                            clip_info=candidate,
-                            script_segment=script_seg['text'],
-                            video_no=video_no
-                        )
+                if batch is None:
+                    # On error, include candidates with neutral score
+                    for candidate in validated_candidates:
+                        candidate = candidate.copy()
+                        candidate['entailment_score'] = 0.5
+                        candidate['entailment_warning'] = True
+                        entailment_verified.append(candidate)
+                else:
+                    # STRICT FILTER: Only keep ENTAIL judgments with sufficient confidence;
+                    # NEUTRAL with moderate confidence is kept but flagged
+                    entailed = batch.entailed_mask(entailment_threshold)
+                    neutral = batch.neutral_mask(0.5)
+                    
+                    for i, (candidate, entailment_result) in enumerate(batch):
+                        if batch.failed[i]:
+                            # On error, include candidate with neutral score
+                            candidate = candidate.copy()
+                            candidate['entailment_score'] = 0.5
+                            candidate['entailment_warning'] = True
+                            entailment_verified.append(candidate)
+                            continue
                         
                         # Add entailment metadata to candidate
                         candidate = candidate.copy()
@@ -218,12 +250,9 @@ class ClipMatcher:
                         candidate['entailment_evidence'] = entailment_result.evidence
                         candidate['entailment_contradictions'] = entailment_result.contradictions
                         
-                        # STRICT FILTER: Only keep ENTAIL judgments with sufficient confidence
-                        if (entailment_result.judgment == EntailmentJudgment.ENTAIL and 
-                            entailment_result.confidence >= entailment_threshold):
+                        if entailed[i]:
                             entailment_verified.append(candidate)
-                        elif entailment_result.judgment == EntailmentJudgment.NEUTRAL and entailment_result.confidence >= 0.5:
-                            # NEUTRAL with moderate confidence - keep but flag
+                        elif neutral[i]:
                             candidate['entailment_warning'] = True
                             entailment_verified.append(candidate)
                         else:
@@ -233,14 +262,6 @@ class ClipMatcher:
                                 print(f"       Judgment: {entailment_result.judgment.value}, Confidence: {entailment_result.confidence:.2f}", flush=True)
                                 if entailment_result.contradictions:
                                     print(f"       Contradictions: {entailment_result.contradictions[:2]}", flush=True)
-                    
-                    except Exception as e:
-                        print(f"    ⚠️ Entailment verification error: {e}", flush=True)
-                        # On error, include candidate with neutral score
-                        candidate = candidate.copy()
-                        candidate['entailment_score'] = 0.5
-                        candidate['entailment_warning'] = True
-                        entailment_verified.append(candidate)
                 
                 # Fallback: if no candidates pass entailment, use best with warning
                 if not entailment_verified and validated_candidates:
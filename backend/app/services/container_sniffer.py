@@ -0,0 +1,337 @@
+"""
+Cheap container sniffing without spawning ffprobe.
+
+Reads only box/element headers from the file to identify the first video
+track's codec for the common containers (MP4/MOV and WebM/MKV), and for MP4/MOV
+the basic stream metadata from the moov box. Anything ambiguous returns None so
+callers fall back to ffprobe.
+"""
+
+from __future__ import annotations
+
+import os
+import struct
+from typing import BinaryIO, Dict, Iterator, Optional, Tuple
+
+# ISO-BMFF sample entry fourcc -> ffprobe codec_name
+_MP4_VIDEO_CODECS = {
+    b"avc1": "h264",
+    b"avc3": "h264",
+    b"hvc1": "hevc",
+    b"hev1": "hevc",
+    b"vp09": "vp9",
+    b"av01": "av1",
+    b"mp4v": "mpeg4",
+}
+
+# ISO-BMFF audio sample entry fourcc -> ffprobe codec_name ("mp4a" resolved via esds)
+_MP4_AUDIO_CODECS = {
+    b".mp3": "mp3",
+    b"ac-3": "ac3",
+    b"ec-3": "eac3",
+    b"Opus": "opus",
+    b"fLaC": "flac",
+    b"alac": "alac",
+}
+
+# esds objectTypeIndication -> ffprobe codec_name for "mp4a" entries
+_MP4A_OBJECT_TYPES = {
+    0x40: "aac",
+    0x66: "aac",
+    0x67: "aac",
+    0x68: "aac",
+    0x69: "mp3",
+    0x6B: "mp3",
+}
+
+# Matroska CodecID -> ffprobe codec_name
+_MKV_VIDEO_CODECS = {
+    b"V_MPEG4/ISO/AVC": "h264",
+    b"V_MPEGH/ISO/HEVC": "hevc",
+    b"V_VP9": "vp9",
+    b"V_VP8": "vp8",
+    b"V_AV1": "av1",
+}
+
+_EBML_MAGIC = b"\x1a\x45\xdf\xa3"
+_EBML_CODEC_ID = 0x86
+_EBML_SCAN_BYTES = 4096
+
+
+def _iter_boxes(f: BinaryIO, start: int, end: int) -> Iterator[Tuple[bytes, int, int]]:
+    """Yield (type, body_start, box_end) for ISO-BMFF boxes in [start, end)."""
+    pos = start
+    while pos + 8 <= end:
+        f.seek(pos)
+        header = f.read(8)
+        if len(header) < 8:
+            return
+        size, box_type = struct.unpack(">I4s", header)
+        header_len = 8
+        if size == 1:
+            ext = f.read(8)
+            if len(ext) < 8:
+                return
+            size = struct.unpack(">Q", ext)[0]
+            header_len = 16
+        elif size == 0:
+            size = end - pos
+        if size < header_len:
+            return
+        yield box_type, pos + header_len, pos + size
+        pos += size
+
+
+def _child(f: BinaryIO, start: int, end: int, box_type: bytes) -> Optional[Tuple[int, int]]:
+    for btype, body, bend in _iter_boxes(f, start, end):
+        if btype == box_type:
+            return body, bend
+    return None
+
+
+def _read_at(f: BinaryIO, pos: int, size: int) -> bytes:
+    f.seek(pos)
+    data = f.read(size)
+    if len(data) < size:
+        raise struct.error("truncated box")
+    return data
+
+
+def _trak_handler(f: BinaryIO, mdia: Tuple[int, int]) -> Optional[bytes]:
+    hdlr = _child(f, *mdia, b"hdlr")
+    if not hdlr:
+        return None
+    # hdlr: version/flags (4) + pre_defined (4) + handler_type (4)
+    return _read_at(f, hdlr[0] + 8, 4)
+
+
+def _trak_stbl(f: BinaryIO, mdia: Tuple[int, int]) -> Optional[Tuple[int, int]]:
+    minf = _child(f, *mdia, b"minf")
+    return _child(f, *minf, b"stbl") if minf else None
+
+
+def _first_sample_entry(f: BinaryIO, stbl: Tuple[int, int]) -> Optional[Tuple[bytes, int, int]]:
+    """Return (fourcc, body_start, entry_end) of the first stsd entry, or None."""
+    stsd = _child(f, *stbl, b"stsd")
+    if not stsd:
+        return None
+    # stsd: version/flags (4) + entry_count (4), then first entry header (size + fourcc)
+    entry_start = stsd[0] + 8
+    size, fourcc = struct.unpack(">I4s", _read_at(f, entry_start, 8))
+    return fourcc, entry_start + 8, min(entry_start + size, stsd[1])
+
+
+def _trak_video_fourcc(f: BinaryIO, start: int, end: int) -> Optional[bytes]:
+    """Return the first sample entry fourcc of a video trak, or None."""
+    mdia = _child(f, start, end, b"mdia")
+    if not mdia or _trak_handler(f, mdia) != b"vide":
+        return None
+    stbl = _trak_stbl(f, mdia)
+    entry = _first_sample_entry(f, stbl) if stbl else None
+    return entry[0] if entry else None
+
+
+def _sniff_mp4(f: BinaryIO, file_size: int) -> Optional[str]:
+    for box_type, body, box_end in _iter_boxes(f, 0, file_size):
+        if box_type != b"moov":
+            continue
+        for trak_type, trak_body, trak_end in _iter_boxes(f, body, box_end):
+            if trak_type != b"trak":
+                continue
+            fourcc = _trak_video_fourcc(f, trak_body, trak_end)
+            if fourcc:
+                return _MP4_VIDEO_CODECS.get(fourcc)
+        return None
+    return None
+
+
+def _timescale_duration(f: BinaryIO, box: Tuple[int, int]) -> Tuple[int, int]:
+    """Read (timescale, duration) from an mvhd or mdhd full box."""
+    version = _read_at(f, box[0], 1)[0]
+    if version == 1:
+        # version/flags (4) + creation (8) + modification (8)
+        return struct.unpack(">IQ", _read_at(f, box[0] + 20, 12))
+    # version/flags (4) + creation (4) + modification (4)
+    return struct.unpack(">II", _read_at(f, box[0] + 12, 8))
+
+
+def _frame_rate(f: BinaryIO, mdia: Tuple[int, int], stbl: Tuple[int, int]) -> Optional[str]:
+    """ffprobe-style "num/den" frame rate from mdhd timescale and stts deltas."""
+    mdhd = _child(f, *mdia, b"mdhd")
+    stts = _child(f, *stbl, b"stts")
+    if not mdhd or not stts:
+        return None
+    timescale, duration = _timescale_duration(f, mdhd)
+    # stts: version/flags (4) + entry_count (4) + (sample_count, sample_delta) entries
+    entry_count = struct.unpack(">I", _read_at(f, stts[0] + 4, 4))[0]
+    if entry_count == 1:
+        delta = struct.unpack(">I", _read_at(f, stts[0] + 12, 4))[0]
+        return f"{timescale}/{delta}" if delta else None
+    if not duration or entry_count * 8 > stts[1] - stts[0] - 8:
+        return None
+    # Variable frame rate: report the average like ffprobe's avg_frame_rate
+    entries = _read_at(f, stts[0] + 8, entry_count * 8)
+    samples = sum(count for count, _ in struct.iter_unpack(">II", entries))
+    return f"{samples * timescale}/{duration}"
+
+
+def _mp4a_codec(f: BinaryIO, body: int, entry_end: int) -> Tuple[Optional[str], int]:
+    """Resolve an mp4a entry's codec and average bitrate (0 if unknown) from esds."""
+    # AudioSampleEntry fields (28 bytes) precede the child boxes; QuickTime
+    # sound description versions 1 and 2 append 16 and 36 more bytes
+    version = struct.unpack(">H", _read_at(f, body + 8, 2))[0]
+    esds = _child(f, body + 28 + {1: 16, 2: 36}.get(version, 0), entry_end, b"esds")
+    if not esds:
+        return None, 0
+    data = _read_at(f, esds[0], min(esds[1] - esds[0], 64))
+    pos = 4  # version/flags
+    while pos + 2 <= len(data):
+        tag = data[pos]
+        pos += 1
+        # Descriptor size is a 7-bit vint of up to four bytes
+        for _ in range(4):
+            more = data[pos] & 0x80
+            pos += 1
+            if not more:
+                break
+        if tag == 0x03:
+            flags = data[pos + 2]
+            pos += 3  # ES_ID (2) + flags (1)
+            if flags & 0x80:
+                pos += 2  # dependsOn_ES_ID
+            if flags & 0x40:
+                pos += 1 + data[pos]  # URL
+            if flags & 0x20:
+                pos += 2  # OCR_ES_ID
+        elif tag == 0x04:
+            # objectTypeIndication (1) + streamType (1) + bufferSize (3) + maxBitrate (4) + avgBitrate (4)
+            object_type = data[pos]
+            avg_bitrate = struct.unpack(">I", data[pos + 9:pos + 13])[0]
+            return _MP4A_OBJECT_TYPES.get(object_type), avg_bitrate
+        else:
+            return None, 0
+    return None, 0
+
+
+def _probe_moov(f: BinaryIO, moov: Tuple[int, int], file_size: int) -> Optional[Dict]:
+    mvhd = _child(f, *moov, b"mvhd")
+    if not mvhd:
+        return None
+    timescale, duration = _timescale_duration(f, mvhd)
+    if not timescale or not duration or duration == 0xFFFFFFFF:
+        return None  # fragmented or live-recorded file without a real duration
+    duration_s = duration / timescale
+
+    video: Optional[Dict] = None
+    audio: Optional[Dict] = None
+    for trak_type, trak_body, trak_end in _iter_boxes(f, *moov):
+        if trak_type != b"trak":
+            continue
+        mdia = _child(f, trak_body, trak_end, b"mdia")
+        if not mdia:
+            continue
+        handler = _trak_handler(f, mdia)
+        stbl = _trak_stbl(f, mdia)
+        entry = _first_sample_entry(f, stbl) if stbl else None
+        if not entry:
+            continue
+        fourcc, body, entry_end = entry
+
+        if handler == b"vide" and video is None:
+            codec = _MP4_VIDEO_CODECS.get(fourcc)
+            frame_rate = _frame_rate(f, mdia, stbl)
+            if not codec or not frame_rate:
+                return None
+            # VisualSampleEntry: reserved/data_reference_index (8) + pre_defined/reserved (16),
+            # then coded width/height as uint16
+            width, height = struct.unpack(">HH", _read_at(f, body + 24, 4))
+            video = {
+                "codec_type": "video",
+                "codec_name": codec,
+                "width": width,
+                "height": height,
+                "r_frame_rate": frame_rate,
+            }
+        elif handler == b"soun" and audio is None:
+            if fourcc == b"mp4a":
+                codec, bitrate = _mp4a_codec(f, body, entry_end)
+            else:
+                codec, bitrate = _MP4_AUDIO_CODECS.get(fourcc), 0
+            audio = {"codec_type": "audio", "codec_name": codec}
+            if bitrate:
+                audio["bit_rate"] = str(bitrate)
+
+    if video is None:
+        return None
+    return {
+        "format": {
+            "duration": f"{duration_s:.6f}",
+            "bit_rate": str(int(file_size * 8 / duration_s)),
+        },
+        "streams": [video],
+        "audio_streams": [audio] if audio else [],
+    }
+
+
+def probe_mp4(path: str) -> Optional[Dict]:
+    """
+    Read duration, dimensions, frame rate and codecs from an MP4/MOV moov box.
+
+    Top-level boxes are walked by size, so a moov at the end of the file (after
+    mdat) costs a seek rather than a read of the media data.
+
+    Args:
+        path: Path to the media file
+
+    Returns:
+        Dict shaped like ffmpeg_utils.probe_media() output ("format", "streams",
+        "audio_streams"), or None when the file isn't a plain MP4/MOV, has no
+        recognized video track, or can't be parsed - callers should then ffprobe.
+    """
+    try:
+        with open(path, "rb") as f:
+            if _read_at(f, 4, 4) != b"ftyp":
+                return None
+            file_size = os.fstat(f.fileno()).st_size
+            for box_type, body, box_end in _iter_boxes(f, 0, file_size):
+                if box_type == b"moov":
+                    return _probe_moov(f, (body, min(box_end, file_size)), file_size)
+    except (OSError, struct.error, IndexError):
+        return None
+    return None
+
+
+def _sniff_ebml(head: bytes) -> Optional[str]:
+    # Track entries sit near the start of WebM/MKV files; look for the first
+    # CodecID element (ID 0x86, 1-byte size vint) whose value is a video codec.
+    idx = head.find(b"V_")
+    while idx >= 2:
+        if head[idx - 2] == _EBML_CODEC_ID and head[idx - 1] & 0x80:
+            length = head[idx - 1] & 0x7F
+            codec_id = head[idx:idx + length]
+            return _MKV_VIDEO_CODECS.get(codec_id)
+        idx = head.find(b"V_", idx + 1)
+    return None
+
+
+def sniff_video_codec(path: str) -> Optional[str]:
+    """
+    Identify the first video track's codec from container headers.
+
+    Args:
+        path: Path to the media file
+
+    Returns:
+        ffprobe-style codec name (e.g. "h264", "hevc", "vp9"), or None when the
+        container isn't recognized or the codec can't be determined cheaply.
+    """
+    try:
+        with open(path, "rb") as f:
+            head = f.read(_EBML_SCAN_BYTES)
+            if head[4:8] == b"ftyp":
+                return _sniff_mp4(f, os.fstat(f.fileno()).st_size)
+            if head.startswith(_EBML_MAGIC):
+                return _sniff_ebml(head)
+    except (OSError, struct.error):
+        return None
+    return None
@@ -1,7 +1,13 @@
+import asyncio
+import json
 import re
 import subprocess
+import threading
+import weakref
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Optional, Sequence
+from functools import lru_cache
+from typing import Callable, Optional, Sequence
 import os
 
 
@@ -111,7 +117,13 @@ def _inject_threads(cmd_list: list[str]) -> list[str]:
     if base not in {"ffmpeg", "ffmpeg.exe"}:
         return cmd_list
 
-    if "-threads" in cmd_list:
+    # Only an input-side -threads (before the first -i) counts; an output-side one
+    # sizes the encoder and should not lift the cap on the decoder.
+    try:
+        first_input = cmd_list.index("-i")
+    except ValueError:
+        first_input = len(cmd_list)
+    if "-threads" in cmd_list[:first_input]:
         return cmd_list
 
     raw = os.getenv("FFMPEG_THREADS")
@@ -136,6 +148,44 @@ def _inject_threads(cmd_list: list[str]) -> list[str]:
     return cmd_list
 
 
+def resolve_encode_threads(default: int) -> int:
+    """
+    Threads to give a single heavy encode.
+
+    FFMPEG_THREADS (the worker sets it to 1 for OOM safety) wins over the
+    configured per-job default so explicit output-side -threads never raises it.
+    """
+    raw = os.getenv("FFMPEG_THREADS")
+    if raw:
+        try:
+            threads = int(raw)
+            if threads > 0:
+                return threads
+        except Exception:
+            pass
+    return max(1, int(default))
+
+
+_encode_semaphore: Optional[threading.BoundedSemaphore] = None
+_encode_semaphore_lock = threading.Lock()
+
+
+def get_encode_semaphore(threads_per_job: int) -> threading.BoundedSemaphore:
+    """
+    Process-wide semaphore bounding concurrent heavy encodes.
+
+    Sized once, on first use, to cpu_count // threads_per_job so that parallel
+    jobs each get a fixed slice of cores instead of oversubscribing them.
+    """
+    global _encode_semaphore
+    if _encode_semaphore is None:
+        with _encode_semaphore_lock:
+            if _encode_semaphore is None:
+                slots = max(1, (os.cpu_count() or 1) // max(1, threads_per_job))
+                _encode_semaphore = threading.BoundedSemaphore(slots)
+    return _encode_semaphore
+
+
 def _tail_text(s: str, *, max_lines: int = 25, max_chars: int = 4000) -> str:
     if not s:
         return ""
@@ -148,30 +198,107 @@ def _tail_text(s: str, *, max_lines: int = 25, max_chars: int = 4000) -> str:
     return out
 
 
+# Read size for ffmpeg's stdout/stderr pipes. Large reads keep syscall counts low
+# when ffmpeg streams progress/stats lines for the whole encode.
+_PIPE_CHUNK_BYTES = 1 << 20
+
+
+def _drain(stream, chunks: list[bytes]) -> None:
+    try:
+        while True:
+            chunk = stream.read(_PIPE_CHUNK_BYTES)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    finally:
+        stream.close()
+
+
+def _feed(stream, data: bytes) -> None:
+    try:
+        stream.write(data)
+    except BrokenPipeError:
+        pass  # ffmpeg exited early; its stderr explains why
+    finally:
+        try:
+            stream.close()
+        except BrokenPipeError:
+            pass
+
+
+def _run_drained(
+    cmd_list: list[str],
+    *,
+    timeout: Optional[float],
+    text: bool,
+    input: Optional[bytes] = None,
+) -> subprocess.CompletedProcess:
+    """
+    subprocess.run(capture_output=True) equivalent that drains stdout and stderr on
+    dedicated threads with 1 MiB buffered reads, so ffmpeg never blocks on a full
+    pipe while writing progress lines. `input`, if given, is written to stdin on
+    another thread and stdin is then closed.
+    """
+    proc = subprocess.Popen(
+        cmd_list,
+        stdin=subprocess.DEVNULL if input is None else subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        bufsize=_PIPE_CHUNK_BYTES,
+    )
+    out_chunks: list[bytes] = []
+    err_chunks: list[bytes] = []
+    readers = [
+        threading.Thread(target=_drain, args=(proc.stdout, out_chunks), daemon=True),
+        threading.Thread(target=_drain, args=(proc.stderr, err_chunks), daemon=True),
+    ]
+    if input is not None:
+        readers.append(threading.Thread(target=_feed, args=(proc.stdin, input), daemon=True))
+    for reader in readers:
+        reader.start()
+
+    def _collect(chunks: list[bytes]):
+        data = b"".join(chunks)
+        return data.decode("utf-8", errors="replace") if text else data
+
+    try:
+        proc.wait(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+        for reader in readers:
+            reader.join()
+        raise subprocess.TimeoutExpired(
+            cmd_list, timeout, output=_collect(out_chunks), stderr=_collect(err_chunks)
+        )
+
+    for reader in readers:
+        reader.join()
+    return subprocess.CompletedProcess(cmd_list, proc.returncode, _collect(out_chunks), _collect(err_chunks))
+
+
 def run_ffmpeg_capture(
     cmd: Sequence[str],
     *,
     check: bool = True,
     timeout: Optional[float] = None,
     text: bool = True,
+    input: Optional[bytes] = None,
 ) -> subprocess.CompletedProcess:
     """
     Run ffmpeg with robust defaults:
     - inject -nostdin to prevent background hangs
     - capture output for diagnostics
     - optionally raise FFmpegError with sanitized stderr
+
+    `input` is piped to ffmpeg's stdin (read via `-i pipe:0`); -nostdin only turns
+    off interactive key handling, not pipe inputs.
     """
     cmd_list = _inject_nostdin(cmd)
     cmd_list = _inject_threads(cmd_list)
 
     try:
-        proc = subprocess.run(
-            cmd_list,
-            capture_output=True,
-            text=text,
-            timeout=timeout,
-            check=False,
-        )
+        proc = _run_drained(cmd_list, timeout=timeout, text=text, input=input)
     except subprocess.TimeoutExpired as e:
         stderr = getattr(e, "stderr", "") or ""
         raise FFmpegError(
@@ -212,9 +339,60 @@ def run_ffmpeg_capture(
     return proc
 
 
-def run_ffmpeg(cmd: Sequence[str], *, timeout: Optional[float] = None) -> None:
-    """Run ffmpeg and raise FFmpegError on failure."""
-    run_ffmpeg_capture(cmd, check=True, timeout=timeout)
+def parse_ffmpeg_progress(output: str) -> Optional[dict[str, str]]:
+    """
+    Parse the final block of ffmpeg `-progress` key=value output.
+
+    Returns the key/value pairs of the last block (the one ending in
+    `progress=end` when ffmpeg finished cleanly), or None if no progress
+    output is present.
+    """
+    if not output or "progress=" not in output:
+        return None
+
+    block: dict[str, str] = {}
+    last: Optional[dict[str, str]] = None
+    for line in output.splitlines():
+        key, sep, value = line.strip().partition("=")
+        if not sep:
+            continue
+        block[key] = value
+        if key == "progress":
+            last = block
+            block = {}
+    return last
+
+
+def run_ffmpeg_with_hw_fallback(
+    build_cmd: Callable[[bool], Sequence[str]],
+    *,
+    timeout: Optional[float] = None,
+) -> Optional[dict[str, str]]:
+    """
+    Run build_cmd(True) (hardware decode); if it fails, retry once with build_cmd(False).
+
+    No retry happens when both commands are identical (no hardware decode in play).
+    """
+    hw_cmd = list(build_cmd(True))
+    try:
+        return run_ffmpeg(hw_cmd, timeout=timeout)
+    except FFmpegError as e:
+        sw_cmd = list(build_cmd(False))
+        if sw_cmd == hw_cmd:
+            raise
+        print(f"⚠️ Hardware-decoded encode failed, retrying with software decode: {e.message[:200]}", flush=True)
+        return run_ffmpeg(sw_cmd, timeout=timeout)
+
+
+def run_ffmpeg(cmd: Sequence[str], *, timeout: Optional[float] = None) -> Optional[dict[str, str]]:
+    """
+    Run ffmpeg and raise FFmpegError on failure.
+
+    If the command includes `-progress pipe:1`, returns the final progress block
+    (e.g. total_size, out_time_us, progress=end); otherwise None.
+    """
+    proc = run_ffmpeg_capture(cmd, check=True, timeout=timeout)
+    return parse_ffmpeg_progress(proc.stdout or "")
 
 
 def run_ffprobe_capture(
@@ -264,3 +442,312 @@ def run_ffprobe(cmd: Sequence[str], *, timeout: Optional[float] = None) -> None:
     run_ffprobe_capture(cmd, check=True, timeout=timeout)
 
 
+
+# Timeout for metadata-only ffprobe runs (not part of the probe cache key).
+PROBE_TIMEOUT_SECONDS = 60
+
+# Fields returned by probe_media(); extend here if a caller needs more.
+PROBE_SHOW_ENTRIES = (
+    "format=duration,bit_rate"
+    ":stream=codec_type,codec_name,width,height,r_frame_rate,bit_rate,sample_rate,channels"
+)
+
+# Memoized probe results keyed by (abspath, st_mtime_ns, st_size); shared by the
+# sync and async probe paths. Oldest entries are evicted first.
+_PROBE_CACHE: "OrderedDict[tuple[str, int, int], dict]" = OrderedDict()
+_PROBE_CACHE_MAXSIZE = 256
+# Probes run from asyncio.to_thread and editor pool threads; guards every cache access
+_probe_cache_lock = threading.Lock()
+
+
+# Cap on concurrent ffprobe subprocesses for the async path (fork/exec + codec
+# registration is the fixed cost; beyond this, probes just queue).
+PROBE_MAX_CONCURRENCY = min(32, (os.cpu_count() or 1) * 2)
+
+# asyncio.Semaphore binds to one event loop; workers call asyncio.run() per job.
+_probe_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _probe_semaphore() -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    sem = _probe_semaphores.get(loop)
+    if sem is None:
+        sem = asyncio.Semaphore(PROBE_MAX_CONCURRENCY)
+        _probe_semaphores[loop] = sem
+    return sem
+
+
+def _probe_key(path: str) -> tuple[str, int, int]:
+    st = os.stat(path)
+    return (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+
+
+def _probe_cmd(path: str) -> list[str]:
+    # Only the fields callers read are requested, so ffprobe skips emitting
+    # side data, dispositions, tags and codec parameters.
+    return [
+        "ffprobe",
+        "-v", "quiet",
+        "-print_format", "json",
+        "-show_entries", PROBE_SHOW_ENTRIES,
+        path,
+    ]
+
+
+def _first_streams(raw: dict) -> dict:
+    """Reduce raw ffprobe output to the first video and first audio stream."""
+    video = [st for st in raw.get("streams", []) if st.get("codec_type") == "video"][:1]
+    audio = [st for st in raw.get("streams", []) if st.get("codec_type") == "audio"][:1]
+    return {"format": raw.get("format", {}), "streams": video, "audio_streams": audio}
+
+
+def _probe_cache_get(key: tuple[str, int, int]) -> Optional[dict]:
+    with _probe_cache_lock:
+        data = _PROBE_CACHE.get(key)
+        if data is not None:
+            _PROBE_CACHE.move_to_end(key)
+        return data
+
+
+def _probe_cache_put(key: tuple[str, int, int], data: dict) -> None:
+    with _probe_cache_lock:
+        _PROBE_CACHE[key] = data
+        _PROBE_CACHE.move_to_end(key)
+        while len(_PROBE_CACHE) > _PROBE_CACHE_MAXSIZE:
+            _PROBE_CACHE.popitem(last=False)
+
+
+def probe_media(path: str) -> dict:
+    """
+    Return parsed ffprobe JSON ({"format": ..., "streams": [...]}) for a media file.
+
+    "streams" holds only the first video stream and "audio_streams" only the first
+    audio stream (each empty if absent), limited to the fields in PROBE_SHOW_ENTRIES.
+
+    Results are memoized per (path, st_mtime_ns, st_size), so repeated probes of an
+    unchanged file within a job reuse a single ffprobe run. Callers must treat the
+    returned dict as read-only.
+
+    Raises FFmpegError if ffprobe fails and OSError if the file does not exist.
+    """
+    key = _probe_key(path)
+    data = _probe_cache_get(key)
+    if data is None:
+        proc = run_ffprobe_capture(_probe_cmd(key[0]), check=True, timeout=PROBE_TIMEOUT_SECONDS)
+        data = _first_streams(json.loads(proc.stdout))
+        _probe_cache_put(key, data)
+    return data
+
+
+async def probe_media_async(path: str) -> dict:
+    """
+    Async variant of probe_media() using asyncio subprocesses.
+
+    Does not block the event loop, so many files can be probed concurrently with
+    asyncio.gather(); at most PROBE_MAX_CONCURRENCY ffprobe processes run at once
+    per event loop. Shares the probe_media() cache.
+    """
+    key = _probe_key(path)
+    data = _probe_cache_get(key)
+    if data is not None:
+        return data
+
+    cmd_list = _probe_cmd(key[0])
+    async with _probe_semaphore():
+        proc = await asyncio.create_subprocess_exec(
+            *cmd_list,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        try:
+            stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=PROBE_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+            raise FFmpegError(
+                message=f"FFprobe timed out after {PROBE_TIMEOUT_SECONDS}s",
+                cmd=cmd_list,
+            )
+
+    if proc.returncode != 0:
+        stderr_text = stderr.decode("utf-8", errors="replace")
+        raise FFmpegError(
+            message=f"FFprobe failed:\n{sanitize_ffmpeg_stderr(stderr_text)}",
+            stderr=stderr_text,
+            cmd=cmd_list,
+        )
+
+    data = _first_streams(json.loads(stdout))
+    _probe_cache_put(key, data)
+    return data
+
+
+# H.264 encoders in order of preference; libx264 is the always-available fallback.
+H264_SOFTWARE_ENCODER = "libx264"
+H264_HW_ENCODERS = ("h264_nvenc", "h264_qsv", "h264_vaapi")
+VAAPI_DEVICE = "/dev/dri/renderD128"
+
+
+def _hw_encoder_pre_input_args(encoder: str) -> list[str]:
+    if encoder == "h264_vaapi":
+        return ["-vaapi_device", VAAPI_DEVICE]
+    return []
+
+
+def _hw_encoder_works(encoder: str) -> bool:
+    """Listing an encoder doesn't mean a device exists; try a tiny test encode."""
+    try:
+        proc = subprocess.run(
+            [
+                "ffmpeg", "-nostdin", "-hide_banner", "-loglevel", "error",
+                *_hw_encoder_pre_input_args(encoder),
+                "-f", "lavfi", "-i", "color=c=black:s=256x256:d=0.1",
+                *(["-vf", "format=nv12,hwupload"] if encoder == "h264_vaapi" else []),
+                "-c:v", encoder,
+                "-f", "null", "-",
+            ],
+            capture_output=True,
+            timeout=20,
+            check=False,
+        )
+        return proc.returncode == 0
+    except Exception:
+        return False
+
+
+@lru_cache(maxsize=1)
+def detect_h264_encoder() -> str:
+    """
+    Pick the best available H.264 encoder once per process.
+
+    Controlled via env var FFMPEG_HW_ENCODER:
+    - "auto" (default): first working encoder of H264_HW_ENCODERS, else libx264
+    - "none" / "libx264": always software
+    - a specific encoder name (e.g. "h264_nvenc"): use it if it works, else libx264
+    """
+    pref = (os.getenv("FFMPEG_HW_ENCODER") or "auto").strip().lower()
+    if pref in ("none", "off", "false", "0", H264_SOFTWARE_ENCODER):
+        return H264_SOFTWARE_ENCODER
+
+    candidates = H264_HW_ENCODERS if pref == "auto" else (pref,)
+    try:
+        proc = subprocess.run(
+            ["ffmpeg", "-nostdin", "-hide_banner", "-encoders"],
+            capture_output=True,
+            text=True,
+            timeout=20,
+            check=False,
+        )
+        listed = proc.stdout or ""
+    except Exception:
+        return H264_SOFTWARE_ENCODER
+
+    for encoder in candidates:
+        if re.search(rf"\s{re.escape(encoder)}\s", listed) and _hw_encoder_works(encoder):
+            print(f"🚀 Using hardware H.264 encoder: {encoder}", flush=True)
+            return encoder
+    return H264_SOFTWARE_ENCODER
+
+
+# Input-side hardware decode per encoder: (hwaccel args, on-device scale filter).
+# With a hardware encoder, decoded frames stay on the device (no swscale, no
+# PCIe round-trip); with libx264, "-hwaccel auto" offloads decode and falls back
+# to software decode on its own.
+_HW_DECODE = {
+    "h264_nvenc": (["-hwaccel", "cuda", "-hwaccel_output_format", "cuda"], "scale_cuda"),
+    "h264_qsv": (["-hwaccel", "qsv", "-hwaccel_output_format", "qsv"], "scale_qsv"),
+    "h264_vaapi": (["-hwaccel", "vaapi", "-hwaccel_output_format", "vaapi"], "scale_vaapi"),
+}
+
+
+def h264_encode_args(
+    encoder: str,
+    *,
+    scale: Optional[tuple[int, int]] = None,
+    bitrate_kbps: Optional[int] = None,
+    quality: Optional[int] = None,
+    threads: Optional[int] = None,
+    hw_decode: bool = False,
+) -> tuple[list[str], list[str]]:
+    """
+    Build ffmpeg arguments for an H.264 encode with the given encoder.
+
+    Rate control:
+    - bitrate_kbps only: bitrate-targeted (ABR/VBR) with a 1.1x maxrate and 2x buffer
+    - quality only: constant quality (CRF / CQ / global_quality / QP, encoder-specific)
+    - both: constant quality capped at bitrate_kbps
+
+    hw_decode adds input-side hardware decoding (see _HW_DECODE). For hardware
+    encoders this keeps frames on the device, which fails for sources the GPU
+    can't decode; run such commands via run_ffmpeg_with_hw_fallback().
+
+    Returns:
+      (pre_input_args, video_args) - pre_input_args go before "-i", video_args
+      (filters, codec and rate control) go after it.
+    """
+    pre_input, args = _h264_encode_args_cached(encoder, scale, bitrate_kbps, quality, threads, hw_decode)
+    return list(pre_input), list(args)
+
+
+@lru_cache(maxsize=128)
+def _h264_encode_args_cached(
+    encoder: str,
+    scale: Optional[tuple[int, int]],
+    bitrate_kbps: Optional[int],
+    quality: Optional[int],
+    threads: Optional[int],
+    hw_decode: bool,
+) -> tuple[tuple[str, ...], tuple[str, ...]]:
+    # Memoized per argument shape: batch runs hit the same few resolution/encoder
+    # combinations, so the branching and string formatting happen once per shape.
+    pre_input = _hw_encoder_pre_input_args(encoder)
+    args: list[str] = []
+
+    if hw_decode and encoder in _HW_DECODE:
+        hwaccel_args, scale_filter = _HW_DECODE[encoder]
+        pre_input += hwaccel_args
+        if scale:
+            args += ["-vf", f"{scale_filter}=w={scale[0]}:h={scale[1]}"]
+    elif encoder == "h264_vaapi":
+        vf = "format=nv12,hwupload"
+        if scale:
+            vf += f",scale_vaapi=w={scale[0]}:h={scale[1]}"
+        args += ["-vf", vf]
+    else:
+        if hw_decode:
+            pre_input += ["-hwaccel", "auto"]
+        if scale:
+            args += ["-vf", f"scale={scale[0]}:{scale[1]}"]
+
+    args += ["-c:v", encoder]
+
+    if encoder == "h264_nvenc":
+        args += ["-preset", "p4", "-tune", "hq", "-rc", "vbr"]
+        if quality is not None:
+            args += ["-cq", str(quality)]
+            if bitrate_kbps is None:
+                args += ["-b:v", "0"]
+    elif encoder == "h264_qsv":
+        args += ["-preset", "medium"]
+        if quality is not None and bitrate_kbps is None:
+            args += ["-global_quality", str(quality)]
+    elif encoder == "h264_vaapi":
+        if quality is not None and bitrate_kbps is None:
+            args += ["-qp", str(quality)]
+    else:
+        if threads:
+            args += ["-threads", str(threads)]
+        args += ["-preset", "medium"]
+        if quality is not None:
+            args += ["-crf", str(quality)]
+
+    if bitrate_kbps is not None:
+        # Only libx264 can do pure CRF with a cap; hardware encoders need a target
+        if quality is None or encoder != H264_SOFTWARE_ENCODER:
+            args += ["-b:v", f"{bitrate_kbps}k"]
+        maxrate = bitrate_kbps if quality is not None else int(bitrate_kbps * 1.1)
+        args += ["-maxrate", f"{maxrate}k", "-bufsize", f"{bitrate_kbps * 2}k"]
+
+    return tuple(pre_input), tuple(args)
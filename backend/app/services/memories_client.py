@@ -7,6 +7,36 @@ from app.config import get_settings
 from app.models import MemoriesUploadResponse, VideoStatus
 
 
+# Keep-alive HTTP client shared by MemoriesAIClient instances for hot chat calls,
+# bound to the event loop that created it (httpx clients can't cross loops).
+_shared_http_client: Optional[httpx.AsyncClient] = None
+_shared_http_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _get_shared_http_client() -> httpx.AsyncClient:
+    """Return the shared AsyncClient, creating it for the current event loop if needed."""
+    global _shared_http_client, _shared_http_client_loop
+    loop = asyncio.get_running_loop()
+    if _shared_http_client is None or _shared_http_client_loop is not loop or _shared_http_client.is_closed:
+        _shared_http_client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=20, keepalive_expiry=30.0)
+        )
+        _shared_http_client_loop = loop
+    return _shared_http_client
+
+
+async def close_shared_http_client() -> None:
+    """Close the shared AsyncClient if it belongs to the running event loop."""
+    global _shared_http_client, _shared_http_client_loop
+    client = _shared_http_client
+    if client is None or _shared_http_client_loop is not asyncio.get_running_loop():
+        return
+    _shared_http_client = None
+    _shared_http_client_loop = None
+    if not client.is_closed:
+        await client.aclose()
+
+
 class MemoriesAIClient:
     """
     Client for interacting with Memories.ai API.
@@ -478,42 +508,43 @@ class MemoriesAIClient:
         
         for attempt in range(max_retries):
             try:
-                async with httpx.AsyncClient(timeout=90.0) as client:
-                    response = await client.post(
-                        f"{self.base_url}/chat",
-                        headers={
-                            **self.headers,
-                            "Content-Type": "application/json"
-                        },
-                        json={
-                            "video_nos": [video_no],
-                            "prompt": prompt,
-                            "unique_id": unique_id
-                        }
-                    )
-                    response.raise_for_status()
-                    
-                    result = response.json()
-                    
-                    # Check for transient errors that should be retried
-                    if result.get("code") != "0000":
-                        msg = result.get("msg", "")
-                        if "network" in msg.lower() or "busy" in msg.lower() or result.get("code") == "0429":
-                            print(f"⚠️ Transient error (attempt {attempt + 1}/{max_retries}): {msg}", flush=True)
-                            last_error = Exception(f"Chat failed: {msg}")
-                            await asyncio.sleep(5 * (attempt + 1))
-                            continue
-                        raise Exception(f"Chat failed: {msg}")
-                    
-                    # Extract the response text
-                    data = result.get("data", {})
-                    answer = data.get("content") or data.get("answer", "")
-                    if answer:
-                        print(f"👁️ Got visual facts ({len(answer)} chars)", flush=True)
-                        return answer
-                    
-                    print(f"⚠️ Empty response, retrying...", flush=True)
-                    
+                client = _get_shared_http_client()
+                response = await client.post(
+                    f"{self.base_url}/chat",
+                    timeout=90.0,
+                    headers={
+                        **self.headers,
+                        "Content-Type": "application/json"
+                    },
+                    json={
+                        "video_nos": [video_no],
+                        "prompt": prompt,
+                        "unique_id": unique_id
+                    }
+                )
+                response.raise_for_status()
+                
+                result = response.json()
+                
+                # Check for transient errors that should be retried
+                if result.get("code") != "0000":
+                    msg = result.get("msg", "")
+                    if "network" in msg.lower() or "busy" in msg.lower() or result.get("code") == "0429":
+                        print(f"⚠️ Transient error (attempt {attempt + 1}/{max_retries}): {msg}", flush=True)
+                        last_error = Exception(f"Chat failed: {msg}")
+                        await asyncio.sleep(5 * (attempt + 1))
+                        continue
+                    raise Exception(f"Chat failed: {msg}")
+                
+                # Extract the response text
+                data = result.get("data", {})
+                answer = data.get("content") or data.get("answer", "")
+                if answer:
+                    print(f"👁️ Got visual facts ({len(answer)} chars)", flush=True)
+                    return answer
+                
+                print(f"⚠️ Empty response, retrying...", flush=True)
+                
             except httpx.HTTPStatusError as e:
                 print(f"⚠️ HTTP error (attempt {attempt + 1}/{max_retries}): {e}", flush=True)
                 last_error = e
@@ -532,7 +563,9 @@ class MemoriesAIClient:
         video_no: str,
         batch_segments: List[Tuple[float, float]],
         unique_id: str = "default",
-        max_retries: int = 3
+        max_retries: int = 3,
+        instructions: Optional[str] = None,
+        strict: bool = False
     ) -> List[str]:
         """
         Get raw visual facts for multiple segments in ONE API call.
@@ -545,6 +578,11 @@ class MemoriesAIClient:
             batch_segments: List of (start_time, end_time) tuples
             unique_id: Workspace/user identifier
             max_retries: Number of retries for transient errors
+            instructions: Optional per-segment instructions replacing the default
+                factual-description request (segment list and JSON format are kept)
+            strict: Only accept a JSON array with exactly one string per segment;
+                any other reply returns empty strings (no newline-split fallback,
+                no retry) so the caller can query the segments individually
             
         Returns:
             List of visual descriptions, one per segment
@@ -555,11 +593,16 @@ class MemoriesAIClient:
             for i, (s, e) in enumerate(batch_segments)
         ])
         
-        # Simple factual prompt for batch
+        if not instructions:
+            # Simple factual prompt for batch
+            instructions = (
+                f"For each segment below, describe exactly what happens visually.\n"
+                f"Include: character names, actions, expressions, locations, objects.\n"
+                f"Be factual - NO drama, NO storytelling, NO interpretation."
+            )
+        
         prompt = (
-            f"For each segment below, describe exactly what happens visually.\n"
-            f"Include: character names, actions, expressions, locations, objects.\n"
-            f"Be factual - NO drama, NO storytelling, NO interpretation.\n\n"
+            f"{instructions}\n\n"
             f"SEGMENTS:\n{segment_text}\n\n"
             f"Return a JSON array with one description per segment:\n"
             f"[\"description 1\", \"description 2\", ...]\n\n"
@@ -601,8 +644,14 @@ class MemoriesAIClient:
                     # Parse response
                     raw_response = result.get("data", {}).get("content", "")
                     
-                    # Try to extract JSON array from response
-                    descriptions = self._parse_batch_response(raw_response, len(batch_segments))
+                    if strict:
+                        descriptions = self._parse_batch_json_array(raw_response, len(batch_segments))
+                        if descriptions is None:
+                            print(f"⚠️ Batch visual reply is not a {len(batch_segments)}-item JSON array, skipping", flush=True)
+                            return ["" for _ in batch_segments]
+                    else:
+                        # Try to extract JSON array from response
+                        descriptions = self._parse_batch_response(raw_response, len(batch_segments))
                     
                     print(f"👁️ Batch visual success: got {len(descriptions)} descriptions", flush=True)
                     return descriptions
@@ -865,6 +914,28 @@ class MemoriesAIClient:
         print(f"❌ Batch failed after {max_retries} retries", flush=True)
         raise Exception(f"Batch narration generation failed after {max_retries} retries")
     
+    def _parse_batch_json_array(self, raw_response: str, expected_count: int) -> Optional[List[str]]:
+        """
+        Strictly parse a batch reply: a JSON array of exactly expected_count strings.
+        
+        Returns None for anything else (no JSON, wrong length, non-string items).
+        """
+        import json
+        import re
+        
+        json_match = re.search(r'\[.*\]', raw_response, re.DOTALL)
+        if not json_match:
+            return None
+        try:
+            items = json.loads(json_match.group())
+        except json.JSONDecodeError:
+            return None
+        if not isinstance(items, list) or len(items) != expected_count:
+            return None
+        if not all(isinstance(item, str) for item in items):
+            return None
+        return items
+    
     def _parse_batch_response(self, raw_response: str, expected_count: int) -> List[str]:
         """
         Parse the JSON array response from batch narration request.
@@ -35,7 +35,8 @@ class ScriptProcessor:
         if self.nlp is None:
             try:
                 import spacy
-                self.nlp = spacy.load("en_core_web_sm")
+                # Segmentation only needs sentence boundaries from the parser
+                self.nlp = spacy.load("en_core_web_sm", exclude=["ner"])
             except OSError:
                 print("⚠️ spaCy model 'en_core_web_sm' not found. Using simple segmentation.", flush=True)
                 self.nlp = None
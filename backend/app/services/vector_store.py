@@ -6,7 +6,7 @@ Stores and searches video scene embeddings for semantic matching.
 
 import json
 import numpy as np
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 import redis
 try:
     from redis.commands.search.field import VectorField, TextField, NumericField
@@ -17,10 +17,50 @@ except ImportError:
     # RediSearch module not available - will use fallback cosine similarity
     REDIS_SEARCH_AVAILABLE = False
     print("⚠️ RediSearch module not available - vector search will use fallback method", flush=True)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    # orjson is optional - fall back to stdlib json for metadata (de)serialization
+    ORJSON_AVAILABLE = False
 
 from app.config import get_settings
 
 
+def _dumps_json(obj) -> bytes:
+    """Serialize scene metadata to JSON bytes (kept as JSON so RediSearch can index it)."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode("utf-8")
+
+
+def _loads_json(raw):
+    """Parse a value stored by ``_dumps_json`` (bytes or str)."""
+    if not raw:
+        return {}
+    if ORJSON_AVAILABLE:
+        return orjson.loads(raw)
+    if isinstance(raw, bytes):
+        raw = raw.decode("utf-8")
+    return json.loads(raw)
+
+
+def _normalize(vec: np.ndarray) -> np.ndarray:
+    """Return a float32 L2-normalized copy of ``vec`` (zero vectors stay zero)."""
+    v = np.asarray(vec, dtype=np.float32)
+    return v / (np.linalg.norm(v) + 1e-12)
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """Return a float32 copy of ``matrix`` with every row L2-normalized.
+    
+    Videos indexed before vectors were normalized on write still hold raw
+    embeddings, so readers normalize rather than trusting the stored norm.
+    """
+    m = np.asarray(matrix, dtype=np.float32)
+    return m / (np.linalg.norm(m, axis=1, keepdims=True) + 1e-12)
+
+
 class VectorStore:
     """
     Manages Redis/RediSearch vector operations for video embeddings.
@@ -45,6 +85,11 @@ class VectorStore:
         
         # Index will be created on first use
         self._index_created = False
+        
+        # Per-video SoA cache for the fallback search path:
+        # {video_no: {"M": float32 unit-norm matrix (N, D), "rows": [...]}}
+        # (rows carry scene fields only; the vectors live in M alone)
+        self._cache: Dict[str, Dict] = {}
 
     async def create_index(self, index_name: Optional[str] = None):
         """
@@ -134,26 +179,75 @@ class VectorStore:
         
         print(f"💾 Storing {len(embeddings)} embeddings for video {video_no}", flush=True)
         
+        # Store L2-normalized vectors so cosine similarity is a plain dot product
+        matrix = np.stack([_normalize(emb["embedding"]) for emb in embeddings]) if embeddings else None
+        scenes = []
+        
+        pipe = self.redis_client.pipeline(transaction=False)
         for idx, emb in enumerate(embeddings):
             key = f"video_embedding:{video_no}:scene:{idx}"
+            metadata_json = _dumps_json(emb["metadata"])
             
-            # Convert embedding to bytes
-            embedding_bytes = emb["embedding"].astype(np.float32).tobytes()
-            
-            # Store as Redis hash
-            self.redis_client.hset(
+            # Per-scene hash (indexed by RediSearch)
+            pipe.hset(
                 key,
                 mapping={
-                    "embedding": embedding_bytes,
+                    "embedding": matrix[idx].tobytes(),
                     "video_no": video_no,
                     "start_time": emb["start_time"],
                     "end_time": emb["end_time"],
-                    "metadata": json.dumps(emb["metadata"])
+                    "metadata": metadata_json
                 }
             )
+            scenes.append({
+                "start_time": emb["start_time"],
+                "end_time": emb["end_time"],
+                "metadata": emb["metadata"],
+            })
+        
+        # Query-side fast cache: whole matrix as one float16 blob (half the bytes of
+        # float32; unit vectors lose nothing that matters for cosine ranking) + a
+        # small scene sidecar, so a full load is one MGET instead of SCAN + N HGETALLs.
+        # The RediSearch hashes above stay FLOAT32 to match the index schema.
+        if matrix is not None:
+            pipe.set(f"video_matrix16:{video_no}", matrix.astype(np.float16).tobytes())
+            pipe.set(f"video_scenes:{video_no}", _dumps_json(scenes))
+            pipe.delete(f"video_matrix:{video_no}")  # legacy float32 blob
+        pipe.execute()
+        
+        # Drop any cached matrix so the next fallback search reloads fresh vectors
+        self._cache.pop(video_no, None)
         
         print(f"✅ Stored embeddings for video {video_no}", flush=True)
 
+    def _load_matrix_blob(self, video_no: str) -> Optional[Tuple[np.ndarray, List[Dict]]]:
+        """
+        Load the packed embedding matrix and scene sidecar for a video.
+        
+        Args:
+            video_no: Video identifier
+            
+        Returns:
+            (float32 matrix, scenes) tuple, or None if the video has no packed
+            blob (e.g. it was indexed before blobs were written)
+        """
+        f16_bytes, f32_bytes, scenes_json = self.redis_client.mget(
+            [f"video_matrix16:{video_no}", f"video_matrix:{video_no}", f"video_scenes:{video_no}"]
+        )
+        if not (f16_bytes or f32_bytes) or not scenes_json:
+            return None
+        
+        scenes = _loads_json(scenes_json)
+        if not scenes:
+            return None
+        
+        if f16_bytes:
+            matrix = np.frombuffer(f16_bytes, dtype=np.float16).astype(np.float32)
+        else:
+            # Blob written before float16 storage; zero-copy view
+            matrix = np.frombuffer(f32_bytes, dtype=np.float32)
+        return matrix.reshape(len(scenes), -1), scenes
+
     async def get_video_embeddings(self, video_no: str) -> List[Dict]:
         """
         Retrieve all embeddings for a video.
@@ -164,6 +258,20 @@ class VectorStore:
         Returns:
             List of embedding dicts
         """
+        packed = self._load_matrix_blob(video_no)
+        if packed is not None:
+            matrix, scenes = packed
+            return [
+                {
+                    "video_no": video_no,
+                    "start_time": float(scene["start_time"]),
+                    "end_time": float(scene["end_time"]),
+                    "embedding": matrix[idx],
+                    "metadata": scene["metadata"]
+                }
+                for idx, scene in enumerate(scenes)
+            ]
+        
         # Scan for all keys for this video
         pattern = f"video_embedding:{video_no}:scene:*"
         keys = []
@@ -179,7 +287,7 @@ class VectorStore:
             return []
         
         # Sort keys by scene index
-        keys.sort(key=lambda k: int(k.split(":")[-1]))
+        keys.sort(key=lambda k: int(k.split(b":")[-1]))
         
         embeddings = []
         for key in keys:
@@ -200,7 +308,7 @@ class VectorStore:
                 "start_time": float(data.get(b"start_time", b"0")),
                 "end_time": float(data.get(b"end_time", b"0")),
                 "embedding": embedding,
-                "metadata": json.loads(data.get(b"metadata", b"{}").decode("utf-8"))
+                "metadata": _loads_json(data.get(b"metadata"))
             })
         
         return embeddings
@@ -258,7 +366,7 @@ class VectorStore:
                     "video_no": doc.video_no,
                     "start_time": float(doc.start_time),
                     "end_time": float(doc.end_time),
-                    "metadata": json.loads(doc.metadata),
+                    "metadata": _loads_json(doc.metadata),
                     "similarity_score": similarity
                 })
             
@@ -286,30 +394,54 @@ class VectorStore:
         Returns:
             List of similar clips with similarity scores
         """
-        # Get all embeddings for this video
-        all_embeddings = await self.get_video_embeddings(video_no)
+        cached = await self._get_video_matrix(video_no)
         
-        if not all_embeddings:
+        if cached is None:
             return []
         
-        # Compute cosine similarities manually (avoid sklearn dependency for now)
-        # Cosine similarity = dot product of normalized vectors
-        def cosine_sim(a, b):
-            return np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b))
+        # Rows are normalized when the matrix is built, so cosine similarity = M @ q_unit
+        sims = cached["M"] @ _normalize(query_embedding)
         
-        similarities = []
+        rows = cached["rows"]
+        order = np.argsort(-sims)[:top_k]
+        return [
+            {**rows[i], "similarity_score": float(sims[i])}
+            for i in order
+        ]
+
+    async def _get_video_matrix(self, video_no: str) -> Optional[Dict]:
+        """
+        Load (and cache) all embeddings for a video as a single matrix.
         
-        for emb in all_embeddings:
-            sim = cosine_sim(query_embedding, emb["embedding"])
+        Args:
+            video_no: Video identifier
             
-            similarities.append({
-                **emb,
-                "similarity_score": float(sim)
-            })
+        Returns:
+            Dict with "M" (float32 unit-norm matrix) and "rows", or None if
+            the video has no embeddings
+        """
+        cached = self._cache.get(video_no)
+        if cached is not None:
+            return cached
         
-        # Sort by similarity and return top_k
-        similarities.sort(key=lambda x: x["similarity_score"], reverse=True)
-        return similarities[:top_k]
+        all_embeddings = await self.get_video_embeddings(video_no)
+        
+        if not all_embeddings:
+            return None
+        
+        # Normalize here too: videos indexed before unit-norm writes hold raw vectors
+        M = _normalize_rows(np.stack([emb["embedding"] for emb in all_embeddings]))
+        
+        # Keep a single copy of the vectors: M, without each row's "embedding"
+        cached = {
+            "M": M,
+            "rows": [
+                {key: value for key, value in emb.items() if key != "embedding"}
+                for emb in all_embeddings
+            ],
+        }
+        self._cache[video_no] = cached
+        return cached
 
     async def search_similar_with_constraints(
         self,
@@ -340,13 +472,9 @@ class VectorStore:
         if not all_embeddings:
             return []
         
-        # Cosine similarity helper
-        def cosine_sim(a, b):
-            norm_a = np.linalg.norm(a)
-            norm_b = np.linalg.norm(b)
-            if norm_a == 0 or norm_b == 0:
-                return 0.0
-            return np.dot(a, b) / (norm_a * norm_b)
+        # Cosine similarity for every scene in one matmul; rows are normalized on read
+        # because videos indexed before unit-norm writes still hold raw vectors
+        sims = _normalize_rows(np.stack([emb["embedding"] for emb in all_embeddings])) @ _normalize(query_embedding)
         
         # Calculate overlap ratio between two time ranges
         def calculate_overlap_ratio(range1_start, range1_end, range2_start, range2_end):
@@ -359,7 +487,7 @@ class VectorStore:
         candidates = []
         exclude_ranges = exclude_ranges or []
         
-        for emb in all_embeddings:
+        for emb, sim in zip(all_embeddings, sims):
             start_time = emb["start_time"]
             end_time = emb["end_time"]
             
@@ -384,9 +512,6 @@ class VectorStore:
             if is_excluded:
                 continue
             
-            # Calculate similarity
-            sim = cosine_sim(query_embedding, emb["embedding"])
-            
             candidates.append({
                 **emb,
                 "similarity_score": float(sim),
@@ -5,15 +5,31 @@ Compresses videos that exceed Gemini API's 2GB file size limit using FFmpeg.
 Uses adaptive resolution scaling based on source video dimensions.
 """
 
+import asyncio
+import glob
 import os
-import subprocess
-import json
-from typing import Optional, Tuple
+import shutil
+import threading
+import uuid
+from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 
 from app.config import get_settings
-from app.services.ffmpeg_utils import run_ffmpeg, FFmpegError
+from app.services.container_sniffer import probe_mp4
+from app.services.ffmpeg_utils import (
+    run_ffmpeg,
+    run_ffmpeg_with_hw_fallback,
+    get_encode_semaphore,
+    resolve_encode_threads,
+    detect_h264_encoder,
+    h264_encode_args,
+    H264_SOFTWARE_ENCODER,
+    probe_media,
+    probe_media_async,
+    FFmpegError,
+)
 
 
 @dataclass
@@ -27,6 +43,8 @@ class VideoInfo:
     bitrate_kbps: int
     codec: str
     fps: float
+    audio_codec: Optional[str] = None
+    audio_bitrate_kbps: int = 0
     
     @property
     def file_size_gb(self) -> float:
@@ -45,6 +63,14 @@ class VideoInfo:
         return self.duration_seconds / 3600
 
 
+@dataclass
+class Rendition:
+    """One output of a single-decode multi-rendition encode."""
+    output_path: str
+    target_size_bytes: int
+    max_height: Optional[int] = None  # None = adaptive (calculate_target_resolution)
+
+
 class VideoCompressor:
     """
     Compresses videos to meet Gemini API file size limits.
@@ -64,53 +90,101 @@ class VideoCompressor:
     RESOLUTION_1080P = 1080
     RESOLUTION_720P = 720
     
+    # Audio budget assumed by calculate_target_bitrate; sources already within it
+    # in an MP4-compatible codec are stream-copied instead of re-encoded
+    AUDIO_BITRATE_KBPS = 128
+    MP4_AUDIO_CODECS = frozenset({"aac", "mp3"})
+    
+    # Directories already created by _ensure_dir in this process
+    _dirs_ready: set = set()
+    
+    # Static command segments shared by every compress_video call
+    _PASS1_OUTPUT_ARGS = ("-an", "-f", "null", "-loglevel", "warning", os.devnull)
+    _FINAL_OUTPUT_ARGS = (
+        "-movflags", "+faststart",  # Enable streaming
+        "-loglevel", "warning",
+        "-nostats",  # Progress goes to stdout as key=value; keep stderr for warnings
+        "-progress", "pipe:1",  # Final stats replace a post-encode ffprobe
+    )
+    
     def __init__(self):
         self.settings = get_settings()
         self.temp_dir = self.settings.storage.temp_storage_path
         
-        # Create compressed directory
+        # Create compressed directory (once per process)
         self.compressed_dir = os.path.join(self.temp_dir, "compressed")
-        os.makedirs(self.compressed_dir, exist_ok=True)
+        self._ensure_dir(self.compressed_dir)
+        
+        # Bound per-encode threads and the number of concurrent encodes
+        self.encode_threads = resolve_encode_threads(self.settings.ffmpeg.encode_threads_per_job)
+        self._encode_sem = get_encode_semaphore(self.encode_threads)
+        
+        # Best available H.264 encoder (hardware if present, else libx264)
+        self.video_encoder = detect_h264_encoder()
+    
+    @classmethod
+    def _ensure_dir(cls, path: str) -> None:
+        """makedirs once per process per path instead of on every instantiation."""
+        if path in cls._dirs_ready:
+            return
+        os.makedirs(path, exist_ok=True)
+        cls._dirs_ready.add(path)
     
-    def get_video_info(self, video_path: str) -> VideoInfo:
+    def get_video_info(self, video_path: str, file_size: Optional[int] = None) -> VideoInfo:
         """
         Get detailed information about a video file.
         
         Args:
             video_path: Path to the video file
+            file_size: Size in bytes if the caller already stat'ed the file
             
         Returns:
             VideoInfo dataclass with file details
         """
         # Get file size
-        file_size = os.path.getsize(video_path)
-        
-        # Get video metadata via ffprobe
-        cmd = [
-            "ffprobe",
-            "-v", "quiet",
-            "-print_format", "json",
-            "-show_format",
-            "-show_streams",
-            video_path
-        ]
-        
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        
-        if result.returncode != 0:
-            raise Exception(f"Failed to get video info: {result.stderr}")
+        if file_size is None:
+            file_size = os.path.getsize(video_path)
         
-        data = json.loads(result.stdout)
+        # MP4/MOV metadata straight from the moov box; otherwise ffprobe
+        # (memoized per path/mtime/size)
+        data = probe_mp4(video_path) or probe_media(video_path)
+        return self._video_info_from_probe(video_path, file_size, data)
+    
+    async def get_video_info_async(self, video_path: str) -> VideoInfo:
+        """
+        Async variant of get_video_info that doesn't block the event loop.
         
-        # Find video stream
-        video_stream = None
-        for stream in data.get("streams", []):
-            if stream.get("codec_type") == "video":
-                video_stream = stream
-                break
+        Args:
+            video_path: Path to the video file
+            
+        Returns:
+            VideoInfo dataclass with file details
+        """
+        file_size = os.path.getsize(video_path)
+        data = probe_mp4(video_path) or await probe_media_async(video_path)
+        return self._video_info_from_probe(video_path, file_size, data)
+    
+    async def probe_many(self, video_paths: List[str]) -> List[VideoInfo]:
+        """
+        Probe several videos concurrently.
         
-        if not video_stream:
+        Args:
+            video_paths: Paths to the video files
+            
+        Returns:
+            VideoInfo for each path, in input order
+        """
+        return list(await asyncio.gather(
+            *[self.get_video_info_async(p) for p in video_paths]
+        ))
+    
+    def _video_info_from_probe(self, video_path: str, file_size: int, data: Dict) -> VideoInfo:
+        """Build a VideoInfo from probe_media() output."""
+        # probe_media only selects the first video stream
+        streams = data.get("streams", [])
+        if not streams:
             raise Exception("No video stream found in file")
+        video_stream = streams[0]
         
         # Extract metadata
         format_info = data.get("format", {})
@@ -129,6 +203,13 @@ class VideoCompressor:
         else:
             fps = float(fps_str)
         
+        audio_streams = data.get("audio_streams", [])
+        audio_stream = audio_streams[0] if audio_streams else {}
+        try:
+            audio_bitrate = int(audio_stream.get("bit_rate", 0)) // 1000
+        except (TypeError, ValueError):
+            audio_bitrate = 0  # "N/A" for some containers
+        
         return VideoInfo(
             file_path=video_path,
             file_size_bytes=file_size,
@@ -137,7 +218,9 @@ class VideoCompressor:
             height=height,
             bitrate_kbps=bitrate,
             codec=codec,
-            fps=fps
+            fps=fps,
+            audio_codec=audio_stream.get("codec_name"),
+            audio_bitrate_kbps=audio_bitrate
         )
     
     def needs_compression(self, video_path: str) -> bool:
@@ -238,8 +321,10 @@ class VideoCompressor:
         video_path: str,
         output_path: Optional[str] = None,
         target_size_bytes: Optional[int] = None,
-        crf: int = 28,
-        job_id: str = "default"
+        crf: Optional[int] = None,
+        job_id: str = "default",
+        info: Optional[VideoInfo] = None,
+        two_pass: bool = False
     ) -> str:
         """
         Compress a video using FFmpeg with adaptive settings.
@@ -248,16 +333,25 @@ class VideoCompressor:
             video_path: Path to source video
             output_path: Optional output path (auto-generated if None)
             target_size_bytes: Target file size (defaults to 1.8GB)
-            crf: Constant Rate Factor (18-28, higher = smaller file)
+            crf: Optional Constant Rate Factor (18-28, higher = smaller file). When set,
+                 quality-targeted CRF is used with the target bitrate only as a cap;
+                 otherwise the target bitrate drives a single-pass ABR encode so the
+                 output size tracks target_size_bytes.
             job_id: Job identifier for temp file naming
+            info: Pre-computed VideoInfo for video_path (probed if None)
+            two_pass: Run a 2-pass ABR encode for the most accurate size (ignored with crf)
             
         Returns:
             Path to compressed video
         """
-        info = self.get_video_info(video_path)
+        if info is None:
+            info = self.get_video_info(video_path)
         
-        print(f"🎬 Source video: {info.resolution}, {info.file_size_gb:.2f}GB, {info.duration_hours:.2f}h", flush=True)
-        print(f"   Bitrate: {info.bitrate_kbps}kbps, Codec: {info.codec}", flush=True)
+        print(
+            f"🎬 Source video: {info.resolution}, {info.file_size_gb:.2f}GB, {info.duration_hours:.2f}h\n"
+            f"   Bitrate: {info.bitrate_kbps}kbps, Codec: {info.codec}",
+            flush=True
+        )
         
         # Calculate target resolution
         target_width, target_height = self.calculate_target_resolution(info)
@@ -268,7 +362,10 @@ class VideoCompressor:
         
         target_bitrate = self.calculate_target_bitrate(info, target_size_bytes)
         
-        print(f"🎯 Target: {target_width}x{target_height}, ~{target_bitrate}kbps, CRF={crf}", flush=True)
+        if crf is not None:
+            rate_desc = f"CRF={crf}"
+        else:
+            rate_desc = "ABR 2-pass" if two_pass and self.video_encoder == H264_SOFTWARE_ENCODER else "ABR"
         
         # Generate output path
         if output_path is None:
@@ -276,45 +373,206 @@ class VideoCompressor:
             os.makedirs(job_compressed_dir, exist_ok=True)
             output_path = os.path.join(job_compressed_dir, "compressed.mp4")
         
-        # Build FFmpeg command
+        # Rate control: CRF with a bitrate cap, or bitrate-targeted ABR.
+        # With CRF, -maxrate only caps peaks and x264 routinely undershoots, so
+        # the output size is unpredictable; ABR makes target_bitrate govern bytes.
+        if crf is not None or self.video_encoder != H264_SOFTWARE_ENCODER:
+            two_pass = False  # 2-pass is libx264 ABR only
+        
+        pass_args = []
+        passlog_prefix = None
+        if two_pass:
+            passlog_prefix = os.path.join(os.path.dirname(output_path) or ".", "ffmpeg2pass")
+            pass_args = ["-passlogfile", passlog_prefix]
+        
+        if (
+            info.audio_codec in self.MP4_AUDIO_CODECS
+            and 0 < info.audio_bitrate_kbps <= self.AUDIO_BITRATE_KBPS
+        ):
+            audio_args = ["-c:a", "copy"]
+        else:
+            audio_args = ["-c:a", "aac", "-b:a", f"{self.AUDIO_BITRATE_KBPS}k"]
+        
+        def build_cmd(hw_decode: bool, pass_no: Optional[int] = None) -> list:
+            pre_input_args, video_args = h264_encode_args(
+                self.video_encoder,
+                scale=(target_width, target_height),
+                bitrate_kbps=target_bitrate,
+                quality=crf,
+                threads=self.encode_threads,
+                hw_decode=hw_decode,
+            )
+            if pass_no == 1:
+                # First pass: analysis only (no audio, output discarded)
+                return [
+                    "ffmpeg",
+                    "-y",
+                    *pre_input_args,
+                    "-i", video_path,
+                    *video_args,
+                    "-pass", "1", *pass_args,
+                    *self._PASS1_OUTPUT_ARGS,
+                ]
+            return [
+                "ffmpeg",
+                "-y",
+                *pre_input_args,
+                "-i", video_path,
+                *video_args,
+                *(["-pass", "2", *pass_args] if pass_no == 2 else []),
+                *audio_args,
+                *self._FINAL_OUTPUT_ARGS,
+                output_path
+            ]
+        
+        print(
+            f"🎯 Target: {target_width}x{target_height}, ~{target_bitrate}kbps, {rate_desc}, {self.video_encoder}\n"
+            f"🔄 Compressing video...",
+            flush=True
+        )
+        
+        try:
+            with self._encode_sem:
+                if two_pass:
+                    run_ffmpeg_with_hw_fallback(lambda hw: build_cmd(hw, pass_no=1), timeout=3600)
+                progress = run_ffmpeg_with_hw_fallback(
+                    lambda hw: build_cmd(hw, pass_no=2 if two_pass else None),
+                    timeout=3600
+                )
+        except FFmpegError as e:
+            print(f"❌ Compression failed (ffmpeg stderr):\n{e.stderr}", flush=True)
+            raise
+        finally:
+            if passlog_prefix:
+                for stats_file in glob.glob(f"{passlog_prefix}*.log*"):
+                    try:
+                        os.remove(stats_file)
+                    except OSError:
+                        pass
+        
+        # Verify output from ffmpeg's own final stats; only re-probe if they're missing
+        if progress and progress.get("progress") == "end":
+            try:
+                out_duration = int(progress.get("out_time_us", "")) / 1_000_000
+            except ValueError:
+                out_duration = 0.0  # "N/A" for some muxers
+            output_info = VideoInfo(
+                file_path=output_path,
+                file_size_bytes=os.path.getsize(output_path),
+                duration_seconds=out_duration or info.duration_seconds,
+                width=target_width,
+                height=target_height,
+                bitrate_kbps=target_bitrate,
+                codec="h264",
+                fps=info.fps
+            )
+        else:
+            output_info = self.get_video_info(output_path)
+        
+        print(
+            f"✅ Compressed: {output_info.resolution}, {output_info.file_size_gb:.2f}GB\n"
+            f"   Reduction: {(1 - output_info.file_size_bytes/info.file_size_bytes)*100:.1f}%",
+            flush=True
+        )
+        
+        # Warn if still too large
+        if output_info.file_size_bytes > self.MAX_FILE_SIZE_BYTES:
+            print(
+                f"⚠️ Warning: Compressed file still exceeds limit ({output_info.file_size_gb:.2f}GB > 1.9GB)\n"
+                f"   Video will need to be chunked into smaller segments",
+                flush=True
+            )
+        
+        return output_path
+    
+    def compress_and_convert(
+        self,
+        video_path: str,
+        renditions: List[Rendition],
+        info: Optional[VideoInfo] = None
+    ) -> List[str]:
+        """
+        Encode several H.264 renditions from one decode of the source.
+        
+        Uses a single ffmpeg process with a split filter graph, so the source is
+        demuxed and decoded once and feeds one libx264 encoder per rendition
+        (e.g. a Gemini-sized and a Memories.ai-sized copy) instead of decoding
+        the same file once per output.
+        
+        Args:
+            video_path: Path to source video
+            renditions: Outputs to produce (path, size budget, optional max height)
+            info: Pre-computed VideoInfo for video_path (probed if None)
+            
+        Returns:
+            Output paths, in the same order as renditions
+        """
+        if not renditions:
+            return []
+        if info is None:
+            info = self.get_video_info(video_path)
+        
+        count = len(renditions)
+        # Split the per-job thread budget across the parallel encoders
+        threads = max(1, self.encode_threads // count)
+        aspect_ratio = info.width / info.height if info.height > 0 else 16/9
+        
+        filters = [f"[0:v]split={count}" + "".join(f"[v{i}]" for i in range(count))]
+        output_args: List[str] = []
+        summary: List[str] = []
+        
+        for i, rendition in enumerate(renditions):
+            if rendition.max_height is None:
+                width, height = self.calculate_target_resolution(info)
+            elif info.height > rendition.max_height:
+                height = rendition.max_height
+                width = int(height * aspect_ratio)
+                width -= width % 2
+            else:
+                width, height = info.width, info.height
+            
+            bitrate = self.calculate_target_bitrate(info, rendition.target_size_bytes)
+            filters.append(f"[v{i}]scale={width}:{height}[o{i}]")
+            
+            _, video_args = h264_encode_args(
+                H264_SOFTWARE_ENCODER,
+                bitrate_kbps=bitrate,
+                threads=threads,
+            )
+            output_args += [
+                "-map", f"[o{i}]",
+                "-map", "0:a?",
+                *video_args,
+                "-c:a", "aac",
+                "-b:a", f"{self.AUDIO_BITRATE_KBPS}k",
+                "-movflags", "+faststart",
+                rendition.output_path,
+            ]
+            summary.append(f"🎯 Rendition {i + 1}/{count}: {width}x{height}, ~{bitrate}kbps -> {rendition.output_path}")
+        
+        for rendition in renditions:
+            os.makedirs(os.path.dirname(rendition.output_path) or ".", exist_ok=True)
+        
         cmd = [
             "ffmpeg",
             "-y",
             "-i", video_path,
-            "-vf", f"scale={target_width}:{target_height}",
-            "-c:v", "libx264",
-            "-preset", "medium",  # Balance between speed and compression
-            "-crf", str(crf),
-            "-maxrate", f"{target_bitrate}k",
-            "-bufsize", f"{target_bitrate * 2}k",
-            "-c:a", "aac",
-            "-b:a", "128k",
-            "-movflags", "+faststart",  # Enable streaming
+            "-filter_complex", ";".join(filters),
             "-loglevel", "warning",
-            "-stats",
-            output_path
+            *output_args,
         ]
         
-        print(f"🔄 Compressing video...", flush=True)
+        summary.append(f"🔄 Encoding {count} renditions from a single decode...")
+        print("\n".join(summary), flush=True)
         
         try:
-            run_ffmpeg(cmd, timeout=3600)
+            with self._encode_sem:
+                run_ffmpeg(cmd, timeout=3600)
         except FFmpegError as e:
-            print(f"❌ Compression failed (ffmpeg stderr):\n{e.stderr}", flush=True)
+            print(f"❌ Multi-rendition encode failed (ffmpeg stderr):\n{e.stderr}", flush=True)
             raise
         
-        # Verify output
-        output_info = self.get_video_info(output_path)
-        
-        print(f"✅ Compressed: {output_info.resolution}, {output_info.file_size_gb:.2f}GB", flush=True)
-        print(f"   Reduction: {(1 - output_info.file_size_bytes/info.file_size_bytes)*100:.1f}%", flush=True)
-        
-        # Warn if still too large
-        if output_info.file_size_bytes > self.MAX_FILE_SIZE_BYTES:
-            print(f"⚠️ Warning: Compressed file still exceeds limit ({output_info.file_size_gb:.2f}GB > 1.9GB)", flush=True)
-            print(f"   Video will need to be chunked into smaller segments", flush=True)
-        
-        return output_path
+        return [rendition.output_path for rendition in renditions]
     
     def compress_if_needed(
         self,
@@ -331,28 +589,81 @@ class VideoCompressor:
         Returns:
             Tuple of (output_path, was_compressed)
         """
-        if not self.needs_compression(video_path):
-            info = self.get_video_info(video_path)
-            print(f"✅ Video is under size limit ({info.file_size_gb:.2f}GB < 1.9GB), no compression needed", flush=True)
+        # The size check only needs stat(); probe just the files that get compressed
+        file_size = os.path.getsize(video_path)
+        size_gb = file_size / (1024 ** 3)
+        
+        if file_size <= self.MAX_FILE_SIZE_BYTES:
+            print(f"✅ Video is under size limit ({size_gb:.2f}GB < 1.9GB), no compression needed", flush=True)
             return (video_path, False)
         
-        info = self.get_video_info(video_path)
-        print(f"📦 Video exceeds size limit ({info.file_size_gb:.2f}GB > 1.9GB), compressing...", flush=True)
+        print(f"📦 Video exceeds size limit ({size_gb:.2f}GB > 1.9GB), compressing...", flush=True)
         
-        compressed_path = self.compress_video(video_path, job_id=job_id)
+        info = self.get_video_info(video_path, file_size=file_size)
+        compressed_path = self.compress_video(video_path, job_id=job_id, info=info)
         return (compressed_path, True)
     
-    def cleanup_compressed(self, job_id: str):
+    async def compress_many_if_needed(
+        self,
+        video_paths: List[str],
+        job_id: str = "default"
+    ) -> List[Tuple[str, bool]]:
+        """
+        Batch variant of compress_if_needed.
+        
+        Probes every oversized file concurrently first (warming the probe cache),
+        then runs the per-file compress step in worker threads; actual encodes are
+        still bounded by the shared encode semaphore.
+        
+        Args:
+            video_paths: Paths to source videos
+            job_id: Job identifier (each file gets its own sub-directory)
+            
+        Returns:
+            (output_path, was_compressed) per input, in input order
+        """
+        await self.probe_many([p for p in video_paths if self.needs_compression(p)])
+        return list(await asyncio.gather(*[
+            asyncio.to_thread(self.compress_if_needed, path, f"{job_id}/{idx}")
+            for idx, path in enumerate(video_paths)
+        ]))
+    
+    def cleanup_compressed(self, job_id: str, wait: bool = False):
         """
         Clean up compressed files for a job.
         
+        The job directory is renamed aside first (so the path is free for reuse
+        immediately) and then removed on a background thread, keeping the
+        caller's hot path off filesystem latency.
+        
         Args:
             job_id: Job identifier
+            wait: Remove synchronously instead of in the background
         """
         job_compressed_dir = os.path.join(self.compressed_dir, job_id)
         
-        if os.path.exists(job_compressed_dir):
-            import shutil
-            shutil.rmtree(job_compressed_dir)
-            print(f"🗑️ Cleaned up compressed files for job {job_id}", flush=True)
+        if not os.path.exists(job_compressed_dir):
+            return
+        
+        trash_dir = f"{job_compressed_dir}.deleting-{uuid.uuid4().hex[:8]}"
+        try:
+            os.rename(job_compressed_dir, trash_dir)
+        except OSError:
+            trash_dir = job_compressed_dir
+        
+        if wait:
+            shutil.rmtree(trash_dir, ignore_errors=True)
+        else:
+            threading.Thread(
+                target=shutil.rmtree,
+                args=(trash_dir,),
+                kwargs={"ignore_errors": True},
+                daemon=True
+            ).start()
+        print(f"🗑️ Cleaned up compressed files for job {job_id}", flush=True)
+
 
+@lru_cache(maxsize=1)
+def get_video_compressor() -> VideoCompressor:
+    """Get the shared VideoCompressor instance (usable as a FastAPI dependency)."""
+    return VideoCompressor()
@@ -6,13 +6,21 @@ This service checks video codecs and converts unsupported formats.
 """
 
 import os
-import subprocess
-import json
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
 from app.config import get_settings
-from app.services.ffmpeg_utils import run_ffmpeg, FFmpegError
+from app.services.container_sniffer import sniff_video_codec
+from app.services.ffmpeg_utils import (
+    run_ffmpeg_with_hw_fallback,
+    get_encode_semaphore,
+    resolve_encode_threads,
+    detect_h264_encoder,
+    h264_encode_args,
+    probe_media,
+    FFmpegError,
+)
 
 
 class VideoConverterService:
@@ -23,14 +31,24 @@ class VideoConverterService:
     """
     
     # Codecs supported by Memories.ai
-    SUPPORTED_CODECS = [
+    SUPPORTED_CODECS = frozenset({
         "h264", "avc1", "avc",      # H.264/AVC variants
         "h265", "hevc", "hev1",     # H.265/HEVC variants
         "vp9", "vp09",              # VP9 variants
-    ]
+    })
+    
+    # Audio codecs that can be muxed into MP4 as-is
+    MP4_AUDIO_CODECS = frozenset({"aac", "mp3"})
     
     def __init__(self):
         self.settings = get_settings()
+        
+        # Bound per-encode threads and the number of concurrent encodes
+        self.encode_threads = resolve_encode_threads(self.settings.ffmpeg.encode_threads_per_job)
+        self._encode_sem = get_encode_semaphore(self.encode_threads)
+        
+        # Best available H.264 encoder (hardware if present, else libx264)
+        self.video_encoder = detect_h264_encoder()
     
     def get_video_codec(self, file_path: str) -> Optional[str]:
         """
@@ -42,23 +60,10 @@ class VideoConverterService:
         Returns:
             Codec name (lowercase) or None if unable to determine
         """
-        cmd = [
-            "ffprobe",
-            "-v", "quiet",
-            "-print_format", "json",
-            "-show_streams",
-            "-select_streams", "v:0",  # First video stream
-            file_path
-        ]
-        
         try:
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-            
-            if result.returncode != 0:
-                print(f"⚠️ ffprobe failed: {result.stderr[:200]}", flush=True)
-                return None
-            
-            data = json.loads(result.stdout)
+            # Shares the memoized probe with VideoCompressor.get_video_info
+            # (first video stream only)
+            data = probe_media(file_path)
             streams = data.get("streams", [])
             
             if not streams:
@@ -69,16 +74,35 @@ class VideoConverterService:
             print(f"📹 Video codec detected: {codec}", flush=True)
             return codec
             
-        except subprocess.TimeoutExpired:
-            print(f"⚠️ ffprobe timed out for {file_path}", flush=True)
+        except FFmpegError as e:
+            print(f"⚠️ ffprobe failed: {e.stderr[:200] or e.message}", flush=True)
             return None
-        except json.JSONDecodeError:
+        except ValueError:
             print(f"⚠️ Failed to parse ffprobe output", flush=True)
             return None
         except Exception as e:
             print(f"⚠️ Error getting codec: {e}", flush=True)
             return None
     
+    def get_audio_codec(self, file_path: str) -> Optional[str]:
+        """
+        Get the codec of the first audio stream (shares the memoized probe).
+        
+        Args:
+            file_path: Path to the video file
+            
+        Returns:
+            Codec name (lowercase) or None if there's no audio / unable to determine
+        """
+        try:
+            audio_streams = probe_media(file_path).get("audio_streams", [])
+        except Exception as e:
+            print(f"⚠️ Error getting audio codec: {e}", flush=True)
+            return None
+        if not audio_streams:
+            return None
+        return (audio_streams[0].get("codec_name") or "").lower() or None
+    
     def needs_conversion(self, file_path: str) -> bool:
         """
         Check if video needs conversion for Memories.ai compatibility.
@@ -89,7 +113,13 @@ class VideoConverterService:
         Returns:
             True if conversion needed, False if already compatible
         """
-        codec = self.get_video_codec(file_path)
+        # Fast path: read the codec from container headers (MP4/MOV stsd,
+        # WebM/MKV CodecID) and only spawn ffprobe when that's inconclusive.
+        codec = sniff_video_codec(file_path)
+        if codec is not None:
+            print(f"📹 Video codec detected from container headers: {codec}", flush=True)
+        else:
+            codec = self.get_video_codec(file_path)
         
         if codec is None:
             # If we can't determine codec, try to convert to be safe
@@ -106,13 +136,19 @@ class VideoConverterService:
             
         return not is_supported
     
-    def convert_to_h264(self, input_path: str, output_path: Optional[str] = None) -> str:
+    def convert_to_h264(
+        self,
+        input_path: str,
+        output_path: Optional[str] = None,
+        audio_codec: Optional[str] = None
+    ) -> str:
         """
         Convert video to H.264 format using FFmpeg.
         
         Args:
             input_path: Path to the input video
             output_path: Optional output path (auto-generated if not provided)
+            audio_codec: Source audio codec if already known (probed if None)
             
         Returns:
             Path to the converted video
@@ -125,27 +161,40 @@ class VideoConverterService:
             input_file = Path(input_path)
             output_path = str(input_file.parent / f"{input_file.stem}_h264.mp4")
         
-        print(f"🔄 Converting video to H.264: {input_path}", flush=True)
-        print(f"📁 Output: {output_path}", flush=True)
+        print(f"🔄 Converting video to H.264: {input_path}\n📁 Output: {output_path}", flush=True)
+        
+        # MP4-compatible audio is stream-copied (pure mux); anything else → AAC
+        if audio_codec is None:
+            audio_codec = self.get_audio_codec(input_path)
+        if audio_codec in self.MP4_AUDIO_CODECS:
+            audio_args = ["-c:a", "copy"]
+        else:
+            audio_args = ["-c:a", "aac", "-b:a", "192k"]
         
         # FFmpeg command for H.264 conversion
-        # Using libx264 with reasonable quality settings
-        cmd = [
-            "ffmpeg",
-            "-y",                       # Overwrite output
-            "-i", input_path,           # Input file
-            "-c:v", "libx264",          # H.264 video codec
-            "-preset", "medium",        # Balance speed/quality
-            "-crf", "23",               # Quality (lower = better, 23 is default)
-            "-c:a", "aac",              # AAC audio codec
-            "-b:a", "192k",             # Audio bitrate
-            "-movflags", "+faststart",  # Web optimization
-            "-max_muxing_queue_size", "1024",  # Prevent muxing errors
-            output_path
-        ]
+        # Quality 23 (CRF for libx264, the equivalent CQ/QP for hardware encoders)
+        def build_cmd(hw_decode: bool) -> list:
+            pre_input_args, video_args = h264_encode_args(
+                self.video_encoder,
+                quality=23,
+                threads=self.encode_threads,
+                hw_decode=hw_decode,
+            )
+            return [
+                "ffmpeg",
+                "-y",                       # Overwrite output
+                *pre_input_args,            # Hardware decode (if available)
+                "-i", input_path,           # Input file
+                *video_args,                # H.264 video codec + quality
+                *audio_args,                # Copy or AAC re-encode
+                "-movflags", "+faststart",  # Web optimization
+                "-max_muxing_queue_size", "1024",  # Prevent muxing errors
+                output_path
+            ]
         
         try:
-            run_ffmpeg(cmd, timeout=3600)
+            with self._encode_sem:
+                run_ffmpeg_with_hw_fallback(build_cmd, timeout=3600)
             
             # Verify output exists and has content
             if not os.path.exists(output_path):
@@ -207,3 +256,9 @@ class VideoConverterService:
                 print(f"⚠️ Failed to cleanup converted file: {e}", flush=True)
 
 
+
+
+@lru_cache(maxsize=1)
+def get_video_converter() -> VideoConverterService:
+    """Get the shared VideoConverterService instance (usable as a FastAPI dependency)."""
+    return VideoConverterService()
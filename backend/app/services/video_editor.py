@@ -1,12 +1,28 @@
 from __future__ import annotations
 
+import asyncio
 import os
-import tempfile
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Iterable, List, Optional, Sequence
+from functools import partial
+from typing import Callable, Iterable, List, Optional, Sequence
 
 from app.config import get_settings
-from app.services.ffmpeg_utils import run_ffmpeg_capture, run_ffprobe_capture, FFmpegError, sanitize_ffmpeg_stderr
+from app.services.container_sniffer import probe_mp4
+from app.services.ffmpeg_utils import (
+    run_ffmpeg_capture,
+    probe_media,
+    resolve_encode_threads,
+    get_encode_semaphore,
+    FFmpegError,
+    sanitize_ffmpeg_stderr,
+    H264_HW_ENCODERS,
+    H264_SOFTWARE_ENCODER,
+    detect_h264_encoder,
+    h264_encode_args,
+)
 
 
 def decide_video_time_adjustment(
@@ -52,6 +68,18 @@ def decide_video_time_adjustment(
     return ("setpts", factor)
 
 
+# stderr of a hardware encode that failed because the encoder or its device couldn't be
+# set up (driver, session limit, missing device), as opposed to bad input, a filter-graph
+# error or a full disk, which libx264 would hit just the same.
+_HW_ENCODER_INIT_FAILURE = re.compile(
+    r"error (?:while opening|initializing output stream)|could not open encoder|"
+    r"no (?:nvenc )?capable devices|openencodesessionex|cannot load (?:libcuda|libnvidia-encode|nvcuda)|"
+    r"cuda_error|device creation failed|failed to (?:initiali[sz]e|create) (?:a )?(?:vaapi|qsv|mfx)|"
+    r"error creating a mfx session|hwupload|hw_frames_ctx|unknown encoder|encoder not found",
+    re.IGNORECASE,
+)
+
+
 @dataclass
 class SceneSpec:
     """Internal normalized scene spec for stitching."""
@@ -76,6 +104,12 @@ class VideoEditorService:
 
     def __init__(self) -> None:
         self.settings = get_settings()
+        # libx264 (the default video_codec) is upgraded to the best available hardware
+        # H.264 encoder (FFMPEG_HW_ENCODER); any other configured codec is used as-is.
+        configured = self.settings.ffmpeg.video_codec
+        self.video_encoder = detect_h264_encoder() if configured == H264_SOFTWARE_ENCODER else configured
+        # Scene encodes run on pool threads; guards the one-way switch to libx264
+        self._encoder_lock = threading.Lock()
 
     def _require_file(self, path: str, *, label: str) -> None:
         """
@@ -92,43 +126,123 @@ class VideoEditorService:
         except Exception as e:
             raise FFmpegError(message=f"Failed to validate {label} file '{path}': {e}")
     
+    def _ffmpeg_threads(self, pool_workers: int = 1) -> int:
+        """
+        Encoder threads for one ffmpeg invocation.
+
+        settings.ffmpeg.threads_per_invocation if set, otherwise the CPUs split across
+        pool_workers concurrent encodes. FFMPEG_THREADS (worker OOM guard) still wins.
+        """
+        configured = int(self.settings.ffmpeg.threads_per_invocation or 0)
+        if configured <= 0:
+            configured = (os.cpu_count() or 1) // max(1, int(pool_workers))
+        return resolve_encode_threads(configured)
+
+    def _video_rate_args(self) -> List[str]:
+        """
+        Rate-control args for libx264 encodes: CRF + preset by default, or the
+        fixed video_bitrate when settings.ffmpeg.video_rate_control == "bitrate".
+        """
+        cfg = self.settings.ffmpeg
+        if str(cfg.video_rate_control).lower() == "bitrate":
+            return ["-b:v", cfg.video_bitrate]
+        return ["-crf", str(cfg.video_crf), "-preset", cfg.video_preset]
+
+    def _video_encode_args(self, encoder: str, *, threads: int) -> tuple[List[str], List[str], str]:
+        """
+        Encoder arguments for one editor encode.
+
+        Returns:
+          (pre_input_args, codec_args, vf_suffix)
+            - pre_input_args: go before the first "-i" (e.g. the VAAPI device)
+            - codec_args: codec, rate control and pixel format
+            - vf_suffix: appended to the command's last video filter chain (VAAPI
+              needs frames uploaded to the device)
+        """
+        if encoder not in H264_HW_ENCODERS:
+            return [], ["-c:v", encoder, *self._video_rate_args(), "-threads", str(threads), "-pix_fmt", "yuv420p"], ""
+
+        cfg = self.settings.ffmpeg
+        bitrate_mode = str(cfg.video_rate_control).lower() == "bitrate"
+        pre_input, args = h264_encode_args(encoder, quality=None if bitrate_mode else int(cfg.video_crf))
+        # Filters come from the editor's own graph; keep only codec + rate control
+        args = args[args.index("-c:v"):]
+        if bitrate_mode:
+            args += ["-b:v", cfg.video_bitrate]
+        if encoder == "h264_vaapi":
+            return pre_input, args, ",format=nv12,hwupload"
+        # QSV only takes NV12 system-memory frames
+        return pre_input, args + ["-pix_fmt", "nv12" if encoder == "h264_qsv" else "yuv420p"], ""
+
+    def _run_encode(self, run: Callable[[str], None]) -> None:
+        """
+        Call run(encoder) with the selected encoder. If a hardware encoder or its device
+        fails to initialize, switch this service to libx264 and retry once; any other
+        failure (bad input, filter graph, disk) is raised as-is.
+        """
+        encoder = self.video_encoder
+        try:
+            run(encoder)
+        except FFmpegError as e:
+            if encoder not in H264_HW_ENCODERS or not _HW_ENCODER_INIT_FAILURE.search(e.stderr or e.message or ""):
+                raise
+            with self._encoder_lock:
+                if self.video_encoder == encoder:
+                    print(f"⚠️ {encoder} failed to initialize, falling back to {H264_SOFTWARE_ENCODER}: {e.message[:200]}", flush=True)
+                    self.video_encoder = H264_SOFTWARE_ENCODER
+            run(H264_SOFTWARE_ENCODER)
+
     def get_media_duration(self, path: str) -> float:
         """
         Return media duration in seconds using ffprobe.
+
+        Goes through probe_media(), whose results are memoized per (path, mtime, size),
+        so repeated lookups of an unchanged file (e.g. the source video) spawn ffprobe once.
         """
         if not path:
             return 0.0
-    
-        proc = run_ffprobe_capture(
-            [
-                "ffprobe",
-                "-v",
-                "error",
-                "-show_entries",
-                "format=duration",
-                "-of",
-                "default=noprint_wrappers=1:nokey=1",
-                path,
-            ],
-            check=True,
-            timeout=60,
-        )
-        out = (proc.stdout or "").strip()
+
+        data = probe_media(path)
         try:
-            return float(out)
-        except Exception:
+            return float(data.get("format", {}).get("duration", 0.0))
+        except (TypeError, ValueError):
             return 0.0
 
-    def extract_audio_clip(self, *, video_path: str, start_time: float, end_time: float, output_path: str) -> None:
+    # Output extension -> audio codec that can be stream-copied into it.
+    _CLIP_COPY_CODECS = {".mp3": "mp3", ".m4a": "aac", ".aac": "aac"}
+
+    def extract_audio_clip(
+        self,
+        *,
+        video_path: str,
+        start_time: float,
+        end_time: float,
+        output_path: str,
+        codec: Optional[str] = None,
+    ) -> None:
         """
         Extract an audio segment from the source video and write to output_path.
+
+        When the source audio already matches the output container (AAC -> .m4a/.aac,
+        MP3 -> .mp3) at 44.1kHz stereo, the clip is stream-copied instead of re-encoded.
+        Pass codec (e.g. "libmp3lame") to force a re-encode.
         """
         os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
         dur = max(0.0, float(end_time) - float(start_time))
         if dur <= 0:
             raise ValueError("Invalid audio clip duration")
 
-        # Re-encode to mp3 for broad compatibility.
+        if codec is None:
+            wanted = self._CLIP_COPY_CODECS.get(os.path.splitext(output_path)[1].lower())
+            sig = self._audio_signature(video_path) if wanted else None
+            if sig and sig[0] == wanted and str(sig[1]) == "44100" and sig[2] == 2:
+                codec_args = ["-c:a", "copy"]
+            else:
+                codec = "libmp3lame" if wanted in (None, "mp3") else "aac"
+        if codec is not None:
+            # Re-encode for broad compatibility.
+            codec_args = ["-ac", "2", "-ar", "44100", "-c:a", codec, "-b:a", "192k"]
+
         run_ffmpeg_capture(
             [
                 "ffmpeg",
@@ -142,14 +256,7 @@ class VideoEditorService:
                 "-i",
                 video_path,
                 "-vn",
-                "-ac",
-                "2",
-                "-ar",
-                "44100",
-                "-c:a",
-                "libmp3lame",
-                "-b:a",
-                "192k",
+                *codec_args,
                 output_path,
             ],
             check=True,
@@ -170,250 +277,392 @@ class VideoEditorService:
             )
         return out
 
-    def _write_concat_file(self, paths: Iterable[str], *, dir_path: Optional[str] = None) -> str:
+    def _concat_listing(self, paths: Iterable[str]) -> bytes:
         """
-        Write an ffmpeg concat-demuxer list file.
+        Build an ffmpeg concat-demuxer list, fed to ffmpeg over stdin.
 
         IMPORTANT:
-        - We always write ABSOLUTE paths because ffmpeg resolves relative paths relative to
-          the list file location (often /tmp), which can break when our work dir is elsewhere.
-        - Optionally place the list file in the same directory as the media segments.
-        """
-        fd, list_path = tempfile.mkstemp(prefix="concat_", suffix=".txt", dir=dir_path)
-        os.close(fd)
-        with open(list_path, "w", encoding="utf-8") as f:
-            for p in paths:
-                # concat demuxer expects `file '...path...'`
-                abs_p = os.path.abspath(p)
-                escaped = abs_p.replace("'", "'\\''")
-                f.write(f"file '{escaped}'\n")
-        return list_path
-
-    def _stretch_video_to_duration(self, *, input_path: str, output_path: str, target_duration: float) -> None:
-        src_dur = self.get_media_duration(input_path)
-        if src_dur <= 0 or target_duration <= 0:
-            raise ValueError("Invalid durations for time-stretch")
-
-        mode, factor = decide_video_time_adjustment(
-            src_duration=src_dur,
-            target_duration=target_duration,
-            allow_speedup=False,  # critical: avoid noticeable speed-up artifacts
-            max_slowdown_factor=1.35,
-            epsilon_ratio=0.02,
+        - We always write ABSOLUTE paths; relative entries would be resolved against the
+          list's location, which for a pipe is meaningless.
+        """
+        lines = []
+        for p in paths:
+            # concat demuxer expects `file '...path...'`
+            escaped = os.path.abspath(p).replace("'", "'\\''")
+            lines.append(f"file '{escaped}'\n")
+        return "".join(lines).encode("utf-8")
+
+    def _video_signature(self, path: str) -> Optional[tuple]:
+        # Segments are our own MP4s (always yuv420p), so the moov box is enough.
+        data = probe_mp4(path)
+        if not data:
+            return None
+        stream = data["streams"][0]
+        return (stream.get("codec_name"), stream.get("width"), stream.get("height"))
+
+    def _audio_signature(self, path: str) -> Optional[tuple]:
+        try:
+            data = probe_media(path)
+        except (FFmpegError, OSError, ValueError):
+            return None
+        streams = data.get("audio_streams") or []
+        if not streams:
+            return None
+        stream = streams[0]
+        return (stream.get("codec_name"), stream.get("sample_rate"), stream.get("channels"))
+
+    # Bitstream filters that turn MP4 (length-prefixed) video into MPEG-TS (Annex B)
+    _ANNEXB_BSF = {"h264": "h264_mp4toannexb", "hevc": "hevc_mp4toannexb"}
+
+    def _run_concat_demuxer(
+        self,
+        *,
+        paths: Sequence[str],
+        output_path: str,
+        codec_args: Sequence[str],
+        timeout: int,
+        pre_input_args: Sequence[str] = (),
+    ) -> None:
+        run_ffmpeg_capture(
+            [
+                "ffmpeg",
+                "-y",
+                "-v",
+                "error",
+                *pre_input_args,
+                "-f",
+                "concat",
+                "-safe",
+                "0",
+                "-protocol_whitelist",
+                "pipe,file",
+                "-i",
+                "pipe:0",
+                *codec_args,
+                output_path,
+            ],
+            check=True,
+            timeout=timeout,
+            input=self._concat_listing(paths),
         )
-        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
 
-        # Minimal diagnostics: helps debug perceived "fast-forward" or unexpected slowdowns.
-        if mode != "none":
-            try:
-                ratio = float(target_duration) / float(src_dur)
-                factor_str = "" if factor is None else f", setpts_factor={float(factor):.3f}"
-                print(
-                    f"🎞️ Align video segment: src={src_dur:.2f}s -> target={float(target_duration):.2f}s (ratio={ratio:.3f}, mode={mode}{factor_str})",
-                    flush=True,
-                )
-            except Exception:
-                pass
+    def _concat_videos_ts(self, *, video_paths: Sequence[str], output_path: str, bsf: str) -> None:
+        """
+        Stream-copy concat through MPEG-TS intermediates and the concat protocol.
 
-        if mode == "none":
-            # No timing changes needed; re-encode for consistency.
-            run_ffmpeg_capture(
-                [
-                    "ffmpeg",
-                    "-y",
-                    "-v",
-                    "error",
-                    "-i",
-                    input_path,
-                    "-an",
-                    "-c:v",
-                    self.settings.ffmpeg.video_codec,
-                    "-b:v",
-                    self.settings.ffmpeg.video_bitrate,
-                    "-pix_fmt",
-                    "yuv420p",
-                    output_path,
-                ],
-                check=True,
-                timeout=1200,
-            )
-        elif mode == "trim":
-            # Keep natural speed and shorten visuals to match narration.
-            # This prevents the "sped up" look when narration is shorter than the clip.
-            run_ffmpeg_capture(
-                [
-                    "ffmpeg",
-                    "-y",
-                    "-v",
-                    "error",
-                    "-i",
-                    input_path,
-                    "-an",
-                    "-t",
-                    str(float(target_duration)),
-                    "-c:v",
-                    self.settings.ffmpeg.video_codec,
-                    "-b:v",
-                    self.settings.ffmpeg.video_bitrate,
-                    "-pix_fmt",
-                    "yuv420p",
-                    output_path,
-                ],
-                check=True,
-                timeout=1200,
-            )
-        else:
-            # setpts factor: >1 slows down, <1 speeds up. Factor = target/src.
-            # We currently only enter this branch for slow-down (ratio > 1) by default.
-            if factor is None:
-                raise ValueError("Missing setpts factor")
+        TS segments concatenate at the byte level, so this works even when the concat
+        demuxer rejects the MP4 segments (e.g. timestamps rewritten by setpts).
+        """
+        ts_dir = os.path.dirname(os.path.abspath(output_path))
+        ts_paths = [os.path.join(ts_dir, f"concat_{i:04d}.ts") for i in range(len(video_paths))]
+
+        def remux(src: str, dst: str) -> None:
             run_ffmpeg_capture(
-                [
-                    "ffmpeg",
-                    "-y",
-                    "-v",
-                    "error",
-                    "-i",
-                    input_path,
-                    "-an",
-                    "-vf",
-                    f"setpts={float(factor)}*PTS",
-                    "-c:v",
-                    self.settings.ffmpeg.video_codec,
-                    "-b:v",
-                    self.settings.ffmpeg.video_bitrate,
-                    "-pix_fmt",
-                    "yuv420p",
-                    output_path,
-                ],
+                ["ffmpeg", "-y", "-v", "error", "-i", src, "-c", "copy", "-bsf:v", bsf, "-f", "mpegts", dst],
                 check=True,
-                timeout=1200,
+                timeout=600,
             )
-        self._require_file(output_path, label="stretched segment")
 
-    def _concat_videos(self, *, video_paths: Sequence[str], output_path: str) -> None:
-        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
-        list_path = self._write_concat_file(video_paths, dir_path=os.path.dirname(os.path.abspath(output_path)) or None)
         try:
-            # Re-encode to avoid codec/stream mismatch issues.
+            with ThreadPoolExecutor(max_workers=min(len(video_paths), os.cpu_count() or 1)) as ex:
+                list(ex.map(remux, video_paths, ts_paths))
             run_ffmpeg_capture(
-                [
-            "ffmpeg",
-            "-y",
-                    "-v",
-                    "error",
-                    "-f",
-                    "concat",
-                    "-safe",
-                    "0",
-                    "-i",
-                    list_path,
-                    "-an",
-                    "-c:v",
-                    self.settings.ffmpeg.video_codec,
-                    "-b:v",
-                    self.settings.ffmpeg.video_bitrate,
-                    "-pix_fmt",
-                    "yuv420p",
-                    output_path,
-                ],
+                ["ffmpeg", "-y", "-v", "error", "-i", "concat:" + "|".join(ts_paths), "-c", "copy", output_path],
                 check=True,
                 timeout=1800,
             )
         finally:
+            for ts_path in ts_paths:
+                try:
+                    os.remove(ts_path)
+                except OSError:
+                    pass
+
+    def _concat_videos(self, *, video_paths: Sequence[str], output_path: str) -> None:
+        # Segments produced by _prepare_scene share codec/size/pix_fmt, so they can be
+        # stream-copied (concat demuxer, then MPEG-TS concat); re-encode only as a last resort.
+        signatures = {self._video_signature(p) for p in video_paths}
+        signature = signatures.pop() if len(signatures) == 1 else None
+        if signature is not None:
             try:
-                os.remove(list_path)
-            except Exception:
-                pass
+                self._run_concat_demuxer(paths=video_paths, output_path=output_path, codec_args=["-an", "-c", "copy"], timeout=1800)
+                return
+            except FFmpegError as e:
+                print(f"⚠️ Stream-copy concat failed ({e.message}), retrying via MPEG-TS", flush=True)
+            bsf = self._ANNEXB_BSF.get(signature[0])
+            if bsf:
+                try:
+                    self._concat_videos_ts(video_paths=video_paths, output_path=output_path, bsf=bsf)
+                    return
+                except FFmpegError as e:
+                    print(f"⚠️ MPEG-TS concat failed ({e.message}), re-encoding concat", flush=True)
+        else:
+            print("⚠️ Video segments differ in codec/size, re-encoding concat", flush=True)
+
+        def run(encoder: str) -> None:
+            pre_input, codec_args, vf_suffix = self._video_encode_args(encoder, threads=self._ffmpeg_threads())
+            self._run_concat_demuxer(
+                paths=video_paths,
+                output_path=output_path,
+                codec_args=["-an", *(["-vf", vf_suffix.lstrip(",")] if vf_suffix else []), *codec_args],
+                timeout=1800,
+                pre_input_args=pre_input,
+            )
+
+        self._run_encode(run)
 
     def _concat_audios_to_m4a(self, *, audio_paths: Sequence[str], output_path: str) -> None:
-        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
-        list_path = self._write_concat_file(audio_paths, dir_path=os.path.dirname(os.path.abspath(output_path)) or None)
-        try:
-            # Re-encode into AAC for stable muxing.
+        # Uniform AAC-in-MP4 inputs are stream-copied; anything else (e.g. mp3 narration)
+        # is re-encoded into AAC for stable muxing.
+        # The extension check is free, so only probe when every input could be AAC-in-MP4.
+        uniform_aac = False
+        if all(p.lower().endswith((".m4a", ".mp4")) for p in audio_paths):
+            signatures = {self._audio_signature(p) for p in audio_paths}
+            signature = signatures.pop() if len(signatures) == 1 else None
+            uniform_aac = signature is not None and signature[0] == "aac"
+        codec_args = ["-c", "copy"] if uniform_aac else ["-c:a", "aac", "-b:a", "192k"]
+        self._run_concat_demuxer(paths=audio_paths, output_path=output_path, codec_args=codec_args, timeout=1200)
+
+    def _plan_scene_video(self, scene: SceneSpec) -> tuple[float, str]:
+        """
+        Decide how a scene's source range is aligned to its narration, without ffprobe.
+
+        Returns:
+          (read_duration, setpts_expr)
+            - read_duration: seconds to read from scene.video_start
+            - setpts_expr: setpts expression applied to the frames read
+        """
+        seg_dur = max(0.0, scene.video_end - scene.video_start)
+        if seg_dur <= 0:
+            raise ValueError(f"Invalid scene {scene.id} video range")
+        if scene.target_duration <= 0:
+            raise ValueError(f"Invalid scene {scene.id} target_duration")
+
+        mode, factor = decide_video_time_adjustment(
+            src_duration=seg_dur,
+            target_duration=scene.target_duration,
+            allow_speedup=False,  # critical: avoid noticeable speed-up artifacts
+            max_slowdown_factor=1.35,
+            epsilon_ratio=0.02,
+        )
+        if mode != "none":
+            factor_str = "" if factor is None else f", setpts_factor={float(factor):.3f}"
+            print(
+                f"🎞️ Align scene {scene.id}: src={seg_dur:.2f}s -> target={scene.target_duration:.2f}s (ratio={scene.target_duration / seg_dur:.3f}, mode={mode}{factor_str})",
+                flush=True,
+            )
+
+        if mode == "trim":
+            # Keep natural speed; just read less of the source.
+            return (float(scene.target_duration), "PTS-STARTPTS")
+        if mode == "setpts":
+            if factor is None:
+                raise ValueError("Missing setpts factor")
+            return (seg_dur, f"{float(factor)}*(PTS-STARTPTS)")
+        return (seg_dur, "PTS-STARTPTS")
+
+    def _stitch_single_pass(
+        self,
+        *,
+        source_video: str,
+        scenes: Sequence[SceneSpec],
+        plans: Sequence[tuple[float, str]],
+        output_path: str,
+        faststart: bool = True,
+        post_filter: Optional[str] = None,
+    ) -> None:
+        """
+        Stitch all scenes with one ffmpeg process and a single encode.
+
+        Inputs 0..N-1 are the source seeked to each scene's range, inputs N..2N-1 the
+        narration audios; a filter graph aligns each video range (setpts), concatenates
+        the videos (then applies post_filter, if any) and the audios, and the result is
+        muxed in the same invocation.
+        """
+        post = f",{post_filter}" if post_filter else ""
+        n = len(scenes)
+
+        def run(encoder: str) -> None:
+            pre_input, codec_args, vf_suffix = self._video_encode_args(encoder, threads=self._ffmpeg_threads())
+            cmd: List[str] = ["ffmpeg", "-y", "-v", "error", *pre_input]
+            for scene, (read_dur, _) in zip(scenes, plans):
+                cmd += ["-ss", str(scene.video_start), "-t", str(read_dur), "-i", source_video]
+            for scene in scenes:
+                cmd += ["-i", scene.audio_path]
+
+            filters = [f"[{i}:v]setpts={expr}[v{i}]" for i, (_, expr) in enumerate(plans)]
+            filters.append("".join(f"[v{i}]" for i in range(n)) + f"concat=n={n}:v=1:a=0{post}{vf_suffix}[vout]")
+            filters.append("".join(f"[{n + i}:a]" for i in range(n)) + f"concat=n={n}:v=0:a=1[aout]")
+
             run_ffmpeg_capture(
-                [
-                    "ffmpeg",
-                    "-y",
-                    "-v",
-                    "error",
-                    "-f",
-                    "concat",
-                    "-safe",
-                    "0",
-                    "-i",
-                    list_path,
+                cmd
+                + [
+                    "-filter_complex",
+                    ";".join(filters),
+                    "-map",
+                    "[vout]",
+                    "-map",
+                    "[aout]",
+                    *codec_args,
                     "-c:a",
                     "aac",
                     "-b:a",
                     "192k",
+                    "-shortest",
+                    *(["-movflags", "+faststart"] if faststart else []),
                     output_path,
                 ],
                 check=True,
-                timeout=1200,
+                timeout=3600,
             )
-        finally:
-            try:
-                os.remove(list_path)
-            except Exception:
-                pass
 
-    async def stitch_elastic(self, *, source_video: str, scenes: Sequence[dict], output_path: str) -> None:
-        """
-        Stitch a recap by elastic time-stretching each scene's video to match narration audio.
-        """
-        work_dir = os.path.join(os.path.dirname(output_path) or ".", "_work_stitch")
-        os.makedirs(work_dir, exist_ok=True)
+        self._run_encode(run)
+        self._require_file(output_path, label="stitched video")
 
-        normalized = self._normalize_scenes(scenes)
-        if not normalized:
-            raise ValueError("No scenes to stitch")
+    def _prepare_scene(
+        self,
+        scene: SceneSpec,
+        plan: tuple[float, str],
+        *,
+        source_video: str,
+        work_dir: str,
+        pool_workers: int = 1,
+        post_filter: Optional[str] = None,
+    ) -> tuple[str, str]:
+        """
+        Extract and align one scene's video segment for the segmented stitch path.
 
-        stretched_videos: List[str] = []
-        audios: List[str] = []
+        Extraction, the setpts alignment from _plan_scene_video and post_filter run in
+        one ffmpeg process, so each scene is decoded and encoded once.
 
-        for scene in normalized:
-            seg_dur = max(0.0, scene.video_end - scene.video_start)
-            if seg_dur <= 0:
-                raise ValueError(f"Invalid scene {scene.id} video range")
-            if scene.target_duration <= 0:
-                raise ValueError(f"Invalid scene {scene.id} target_duration")
+        Returns:
+          (stretched_video_path, narration_audio_path)
+        """
+        read_dur, setpts_expr = plan
+        post = f",{post_filter}" if post_filter else ""
+        stretched = os.path.join(work_dir, f"scene_{scene.id:04d}_stretched.mp4")
 
-            # 1) Extract raw video segment (no audio)
-            raw_seg = os.path.join(work_dir, f"scene_{scene.id:04d}_raw.mp4")
+        def run(encoder: str) -> None:
+            pre_input, codec_args, vf_suffix = self._video_encode_args(encoder, threads=self._ffmpeg_threads(pool_workers))
             run_ffmpeg_capture(
                 [
                     "ffmpeg",
                     "-y",
                     "-v",
                     "error",
+                    *pre_input,
                     "-ss",
                     str(scene.video_start),
                     "-t",
-                    str(seg_dur),
+                    str(read_dur),
                     "-i",
                     source_video,
                     "-an",
-                    "-c:v",
-                    self.settings.ffmpeg.video_codec,
-                    "-b:v",
-                    self.settings.ffmpeg.video_bitrate,
-                    "-pix_fmt",
-                    "yuv420p",
-                    raw_seg,
+                    "-vf",
+                    f"setpts={setpts_expr}{post}{vf_suffix}",
+                    *codec_args,
+                    stretched,
                 ],
                 check=True,
                 timeout=1200,
             )
-            self._require_file(raw_seg, label="raw segment")
 
-            # 2) Stretch raw segment to target duration
-            stretched = os.path.join(work_dir, f"scene_{scene.id:04d}_stretched.mp4")
-            self._stretch_video_to_duration(input_path=raw_seg, output_path=stretched, target_duration=scene.target_duration)
-            stretched_videos.append(stretched)
+        # The process-wide encode semaphore (shared with the converter/compressor) is the
+        # worker's OOM guard; the pool below may be sized from host CPUs in a container
+        with get_encode_semaphore(resolve_encode_threads(self.settings.ffmpeg.encode_threads_per_job)):
+            self._run_encode(run)
+        self._require_file(stretched, label="stretched segment")
+        return (stretched, scene.audio_path)
 
-            # 3) Add corresponding narration audio path
-            audios.append(scene.audio_path)
+    async def stitch_elastic(
+        self,
+        *,
+        source_video: str,
+        scenes: Sequence[dict],
+        output_path: str,
+        faststart: bool = True,
+        post_filter: Optional[str] = None,
+    ) -> None:
+        """
+        Async entrypoint for _stitch_elastic_sync; the ffmpeg work runs in a worker thread
+        so the event loop stays responsive.
+        """
+        await asyncio.to_thread(
+            self._stitch_elastic_sync,
+            source_video=source_video,
+            scenes=scenes,
+            output_path=output_path,
+            faststart=faststart,
+            post_filter=post_filter,
+        )
+
+    def _stitch_elastic_sync(
+        self,
+        *,
+        source_video: str,
+        scenes: Sequence[dict],
+        output_path: str,
+        faststart: bool = True,
+        post_filter: Optional[str] = None,
+    ) -> None:
+        """
+        Stitch a recap by elastic time-stretching each scene's video to match narration audio.
+
+        faststart moves the moov box to the front for progressive playback, which costs a
+        second pass over the output; pass False when the result is only an intermediate.
+
+        post_filter (e.g. from post_transform_filter()) is applied inside the stitch
+        encode, replacing a separate apply_post_transforms pass.
+
+        Up to settings.ffmpeg.single_pass_max_scenes scenes are stitched in one ffmpeg pass
+        (one encode of the timeline, but one seeked input and decoder per scene); longer
+        recaps, or a failed single pass, use per-scene segment files.
+        """
+        normalized = self._normalize_scenes(scenes)
+        if not normalized:
+            raise ValueError("No scenes to stitch")
+        plans = [self._plan_scene_video(scene) for scene in normalized]
+
+        # Directories are created here once; the private helpers below assume they exist.
+        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+
+        if len(normalized) <= int(self.settings.ffmpeg.single_pass_max_scenes or 0):
+            try:
+                self._stitch_single_pass(
+                    source_video=source_video,
+                    scenes=normalized,
+                    plans=plans,
+                    output_path=output_path,
+                    faststart=faststart,
+                    post_filter=post_filter,
+                )
+                return
+            except FFmpegError as e:
+                print(f"⚠️ Single-pass stitch failed, falling back to per-scene segments: {e.message}", flush=True)
+
+        work_dir = os.path.join(os.path.dirname(output_path) or ".", "_work_stitch")
+        os.makedirs(work_dir, exist_ok=True)
+
+        # Scenes are independent (own output files, read-only source): prepare them in
+        # parallel, splitting the CPUs between the concurrent encodes. How many encodes
+        # actually run at once is bounded by get_encode_semaphore() in _prepare_scene.
+        pool_workers = min(len(normalized), max(1, (os.cpu_count() or 1) // 2))
+        with ThreadPoolExecutor(max_workers=pool_workers) as ex:
+            prepared = list(
+                ex.map(
+                    partial(
+                        self._prepare_scene,
+                        source_video=source_video,
+                        work_dir=work_dir,
+                        pool_workers=pool_workers,
+                        post_filter=post_filter,
+                    ),
+                    normalized,
+                    plans,
+                )
+            )
+        stretched_videos = [stretched for stretched, _ in prepared]
+        audios = [audio for _, audio in prepared]
 
         # 4) Concat all stretched videos
         concat_video = os.path.join(work_dir, "video_concat.mp4")
@@ -424,7 +673,6 @@ class VideoEditorService:
         self._concat_audios_to_m4a(audio_paths=audios, output_path=concat_audio)
 
         # 6) Mux together into output
-        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
         run_ffmpeg_capture(
             [
                 "ffmpeg",
@@ -437,11 +685,11 @@ class VideoEditorService:
                 concat_audio,
                 "-c:v",
                 "copy",
+                # Already AAC from _concat_audios_to_m4a
                 "-c:a",
-                "aac",
+                "copy",
                 "-shortest",
-                "-movflags",
-                "+faststart",
+                *(["-movflags", "+faststart"] if faststart else []),
                 output_path,
             ],
             check=True,
@@ -450,7 +698,14 @@ class VideoEditorService:
 
     # ---- Copyright protection path (compat) ----
 
-    def elastic_stitch_protected_scenes(self, source_video: str, protected_scenes: Sequence[object], output_path: str) -> None:
+    def elastic_stitch_protected_scenes(
+        self,
+        source_video: str,
+        protected_scenes: Sequence[object],
+        output_path: str,
+        faststart: bool = True,
+        post_filter: Optional[str] = None,
+    ) -> None:
         """
         Back-compat entrypoint used by the pipeline when copyright protection is enabled.
 
@@ -470,11 +725,28 @@ class VideoEditorService:
                 }
             )
 
-        # Run the async stitcher synchronously (worker already calls this in a thread).
-        import asyncio
-
-        asyncio.run(self.stitch_elastic(source_video=source_video, scenes=scenes, output_path=output_path))
+        # Worker already calls this in a thread; stitch directly, no event loop needed.
+        self._stitch_elastic_sync(
+            source_video=source_video,
+            scenes=scenes,
+            output_path=output_path,
+            faststart=faststart,
+            post_filter=post_filter,
+        )
     
+    @staticmethod
+    def post_transform_filter(
+        *,
+        brightness: float = 1.0,
+        saturation: float = 1.0,
+        contrast: float = 1.0,
+        hue_shift: float = 0.0,
+    ) -> str:
+        """
+        Video filter for mild post-processing (brightness/saturation/contrast/hue).
+        """
+        return f"eq=brightness={brightness-1.0}:saturation={saturation}:contrast={contrast},hue=h={hue_shift}"
+
     def apply_post_transforms(
         self,
         input_path: str,
@@ -487,33 +759,41 @@ class VideoEditorService:
     ) -> None:
         """
         Apply mild post-processing transforms (brightness/saturation/contrast/hue) and re-encode.
+
+        For a file that is about to be stitched, pass post_transform_filter() to
+        stitch_elastic instead; this standalone pass is for pre-existing files.
         """
         os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
-        vf = f"eq=brightness={brightness-1.0}:saturation={saturation}:contrast={contrast},hue=h={hue_shift}"
-        run_ffmpeg_capture(
-            [
-            "ffmpeg",
-            "-y",
-                "-v",
-                "error",
-                "-i",
-                input_path,
-                "-vf",
-                vf,
-                "-c:v",
-                self.settings.ffmpeg.video_codec,
-                "-b:v",
-                self.settings.ffmpeg.video_bitrate,
-                "-c:a",
-                "aac",
-                "-b:a",
-                "192k",
-                "-movflags",
-                "+faststart",
-                output_path,
-            ],
-            check=True,
-            timeout=1800,
+        vf = self.post_transform_filter(
+            brightness=brightness, saturation=saturation, contrast=contrast, hue_shift=hue_shift
         )
 
+        def run(encoder: str) -> None:
+            pre_input, codec_args, vf_suffix = self._video_encode_args(encoder, threads=self._ffmpeg_threads())
+            run_ffmpeg_capture(
+                [
+                    "ffmpeg",
+                    "-y",
+                    "-v",
+                    "error",
+                    *pre_input,
+                    "-i",
+                    input_path,
+                    "-vf",
+                    vf + vf_suffix,
+                    *codec_args,
+                    "-c:a",
+                    "aac",
+                    "-b:a",
+                    "192k",
+                    "-movflags",
+                    "+faststart",
+                    output_path,
+                ],
+                check=True,
+                timeout=1800,
+            )
+
+        self._run_encode(run)
+
 
@@ -5,8 +5,9 @@ Creates semantic embeddings from Memories.ai chapters to enable
 vector-based script-to-clip matching.
 """
 
+import asyncio
 import json
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple, Union
 import numpy as np
 try:
     from sentence_transformers import SentenceTransformer
@@ -80,44 +81,51 @@ class VideoIndexer:
                 video_no,
                 chapters
             )
+            # Segmentation already stored parsed float start/end on every segment
+            starts = np.array([c["start"] for c in chapters], dtype=np.float64)
+            ends = np.array([c["end"] for c in chapters], dtype=np.float64)
+        else:
+            starts = self._parse_times_vec([c.get("start", 0) for c in chapters])
+            ends = self._parse_times_vec([c.get("end", 0) for c in chapters])
         
         print(f"📖 Found {len(chapters)} chapters/segments, creating embeddings...", flush=True)
         
         # Create embeddings for each chapter
         scene_embeddings = []
+        scene_texts = []
+        
+        # Fetch missing visual descriptions from Memories.ai concurrently
+        missing = [idx for idx, chapter in enumerate(chapters) if not chapter.get('visual_desc')]
+        fetched = dict(zip(missing, await self._fetch_visual_descriptions(
+            video_no,
+            [(float(starts[idx]), float(ends[idx])) for idx in missing]
+        )))
         
         for idx, chapter in enumerate(chapters):
-            start_time = self._parse_time(chapter.get("start", 0))
-            end_time = self._parse_time(chapter.get("end", 0))
+            start_time = float(starts[idx])
+            end_time = float(ends[idx])
             title = chapter.get("title", f"Chapter {idx + 1}")
             description = chapter.get("description") or chapter.get("summary", "")
             
-            # Get visual description from Memories.ai (or use pre-computed if available)
+            # Visual description from Memories.ai (or pre-computed if available)
             visual_desc = chapter.get('visual_desc', "")
-            if not visual_desc:
-                try:
-                    visual_desc = await self.memories_client.get_visual_description(
-                        video_no=video_no,
-                        start_time=start_time,
-                        end_time=end_time
-                    )
-                except Exception as e:
-                    print(f"⚠️ Could not get visual description for chapter {idx + 1}: {e}", flush=True)
+            if idx in fetched:
+                if isinstance(fetched[idx], Exception):
+                    print(f"⚠️ Could not get visual description for chapter {idx + 1}: {fetched[idx]}", flush=True)
+                else:
+                    visual_desc = fetched[idx]
             
             # Get transcription if available (from chapter metadata or separate API call)
             transcription = chapter.get("transcription") or chapter.get("text", "")
             
-            # Combine into rich text representation
-            scene_text = self._build_scene_text(title, description, visual_desc, transcription)
-            
-            # Generate embedding
-            embedding = self.embedding_model.encode(scene_text, convert_to_numpy=True)
+            # Combine into rich text representation (embedded in one batch below)
+            scene_texts.append(self._build_scene_text(title, description, visual_desc, transcription))
             
             metadata = {
                 "title": title,
                 "description": description,
-                "visual_desc": visual_desc[:500] if visual_desc else "",  # Truncate for storage
-                "transcription": transcription[:500] if transcription else "",
+                "visual_desc": self._cap(visual_desc),  # Truncate for storage
+                "transcription": self._cap(transcription),
                 "index": idx
             }
             
@@ -125,18 +133,64 @@ class VideoIndexer:
                 "video_no": video_no,
                 "start_time": float(start_time),
                 "end_time": float(end_time),
-                "embedding": embedding,
                 "metadata": metadata
             })
             
             print(f"  ✓ Chapter {idx + 1}: {start_time:.1f}s - {end_time:.1f}s", flush=True)
         
+        # Generate all embeddings in one batched forward pass; unit-normalized for
+        # cosine search in the vector store
+        embeddings = self.embedding_model.encode(
+            scene_texts,
+            convert_to_numpy=True,
+            batch_size=32,
+            show_progress_bar=False,
+            normalize_embeddings=True
+        )
+        for scene, embedding in zip(scene_embeddings, embeddings):
+            scene["embedding"] = embedding
+        
         # Store in Redis/RediSearch
         await self.vector_store.store_scene_embeddings(video_no, scene_embeddings)
         
         print(f"✅ Indexed {len(scene_embeddings)} chapters for video {video_no}", flush=True)
         return scene_embeddings
 
+    async def _fetch_visual_descriptions(
+        self,
+        video_no: str,
+        ranges: List[Tuple[float, float]],
+        unique_id: str = "default"
+    ) -> List[Union[str, Exception]]:
+        """
+        Get Memories.ai visual descriptions for several time ranges concurrently.
+        
+        Returns:
+            One description (or the raised Exception) per range, in input order
+        """
+        semaphore = asyncio.Semaphore(3)  # Max 3 concurrent Memories.ai requests
+        
+        async def fetch_one(start_time: float, end_time: float) -> str:
+            async with semaphore:
+                return await self.memories_client.get_visual_description(
+                    video_no=video_no,
+                    start_time=start_time,
+                    end_time=end_time,
+                    unique_id=unique_id
+                )
+        
+        return await asyncio.gather(
+            *[fetch_one(start, end) for start, end in ranges],
+            return_exceptions=True
+        )
+
+    @staticmethod
+    def _cap(text: Optional[str], limit: int = 500) -> str:
+        """Truncate text for storage, returning short strings as-is."""
+        if not text:
+            return ""
+        return text if len(text) <= limit else text[:limit]
+
     def _build_scene_text(
         self, 
         title: str, 
@@ -204,6 +258,44 @@ class VideoIndexer:
         except (ValueError, TypeError):
             return 0.0
 
+    def _parse_times_vec(self, values: List) -> np.ndarray:
+        """
+        Vectorized _parse_time over a list of timestamps.
+        
+        Numbers pass through; strings are split into H/M/S columns with two
+        np.char.rpartition passes and converted in one go. Anything the batch
+        conversion rejects is parsed individually by _parse_time.
+        
+        Returns:
+            float64 array of seconds, same length and order as values
+        """
+        out = np.zeros(len(values), dtype=np.float64)
+        str_idx = []
+        strs = []
+        for i, value in enumerate(values):
+            if isinstance(value, (int, float)):
+                out[i] = value
+            elif value:
+                str_idx.append(i)
+                strs.append(str(value).strip())
+        if not strs:
+            return out
+        
+        arr = np.array(strs)
+        # "HH:MM:SS" -> ("HH", "MM", "SS"); "MM:SS" -> ("", "MM", "SS"); "90" -> ("", "", "90")
+        head, _, seconds = np.char.rpartition(arr, ":").T
+        hours, _, minutes = np.char.rpartition(head, ":").T
+        cols = np.stack([hours, minutes, seconds])
+        try:
+            h, m, sec = np.where(cols == "", "0", cols).astype(np.float64)
+            parsed = h * 3600 + m * 60 + sec
+            # More than HH:MM:SS is invalid (same as _parse_time)
+            parsed[np.char.count(arr, ":") > 2] = 0.0
+        except ValueError:
+            parsed = np.array([self._parse_time(v) for v in strs], dtype=np.float64)
+        out[str_idx] = parsed
+        return out
+
     async def get_video_embeddings(self, video_no: str) -> List[Dict]:
         """
         Retrieve stored embeddings for a video.
@@ -244,21 +336,24 @@ class VideoIndexer:
             unique_id: Workspace identifier
             
         Returns:
-            List of fine-grained segments (chapters split if needed)
+            List of fine-grained segments (chapters split if needed), each with
+            'start'/'end' already parsed to float seconds
         """
         max_duration = self.vector_config.max_chapter_segment_duration
         preferred_duration = self.vector_config.preferred_segment_duration
         
         fine_scenes = []
+        starts = self._parse_times_vec([c.get("start", 0) for c in chapters])
+        ends = self._parse_times_vec([c.get("end", 0) for c in chapters])
         
-        for chapter in chapters:
-            start = self._parse_time(chapter.get("start", 0))
-            end = self._parse_time(chapter.get("end", 0))
+        # Plan every split first so all segment descriptions are fetched together
+        plans = []  # (chapter, num_splits, [(segment index, start, end), ...]); num_splits 0 = as-is
+        for chapter, start, end in zip(chapters, starts.tolist(), ends.tolist()):
             duration = end - start
             
             if duration <= max_duration:
-                # Chapter is short enough, use as-is
-                fine_scenes.append(chapter)
+                # Chapter is short enough, use as-is (with its parsed times)
+                plans.append((chapter, 0, [(0, start, end)]))
                 continue
             
             # Chapter is too long, split into segments
@@ -268,25 +363,34 @@ class VideoIndexer:
             num_splits = max(2, int(duration / preferred_duration))
             segment_duration = duration / num_splits
             
-            # Split chapter into segments
+            segments = []
             for i in range(num_splits):
                 seg_start = start + (i * segment_duration)
                 seg_end = min(start + ((i + 1) * segment_duration), end)
                 
                 if seg_end <= seg_start:
                     continue
-                
-                # Get visual description for this segment
-                visual_desc = ""
-                try:
-                    visual_desc = await self.memories_client.get_visual_description(
-                        video_no=video_no,
-                        start_time=seg_start,
-                        end_time=seg_end,
-                        unique_id=unique_id
-                    )
-                except Exception as e:
-                    print(f"    ⚠️ Could not get visual description for segment {i+1}: {e}", flush=True)
+                segments.append((i, seg_start, seg_end))
+            plans.append((chapter, num_splits, segments))
+        
+        # Get visual descriptions for all segments concurrently
+        visual_descs = iter(await self._fetch_visual_descriptions(
+            video_no,
+            [(seg_start, seg_end) for _, num_splits, segments in plans if num_splits for _, seg_start, seg_end in segments],
+            unique_id=unique_id
+        ))
+        
+        for chapter, num_splits, segments in plans:
+            if not num_splits:
+                _, start, end = segments[0]
+                fine_scenes.append({**chapter, 'start': start, 'end': end})
+                continue
+            
+            for i, seg_start, seg_end in segments:
+                visual_desc = next(visual_descs)
+                if isinstance(visual_desc, Exception):
+                    print(f"    ⚠️ Could not get visual description for segment {i+1}: {visual_desc}", flush=True)
+                    visual_desc = ""
                 
                 # Create fine-grained segment
                 segment = chapter.copy()
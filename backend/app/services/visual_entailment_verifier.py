@@ -19,6 +19,7 @@ import asyncio
 import hashlib
 import json
 import re
+import threading
 import numpy as np
 from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass, field
@@ -26,6 +27,19 @@ from enum import Enum
 
 import redis
 import spacy
+from spacy.matcher import DependencyMatcher
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    # orjson is optional - fall back to stdlib json for cache (de)serialization
+    ORJSON_AVAILABLE = False
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    # pyahocorasick is optional - fall back to one substring scan per indicator
+    AHOCORASICK_AVAILABLE = False
 
 from app.config import get_settings
 
@@ -56,20 +70,194 @@ class EntailmentResult:
         }
 
 
+def _dumps_json(obj) -> bytes:
+    """Serialize a cache value to JSON bytes."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode("utf-8")
+
+
+def _loads_json(raw):
+    """Parse a cache value written by ``_dumps_json`` (bytes or str)."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+# int8 codes used for judgments in BatchEntailmentResults
+JUDGMENT_CODES = {
+    EntailmentJudgment.CONTRADICT: -1,
+    EntailmentJudgment.NEUTRAL: 0,
+    EntailmentJudgment.ENTAIL: 1,
+}
+
+
+@dataclass
+class BatchEntailmentResults:
+    """
+    Results of verify_entailment_batch as parallel arrays.
+    
+    judgments (int8, see JUDGMENT_CODES) and confidences (float64, so thresholds
+    compare exactly as they do against the Python floats) line up with
+    pairs, so threshold filtering is a NumPy mask instead of per-result attribute
+    access. failed marks candidates whose verification raised (their result is a
+    placeholder NEUTRAL). Iterating/indexing yields the (candidate, EntailmentResult)
+    pairs as before.
+    """
+    pairs: List[Tuple[Dict, EntailmentResult]]
+    judgments: np.ndarray
+    confidences: np.ndarray
+    failed: np.ndarray
+    
+    @classmethod
+    def from_pairs(
+        cls,
+        pairs: List[Tuple[Dict, EntailmentResult]],
+        failed: Optional[List[bool]] = None
+    ) -> "BatchEntailmentResults":
+        judgments = np.empty(len(pairs), dtype=np.int8)
+        confidences = np.empty(len(pairs), dtype=np.float64)
+        for i, (_, result) in enumerate(pairs):
+            judgments[i] = JUDGMENT_CODES[result.judgment]
+            confidences[i] = result.confidence
+        failed = np.zeros(len(pairs), dtype=bool) if failed is None else np.asarray(failed, dtype=bool)
+        return cls(pairs=pairs, judgments=judgments, confidences=confidences, failed=failed)
+    
+    def entailed_mask(self, threshold: float) -> np.ndarray:
+        """True where the judgment is ENTAIL with confidence >= threshold."""
+        return (self.judgments == JUDGMENT_CODES[EntailmentJudgment.ENTAIL]) & (self.confidences >= threshold)
+    
+    def neutral_mask(self, min_confidence: float) -> np.ndarray:
+        """True where a verification that didn't fail judged NEUTRAL with confidence >= min_confidence."""
+        return (
+            (self.judgments == JUDGMENT_CODES[EntailmentJudgment.NEUTRAL])
+            & (self.confidences >= min_confidence)
+            & ~self.failed
+        )
+    
+    def entailed(self, threshold: float) -> List[Dict]:
+        """Candidates judged ENTAIL with confidence >= threshold, in batch order."""
+        return [self.pairs[i][0] for i in np.flatnonzero(self.entailed_mask(threshold))]
+    
+    def __iter__(self):
+        return iter(self.pairs)
+    
+    def __len__(self) -> int:
+        return len(self.pairs)
+    
+    def __getitem__(self, index):
+        return self.pairs[index]
+
+
+# Dependency patterns for claim extraction: a predicate verb with its subject
+# (agent) or its object (patient); compiled once into _claim_matcher
+_CLAIM_VERB = {
+    "RIGHT_ID": "verb",
+    "RIGHT_ATTRS": {"POS": "VERB", "DEP": {"IN": ["ROOT", "conj", "advcl", "relcl"]}},
+}
+_CLAIM_PATTERNS = {
+    "CLAIM_SUBJECT": [_CLAIM_VERB, {
+        "LEFT_ID": "verb", "REL_OP": ">", "RIGHT_ID": "arg",
+        "RIGHT_ATTRS": {"DEP": {"IN": ["nsubj", "nsubjpass"]}},
+    }],
+    "CLAIM_OBJECT": [_CLAIM_VERB, {
+        "LEFT_ID": "verb", "REL_OP": ">", "RIGHT_ID": "arg",
+        "RIGHT_ATTRS": {"DEP": {"IN": ["dobj", "pobj", "attr"]}},
+    }],
+}
+
+
+# Patterns for parsing the LVMM entailment response; all case-insensitive, so the
+# response isn't copied into upper/lower case just to find the labels
+_ENTAILMENT_RE = re.compile(r'ENTAILMENT:\s*(ENTAIL|CONTRADICT|NEUTRAL)', re.IGNORECASE)
+_CONFIDENCE_RE = re.compile(r'CONFIDENCE:\s*(\d+\.?\d*)', re.IGNORECASE)
+_EVIDENCE_RE = re.compile(r'EVIDENCE:\s*(.+?)(?=CONTRADICTIONS:|$)', re.IGNORECASE | re.DOTALL)
+_CONTRADICTIONS_RE = re.compile(r'CONTRADICTIONS:\s*(.+?)(?=$)', re.IGNORECASE | re.DOTALL)
+_CONTRADICTIONS_SPLIT_RE = re.compile(r'[;\n\-•]')
+
+# Fallback indicators when the response has no explicit ENTAILMENT: line
+_ENTAIL_INDICATORS = ('directly shows', 'clearly shows', 'matches', 'confirms',
+                      'entail', 'visible', 'performing', 'is doing')
+_CONTRADICT_INDICATORS = ('contradicts', 'opposite', 'instead', 'not visible',
+                          'different action', 'mismatch', 'incompatible', 'wrong')
+
+
+def _build_automaton(indicators):
+    automaton = ahocorasick.Automaton()
+    for idx, indicator in enumerate(indicators):
+        automaton.add_word(indicator, idx)
+    automaton.make_automaton()
+    return automaton
+
+
+if AHOCORASICK_AVAILABLE:
+    _ENTAIL_AC = _build_automaton(_ENTAIL_INDICATORS)
+    _CONTRADICT_AC = _build_automaton(_CONTRADICT_INDICATORS)
+
+
+def _count_indicators(text: str, indicators, automaton=None) -> int:
+    """Number of distinct indicators occurring in text (one pass with Aho-Corasick)."""
+    if automaton is not None:
+        return len({idx for _, idx in automaton.iter(text)})
+    return sum(1 for ind in indicators if ind in text)
+
+
+# Redis connection pool shared by all verifier instances
+_redis_pool = None
+
+
+def _get_redis_pool(settings) -> redis.ConnectionPool:
+    """Create the shared Redis connection pool on first use."""
+    global _redis_pool
+    if _redis_pool is None:
+        _redis_pool = redis.ConnectionPool(
+            host=settings.redis.host,
+            port=settings.redis.port,
+            db=settings.redis.db,
+            password=settings.redis.password if settings.redis.password else None,
+            decode_responses=True,
+            max_connections=16
+        )
+    return _redis_pool
+
+
 # Global NLP model cache
 _nlp_model = None
+_nlp_model_lock = threading.Lock()
 
 
 def _get_nlp_model():
-    """Load spaCy model (cached globally)."""
+    """Load spaCy model (cached globally; the lock keeps concurrent first calls to one load)."""
     global _nlp_model
     if _nlp_model is None:
-        print("🧠 Loading spaCy model for entailment verification...", flush=True)
-        _nlp_model = spacy.load("en_core_web_sm")
-        print("✅ spaCy model loaded for entailment verification.", flush=True)
+        with _nlp_model_lock:
+            if _nlp_model is None:
+                print("🧠 Loading spaCy model for entailment verification...", flush=True)
+                # Only POS tags, lemmas and the dependency parse are used; attribute_ruler stays
+                # because it maps tagger output to token.pos_ (which the lemmatizer also needs)
+                _nlp_model = spacy.load("en_core_web_sm", exclude=["ner"])
+                print("✅ spaCy model loaded for entailment verification.", flush=True)
     return _nlp_model
 
 
+# Claim DependencyMatcher cache (built on the shared model's vocab)
+_claim_matcher = None
+
+
+def _get_claim_matcher() -> DependencyMatcher:
+    """Compile the claim patterns once (cached globally)."""
+    global _claim_matcher
+    if _claim_matcher is None:
+        nlp = _get_nlp_model()
+        with _nlp_model_lock:
+            if _claim_matcher is None:
+                matcher = DependencyMatcher(nlp.vocab)
+                for key, pattern in _CLAIM_PATTERNS.items():
+                    matcher.add(key, [pattern])
+                _claim_matcher = matcher
+    return _claim_matcher
+
+
 class VisualEntailmentVerifier:
     """
     Verifies if the visual content ENTAILS the script description.
@@ -94,7 +282,10 @@ class VisualEntailmentVerifier:
         """
         self.memories = memories_client
         self.config = config
-        self.nlp = _get_nlp_model()
+        # Parsed Docs by script text (insertion-ordered, oldest evicted first)
+        self._doc_cache: Dict[str, object] = {}
+        # Extracted claims by script hash (same eviction as _doc_cache)
+        self._claims_cache: Dict[str, List[Dict]] = {}
         
         # Get settings
         self.settings = get_settings()
@@ -102,13 +293,7 @@ class VisualEntailmentVerifier:
         # Initialize Redis for caching
         self.redis_client = None
         try:
-            self.redis_client = redis.Redis(
-                host=self.settings.redis.host,
-                port=self.settings.redis.port,
-                db=self.settings.redis.db,
-                password=self.settings.redis.password if self.settings.redis.password else None,
-                decode_responses=True
-            )
+            self.redis_client = redis.Redis(connection_pool=_get_redis_pool(self.settings))
             self.redis_client.ping()
             print("✅ Redis connected for entailment cache.", flush=True)
         except Exception as e:
@@ -118,6 +303,7 @@ class VisualEntailmentVerifier:
         # Get config values with defaults
         self.frame_samples = getattr(config, 'entailment_frame_samples', 5)
         self.threshold = getattr(config, 'entailment_threshold', 0.70)
+        self.max_concurrency = max(1, int(getattr(config, 'entailment_max_concurrency', 8)))
         
         print(f"🔬 VisualEntailmentVerifier initialized (samples={self.frame_samples}, threshold={self.threshold})", flush=True)
     
@@ -157,20 +343,45 @@ class VisualEntailmentVerifier:
             num_frames = max_frames
         
         # Generate evenly spaced timestamps
-        frames = []
-        for i in range(num_frames):
-            if num_frames == 1:
-                t = start_time + duration / 2
-            else:
-                t = start_time + (i / (num_frames - 1)) * duration
-            frames.append({
-                'timestamp': round(t, 2),
-                'index': i
-            })
+        if num_frames == 1:
+            timestamps = np.array([start_time + duration / 2])
+        else:
+            timestamps = np.linspace(start_time, end_time, num_frames)
+        
+        # Raw floats: the prompt formats them to 0.1s itself
+        return [
+            {'timestamp': t, 'index': i}
+            for i, t in enumerate(timestamps.tolist())
+        ]
+    
+    @property
+    def nlp(self):
+        """spaCy pipeline, loaded on first claim extraction (cache hits never need it)."""
+        return _get_nlp_model()
+    
+    _DOC_CACHE_SIZE = 128
+    _CLAIMS_CACHE_SIZE = 512
+    _CLAIMS_CACHE_TTL = 30 * 24 * 60 * 60
+    
+    def _parse_scripts(self, texts: List[str]) -> Dict[str, object]:
+        """
+        Parse script texts with spaCy, batching the uncached ones through nlp.pipe().
         
-        return frames
+        Args:
+            texts: Script texts (duplicates are parsed once)
+            
+        Returns:
+            Dict mapping each text to its spaCy Doc
+        """
+        pending = [t for t in dict.fromkeys(texts) if t not in self._doc_cache]
+        for text, doc in zip(pending, self.nlp.pipe(pending, batch_size=32)):
+            self._doc_cache[text] = doc
+        docs = {t: self._doc_cache[t] for t in texts}
+        while len(self._doc_cache) > self._DOC_CACHE_SIZE:
+            self._doc_cache.pop(next(iter(self._doc_cache)))
+        return docs
     
-    def _extract_script_claims(self, script_segment: str) -> List[Dict]:
+    def _extract_script_claims(self, script_segment: str, doc=None) -> List[Dict]:
         """
         Extract testable claims from the script segment.
         
@@ -178,39 +389,40 @@ class VisualEntailmentVerifier:
         
         Args:
             script_segment: The script text to analyze
+            doc: Optional pre-parsed spaCy Doc of script_segment
             
         Returns:
             List of claim dicts with 'agent', 'action', 'object', 'full_text'
         """
-        doc = self.nlp(script_segment)
+        if doc is None:
+            doc = self._parse_scripts([script_segment])[script_segment]
         claims = []
         
-        for token in doc:
-            if token.pos_ == "VERB" and token.dep_ in ("ROOT", "conj", "advcl", "relcl"):
-                # Find subject (agent)
-                subjects = []
-                for child in token.children:
-                    if child.dep_ in ("nsubj", "nsubjpass"):
-                        # Get full noun phrase
-                        subject_phrase = " ".join([w.text for w in child.subtree])
-                        subjects.append(subject_phrase)
-                
-                # Find object (patient)
-                objects = []
-                for child in token.children:
-                    if child.dep_ in ("dobj", "pobj", "attr"):
-                        object_phrase = " ".join([w.text for w in child.subtree])
-                        objects.append(object_phrase)
-                
-                # Create claims for each subject
-                for subj in subjects:
-                    claim = {
-                        'agent': subj.strip(),
-                        'action': token.lemma_.lower(),
-                        'object': objects[0].strip() if objects else None,
-                        'full_text': f"{subj} {token.text}" + (f" {objects[0]}" if objects else "")
-                    }
-                    claims.append(claim)
+        # verb index -> subject / object token indexes, from the compiled matcher
+        subjects: Dict[int, List[int]] = {}
+        objects: Dict[int, List[int]] = {}
+        subject_id = doc.vocab.strings["CLAIM_SUBJECT"]
+        for match_id, (verb_i, arg_i) in _get_claim_matcher()(doc):
+            (subjects if match_id == subject_id else objects).setdefault(verb_i, []).append(arg_i)
+        
+        def phrase(i: int) -> str:
+            # Full phrase: the subtree is the contiguous edge-to-edge span
+            return doc[doc[i].left_edge.i:doc[i].right_edge.i + 1].text
+        
+        # Verbs, subjects and objects in document order (same as walking the tree)
+        for verb_i in sorted(subjects):
+            token = doc[verb_i]
+            obj = phrase(min(objects[verb_i])) if verb_i in objects else None
+            
+            # Create claims for each subject
+            for subj in (phrase(i) for i in sorted(subjects[verb_i])):
+                claim = {
+                    'agent': subj.strip(),
+                    'action': token.lemma_.lower(),
+                    'object': obj.strip() if obj else None,
+                    'full_text': f"{subj} {token.text}" + (f" {obj}" if obj else "")
+                }
+                claims.append(claim)
         
         # If no structured claims found, treat whole segment as a claim
         if not claims:
@@ -223,13 +435,56 @@ class VisualEntailmentVerifier:
         
         return claims
     
+    def _get_script_claims(self, script_segment: str) -> List[Dict]:
+        """
+        Claims for script_segment, memoized in-process and in Redis (keyed by blake2b).
+        
+        Claims are a pure function of the script text, so they survive across
+        candidates, batches and worker restarts.
+        """
+        script_hash = hashlib.blake2b(script_segment.encode(), digest_size=16).hexdigest()
+        claims = self._claims_cache.get(script_hash)
+        if claims is not None:
+            return claims
+        
+        cache_key = f"entailment_claims:{script_hash}"
+        if self.redis_client:
+            try:
+                cached = self.redis_client.get(cache_key)
+                if cached:
+                    claims = _loads_json(cached)
+            except Exception:
+                pass
+        
+        if claims is None:
+            claims = self._extract_script_claims(script_segment)
+            if self.redis_client:
+                try:
+                    self.redis_client.setex(cache_key, self._CLAIMS_CACHE_TTL, _dumps_json(claims))
+                except Exception:
+                    pass
+        
+        self._claims_cache[script_hash] = claims
+        while len(self._claims_cache) > self._CLAIMS_CACHE_SIZE:
+            self._claims_cache.pop(next(iter(self._claims_cache)))
+        return claims
+    
+    @staticmethod
+    def _format_claims(claims: List[Dict]) -> str:
+        """Claims as prompt lines (limited to 3 claims)."""
+        return "\n".join([
+            f"  - Claim {i+1}: {c['full_text']}"
+            for i, c in enumerate(claims[:3])
+        ])
+    
     def _build_entailment_prompt(
         self,
         script_segment: str,
         claims: List[Dict],
         frames: List[Dict],
         start_time: float,
-        end_time: float
+        end_time: float,
+        claims_text: Optional[str] = None
     ) -> str:
         """
         Build the entailment verification prompt for Memories.ai.
@@ -244,15 +499,14 @@ class VisualEntailmentVerifier:
             frames: Frame timestamps to analyze
             start_time: Clip start time
             end_time: Clip end time
+            claims_text: Optional claims already formatted by _format_claims
             
         Returns:
             Entailment verification prompt string
         """
         # Format claims for the prompt
-        claims_text = "\n".join([
-            f"  - Claim {i+1}: {c['full_text']}"
-            for i, c in enumerate(claims[:3])  # Limit to 3 claims
-        ])
+        if claims_text is None:
+            claims_text = self._format_claims(claims)
         
         # Format frame timestamps
         frame_times = ", ".join([f"{f['timestamp']:.1f}s" for f in frames])
@@ -304,9 +558,6 @@ Be LITERAL and PRECISE. Do NOT infer actions not visible. Do NOT assume based on
         Returns:
             Dict with 'judgment', 'confidence', 'evidence', 'contradictions', 'frame_details'
         """
-        response_upper = response.upper()
-        response_lower = response.lower()
-        
         # Default values
         result = {
             'judgment': EntailmentJudgment.NEUTRAL,
@@ -318,9 +569,9 @@ Be LITERAL and PRECISE. Do NOT infer actions not visible. Do NOT assume based on
         
         # Extract judgment
         # Look for explicit ENTAILMENT: line first
-        entailment_match = re.search(r'ENTAILMENT:\s*(ENTAIL|CONTRADICT|NEUTRAL)', response_upper)
+        entailment_match = _ENTAILMENT_RE.search(response)
         if entailment_match:
-            judgment_str = entailment_match.group(1)
+            judgment_str = entailment_match.group(1).upper()
             if judgment_str == "ENTAIL":
                 result['judgment'] = EntailmentJudgment.ENTAIL
             elif judgment_str == "CONTRADICT":
@@ -329,13 +580,13 @@ Be LITERAL and PRECISE. Do NOT infer actions not visible. Do NOT assume based on
                 result['judgment'] = EntailmentJudgment.NEUTRAL
         else:
             # Fallback: count positive vs negative indicators
-            entail_indicators = ['directly shows', 'clearly shows', 'matches', 'confirms', 
-                                 'entail', 'visible', 'performing', 'is doing']
-            contradict_indicators = ['contradicts', 'opposite', 'instead', 'not visible',
-                                     'different action', 'mismatch', 'incompatible', 'wrong']
-            
-            entail_count = sum(1 for ind in entail_indicators if ind in response_lower)
-            contradict_count = sum(1 for ind in contradict_indicators if ind in response_lower)
+            response_lower = response.lower()
+            entail_count = _count_indicators(
+                response_lower, _ENTAIL_INDICATORS, _ENTAIL_AC if AHOCORASICK_AVAILABLE else None
+            )
+            contradict_count = _count_indicators(
+                response_lower, _CONTRADICT_INDICATORS, _CONTRADICT_AC if AHOCORASICK_AVAILABLE else None
+            )
             
             if contradict_count > entail_count:
                 result['judgment'] = EntailmentJudgment.CONTRADICT
@@ -345,7 +596,7 @@ Be LITERAL and PRECISE. Do NOT infer actions not visible. Do NOT assume based on
                 result['judgment'] = EntailmentJudgment.NEUTRAL
         
         # Extract confidence
-        confidence_match = re.search(r'CONFIDENCE:\s*(\d+\.?\d*)', response_upper)
+        confidence_match = _CONFIDENCE_RE.search(response)
         if confidence_match:
             try:
                 confidence = float(confidence_match.group(1))
@@ -357,17 +608,17 @@ Be LITERAL and PRECISE. Do NOT infer actions not visible. Do NOT assume based on
                 pass
         
         # Extract evidence
-        evidence_match = re.search(r'EVIDENCE:\s*(.+?)(?=CONTRADICTIONS:|$)', response, re.IGNORECASE | re.DOTALL)
+        evidence_match = _EVIDENCE_RE.search(response)
         if evidence_match:
             result['evidence'] = evidence_match.group(1).strip()[:500]  # Limit length
         
         # Extract contradictions
-        contradictions_match = re.search(r'CONTRADICTIONS:\s*(.+?)(?=$)', response, re.IGNORECASE | re.DOTALL)
+        contradictions_match = _CONTRADICTIONS_RE.search(response)
         if contradictions_match:
             contradictions_text = contradictions_match.group(1).strip()
             if contradictions_text.lower() not in ('none', 'none.', 'n/a', ''):
                 # Split by common delimiters
-                contras = re.split(r'[;\n\-•]', contradictions_text)
+                contras = _CONTRADICTIONS_SPLIT_RE.split(contradictions_text)
                 result['contradictions'] = [c.strip() for c in contras if c.strip() and len(c.strip()) > 3][:5]
         
         return result
@@ -376,11 +627,38 @@ Be LITERAL and PRECISE. Do NOT infer actions not visible. Do NOT assume based on
         """Generate cache key for entailment query."""
         return f"entailment:{video_no}:{start_time:.2f}:{end_time:.2f}:{script_hash}"
     
+    def _cache_key_for(self, clip_info: Dict, script_segment: str, video_no: str = None) -> Optional[str]:
+        """Cache key for a candidate, or None if the candidate can't be verified."""
+        start_time = clip_info.get('start_time', 0)
+        end_time = clip_info.get('end_time', 0)
+        video_no = video_no or clip_info.get('video_no', '')
+        if not video_no or end_time <= start_time:
+            return None
+        # Non-cryptographic use: blake2b is cheaper per byte than md5 and sized directly
+        script_hash = hashlib.blake2b(script_segment.encode(), digest_size=4).hexdigest()
+        return self._get_cache_key(video_no, start_time, end_time, script_hash)
+    
+    @staticmethod
+    def _result_from_cache(cached: str) -> EntailmentResult:
+        """Rebuild an EntailmentResult from its cached JSON."""
+        cached_data = _loads_json(cached)
+        return EntailmentResult(
+            judgment=EntailmentJudgment(cached_data['judgment']),
+            confidence=cached_data['confidence'],
+            evidence=cached_data['evidence'],
+            contradictions=cached_data['contradictions'],
+            frame_analyses=cached_data.get('frame_analyses', [])
+        )
+    
     async def verify_entailment(
         self,
         clip_info: Dict,
         script_segment: str,
-        video_no: str = None
+        video_no: str = None,
+        claims: Optional[List[Dict]] = None,
+        read_cache: bool = True,
+        pending_writes: Optional[List[Tuple[str, int, bytes]]] = None,
+        claims_text: Optional[str] = None
     ) -> EntailmentResult:
         """
         Verify if the visual content of a clip ENTAILS the script description.
@@ -391,6 +669,11 @@ Be LITERAL and PRECISE. Do NOT infer actions not visible. Do NOT assume based on
             clip_info: Dict with 'start_time', 'end_time', and optionally 'video_no'
             script_segment: The script text to verify against
             video_no: Video identifier (can also be in clip_info)
+            claims: Optional pre-extracted claims for script_segment
+            read_cache: Check the Redis cache first (False when the caller already did)
+            pending_writes: If given, the cache write is appended here as
+                (key, ttl, json) for the caller to flush instead of written directly
+            claims_text: Optional claims already formatted by _format_claims
             
         Returns:
             EntailmentResult with judgment, confidence, evidence, and contradictions
@@ -418,33 +701,39 @@ Be LITERAL and PRECISE. Do NOT infer actions not visible. Do NOT assume based on
             )
         
         # Check cache
-        script_hash = hashlib.md5(script_segment.encode()).hexdigest()[:8]
-        cache_key = self._get_cache_key(video_no, start_time, end_time, script_hash)
+        cache_key = self._cache_key_for(clip_info, script_segment, video_no)
         
-        if self.redis_client:
+        if self.redis_client and read_cache:
             try:
                 cached = self.redis_client.get(cache_key)
                 if cached:
-                    cached_data = json.loads(cached)
-                    return EntailmentResult(
-                        judgment=EntailmentJudgment(cached_data['judgment']),
-                        confidence=cached_data['confidence'],
-                        evidence=cached_data['evidence'],
-                        contradictions=cached_data['contradictions'],
-                        frame_analyses=cached_data.get('frame_analyses', [])
-                    )
+                    return self._result_from_cache(cached)
             except Exception:
                 pass
         
         # Extract claims from script
-        claims = self._extract_script_claims(script_segment)
+        if claims is None:
+            claims = self._get_script_claims(script_segment)
+        
+        # Nothing testable (no agent/action, very short text): skip the LVMM query.
+        # Same NEUTRAL/0.5 as an unparseable response, so callers keep the candidate flagged.
+        if self._has_no_testable_claim(claims, script_segment):
+            result = EntailmentResult(
+                judgment=EntailmentJudgment.NEUTRAL,
+                confidence=0.5,
+                evidence="No testable claim",
+                contradictions=[],
+                frame_analyses=[]
+            )
+            self._cache_result(cache_key, result, pending_writes)
+            return result
         
         # Sample frames adaptively
         frames = self._sample_frames_adaptive(start_time, end_time, self.frame_samples)
         
         # Build entailment prompt
         prompt = self._build_entailment_prompt(
-            script_segment, claims, frames, start_time, end_time
+            script_segment, claims, frames, start_time, end_time, claims_text=claims_text
         )
         
         # Query Memories.ai
@@ -480,28 +769,51 @@ Be LITERAL and PRECISE. Do NOT infer actions not visible. Do NOT assume based on
             }]
         )
         
-        # Cache result (24 hour TTL)
-        if self.redis_client:
-            try:
-                cache_data = {
-                    'judgment': result.judgment.value,
-                    'confidence': result.confidence,
-                    'evidence': result.evidence,
-                    'contradictions': result.contradictions,
-                    'frame_analyses': result.frame_analyses
-                }
-                self.redis_client.setex(cache_key, 24 * 60 * 60, json.dumps(cache_data))
-            except Exception:
-                pass
-        
+        self._cache_result(cache_key, result, pending_writes)
         return result
     
+    @staticmethod
+    def _has_no_testable_claim(claims: List[Dict], script_segment: str) -> bool:
+        """True when extraction found no agent/action and the script is too short to judge."""
+        if not claims:
+            return True
+        return (
+            len(claims) == 1
+            and claims[0]['agent'] is None
+            and claims[0]['action'] is None
+            and len(script_segment.split()) < 4
+        )
+    
+    def _cache_result(
+        self,
+        cache_key: str,
+        result: EntailmentResult,
+        pending_writes: Optional[List[Tuple[str, int, bytes]]] = None
+    ) -> None:
+        """Cache result (24 hour TTL), or queue the write on pending_writes."""
+        if not self.redis_client:
+            return
+        try:
+            cache_data = {
+                'judgment': result.judgment.value,
+                'confidence': result.confidence,
+                'evidence': result.evidence,
+                'contradictions': result.contradictions,
+                'frame_analyses': result.frame_analyses
+            }
+            if pending_writes is not None:
+                pending_writes.append((cache_key, 24 * 60 * 60, _dumps_json(cache_data)))
+            else:
+                self.redis_client.setex(cache_key, 24 * 60 * 60, _dumps_json(cache_data))
+        except Exception:
+            pass
+    
     async def verify_entailment_batch(
         self,
         candidates: List[Dict],
         script_segment: str,
         video_no: str
-    ) -> List[Tuple[Dict, EntailmentResult]]:
+    ) -> BatchEntailmentResults:
         """
         Verify entailment for multiple candidates in parallel.
         
@@ -511,22 +823,59 @@ Be LITERAL and PRECISE. Do NOT infer actions not visible. Do NOT assume based on
             video_no: Video identifier
             
         Returns:
-            List of (candidate, EntailmentResult) tuples
+            BatchEntailmentResults (iterates as (candidate, EntailmentResult) tuples)
         """
+        # Look up every candidate's cached result in one round-trip
+        cache_keys = [self._cache_key_for(c, script_segment, video_no) for c in candidates]
+        cached_results = {}
+        lookup = [k for k in cache_keys if k]
+        if self.redis_client and lookup:
+            try:
+                for key, cached in zip(lookup, self.redis_client.mget(lookup)):
+                    if cached:
+                        cached_results[key] = self._result_from_cache(cached)
+            except Exception:
+                cached_results = {}
+        
+        # Extract the script's claims once for the whole batch, and only if something missed
+        # (formatted for the prompt once too, instead of per candidate)
+        claims = claims_text = None
+        if any(k not in cached_results for k in cache_keys):
+            claims = self._get_script_claims(script_segment)
+            claims_text = self._format_claims(claims)
+        
         # Rate limit concurrent requests
-        semaphore = asyncio.Semaphore(3)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        # Cache writes collected from the batch and flushed in one pipeline
+        pending_writes: List[Tuple[str, int, bytes]] = []
         
-        async def verify_one(candidate):
+        async def verify_one(candidate, cache_key):
+            if cache_key in cached_results:
+                return (candidate, cached_results[cache_key])
             async with semaphore:
-                result = await self.verify_entailment(candidate, script_segment, video_no)
+                result = await self.verify_entailment(
+                    candidate, script_segment, video_no, claims=claims, read_cache=False,
+                    pending_writes=pending_writes, claims_text=claims_text
+                )
                 return (candidate, result)
         
-        tasks = [verify_one(c) for c in candidates]
+        tasks = [verify_one(c, k) for c, k in zip(candidates, cache_keys)]
         results = await asyncio.gather(*tasks, return_exceptions=True)
         
+        if self.redis_client and pending_writes:
+            try:
+                with self.redis_client.pipeline(transaction=False) as pipe:
+                    for key, ttl, value in pending_writes:
+                        pipe.setex(key, ttl, value)
+                    pipe.execute()
+            except Exception:
+                pass
+        
         # Handle exceptions
         verified = []
+        failed = []
         for i, result in enumerate(results):
+            failed.append(isinstance(result, Exception))
             if isinstance(result, Exception):
                 print(f"    ⚠️ Entailment batch error: {result}", flush=True)
                 verified.append((candidates[i], EntailmentResult(
@@ -539,5 +888,5 @@ Be LITERAL and PRECISE. Do NOT infer actions not visible. Do NOT assume based on
             else:
                 verified.append(result)
         
-        return verified
+        return BatchEntailmentResults.from_pairs(verified, failed)
 
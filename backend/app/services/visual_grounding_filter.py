@@ -12,27 +12,249 @@ hallucination in video-language tasks.
 import asyncio
 import hashlib
 import json
+import os
+import re
+import threading
+import time
 import numpy as np
 import redis
 import spacy
+from spacy.attrs import DEP, IS_STOP, POS
+from spacy.matcher import DependencyMatcher, Matcher
+from spacy.symbols import ADJ, NOUN, PROPN, VERB
+from itertools import islice
 from typing import List, Dict, Set, Optional
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    # orjson is optional - fall back to stdlib json for cache (de)serialization
+    ORJSON_AVAILABLE = False
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    # pyahocorasick is optional - fall back to one substring scan per pattern
+    AHOCORASICK_AVAILABLE = False
+
 from app.config import get_settings
 
 # Global NLP model cache
 _nlp_model = None
+_nlp_model_lock = threading.Lock()
 
 
 def _get_nlp_model():
-    """Load spaCy model (cached globally)."""
+    """Load spaCy model (cached globally; the lock keeps concurrent first calls to one load)."""
     global _nlp_model
     if _nlp_model is None:
-        print("🧠 Loading spaCy model for visual grounding...", flush=True)
-        _nlp_model = spacy.load("en_core_web_sm")
-        print("✅ spaCy model loaded for visual grounding.", flush=True)
+        with _nlp_model_lock:
+            if _nlp_model is None:
+                print("🧠 Loading spaCy model for visual grounding...", flush=True)
+                # Only POS tags, lemmas and the dependency parse are used; attribute_ruler stays
+                # because it maps tagger output to token.pos_ (which the lemmatizer also needs)
+                _nlp_model = spacy.load("en_core_web_sm", exclude=["ner"])
+                print("✅ spaCy model loaded for visual grounding.", flush=True)
     return _nlp_model
 
 
+_matchers = None
+
+
+def _get_matchers():
+    """Compile the action-verb and spatial-relation matchers once (cached globally)."""
+    global _matchers
+    if _matchers is None:
+        nlp = _get_nlp_model()
+        with _nlp_model_lock:
+            if _matchers is None:
+                verb_matcher = Matcher(nlp.vocab)
+                for category, verbs in _ACTION_VERBS.items():
+                    verb_matcher.add(category, [[
+                        {"POS": "VERB", "IS_STOP": False, "LEMMA": {"IN": sorted(verbs)}}
+                    ]])
+                spatial_matcher = DependencyMatcher(nlp.vocab)
+                spatial_matcher.add("SPATIAL", [_SPATIAL_PATTERN])
+                _matchers = (verb_matcher, spatial_matcher)
+    return _matchers
+
+
+def _reset_nlp_model_lock():
+    """Give a forked child a fresh lock (the parent may have held it mid-load); the model itself is shared."""
+    global _nlp_model_lock
+    _nlp_model_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_nlp_model_lock)
+
+
+# Redis connection pool shared by all filter instances; health-checked once per process,
+# and after a failed ping re-checked once _REDIS_RETRY_SECONDS have passed (the worker is
+# long-lived, so one blip must not switch the grounding caches off until restart)
+_redis_pool = None
+_redis_available = None
+_redis_failed_at = 0.0
+_REDIS_RETRY_SECONDS = 30.0
+
+
+def _get_redis_client(settings) -> Optional[redis.Redis]:
+    """Client on the shared pool, or None while a recent ping failure is backing off."""
+    global _redis_pool, _redis_available, _redis_failed_at
+    if _redis_available is False:
+        if time.monotonic() - _redis_failed_at < _REDIS_RETRY_SECONDS:
+            return None
+        _redis_available = None  # backoff elapsed: ping again
+    
+    try:
+        if _redis_pool is None:
+            _redis_pool = redis.ConnectionPool(
+                host=settings.redis.host,
+                port=settings.redis.port,
+                db=settings.redis.db,
+                password=settings.redis.password if settings.redis.password else None,
+                decode_responses=True,
+                max_connections=16
+            )
+        client = redis.Redis(connection_pool=_redis_pool)
+        if _redis_available is None:
+            client.ping()
+            _redis_available = True
+            print("✅ Redis connected for visual grounding cache.", flush=True)
+        return client
+    except Exception as e:
+        _redis_available = False
+        _redis_failed_at = time.monotonic()
+        print(f"⚠️ Redis not available for grounding cache (retrying in {_REDIS_RETRY_SECONDS:.0f}s): {e}", flush=True)
+        return None
+
+
+def _dumps_json(obj) -> bytes:
+    """Serialize a cache value to JSON bytes."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode("utf-8")
+
+
+def _loads_json(raw):
+    """Parse a cache value written by ``_dumps_json`` (bytes or str)."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+class _RateLimiter:
+    """
+    Token bucket bounding how many Memories.ai requests start per second.
+    
+    Each acquire takes a token, going negative to reserve a future slot and
+    sleeping until it arrives. No await happens between reading and updating
+    the bucket, so concurrent coroutines need no lock.
+    """
+    
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._last = time.monotonic()
+    
+    async def __aenter__(self):
+        if self.rate <= 0:
+            return self
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate) - 1
+        self._last = now
+        if self._tokens < 0:
+            await asyncio.sleep(-self._tokens / self.rate)
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+
+# Words that never count as visual requirements
+_GENERIC_NOUNS = frozenset({'way', 'thing', 'time', 'moment', 'day'})
+_AUX_VERBS = frozenset({'be', 'have', 'do', 'will', 'would', 'could', 'should', 'may', 'might', 'can'})
+_NON_VISUAL_ADJ = frozenset({'good', 'bad', 'new', 'old', 'great', 'little', 'big', 'small'})
+
+# Action verb categories for visual verification
+# These help match script verbs to visual actions
+_ACTION_VERBS = {
+    'motion': {
+        'walk', 'run', 'jump', 'fly', 'swim', 'climb', 'fall', 'move',
+        'step', 'sprint', 'dash', 'leap', 'dive', 'crawl', 'slide',
+        'roll', 'tumble', 'stumble', 'stagger', 'rush', 'hurry'
+    },
+    'interaction': {
+        'grab', 'hold', 'throw', 'catch', 'push', 'pull', 'lift',
+        'carry', 'drop', 'pick', 'place', 'put', 'take', 'give',
+        'hand', 'pass', 'toss', 'release', 'grip', 'grasp'
+    },
+    'combat': {
+        'punch', 'kick', 'slash', 'block', 'dodge', 'attack', 'fight',
+        'strike', 'hit', 'swing', 'stab', 'shoot', 'fire', 'aim',
+        'defend', 'counter', 'parry', 'evade', 'charge', 'lunge'
+    },
+    'transformation': {
+        'open', 'close', 'break', 'build', 'create', 'destroy',
+        'transform', 'change', 'morph', 'shatter', 'explode', 'collapse',
+        'assemble', 'disassemble', 'repair', 'fix', 'unlock', 'lock'
+    },
+    'communication': {
+        'speak', 'shout', 'whisper', 'listen', 'read', 'write',
+        'talk', 'yell', 'scream', 'cry', 'laugh', 'smile', 'frown',
+        'nod', 'shake', 'gesture', 'point', 'wave', 'signal'
+    },
+    'perception': {
+        'look', 'see', 'watch', 'stare', 'glance', 'gaze', 'observe',
+        'notice', 'spot', 'find', 'discover', 'search', 'scan'
+    },
+    'state_change': {
+        'stand', 'sit', 'lie', 'kneel', 'crouch', 'lean', 'turn',
+        'face', 'enter', 'exit', 'leave', 'arrive', 'appear', 'disappear',
+        'emerge', 'vanish', 'rise', 'lower', 'raise'
+    }
+}
+
+# Reverse lookup: verb -> category
+_VERB_TO_CATEGORY = {verb: category for category, verbs in _ACTION_VERBS.items() for verb in verbs}
+
+# All action verbs as a flat set
+_ALL_ACTION_VERBS = frozenset().union(*_ACTION_VERBS.values())
+
+# Binding-validity markers and "not visible" negations, found in one pass over a context window
+_BINDING_MARKER_RE = re.compile(r"binding(?: valid)?: (yes|no)|(binding invalid)|not visible|cannot see")
+
+# Preposition -> object-of-preposition pairs recorded as spatial relations
+_SPATIAL_PREPOSITIONS = [
+    'in', 'on', 'near', 'behind', 'above', 'below', 'beside',
+    'under', 'over', 'through', 'into', 'onto', 'toward', 'towards'
+]
+_SPATIAL_PATTERN = [
+    {"RIGHT_ID": "prep", "RIGHT_ATTRS": {"DEP": "prep", "LOWER": {"IN": _SPATIAL_PREPOSITIONS}}},
+    {
+        "LEFT_ID": "prep", "REL_OP": ">", "RIGHT_ID": "object",
+        "RIGHT_ATTRS": {"DEP": "pobj", "POS": {"IN": ["NOUN", "PROPN"]}},
+    },
+]
+
+
+def _first_positions(text: str, patterns, automaton=None) -> Dict[str, int]:
+    """Start index of the first occurrence of each pattern found in text (one pass with Aho-Corasick)."""
+    positions = {}
+    if automaton is not None:
+        # Matches arrive ordered by end index, so the first hit per pattern is its earliest
+        for end, pattern in automaton.iter(text):
+            positions.setdefault(pattern, end - len(pattern) + 1)
+        return positions
+    for pattern in patterns:
+        idx = text.find(pattern)
+        if idx != -1:
+            positions[pattern] = idx
+    return positions
+
+
 class VisualGroundingFilter:
     """
     Pre-filters video segments using visual object/action grounding
@@ -56,70 +278,33 @@ class VisualGroundingFilter:
         self.settings = get_settings()
         
         # Initialize Redis for caching (optional)
-        self.redis_client = None
-        try:
-            self.redis_client = redis.Redis(
-                host=self.settings.redis.host,
-                port=self.settings.redis.port,
-                db=self.settings.redis.db,
-                password=self.settings.redis.password if self.settings.redis.password else None,
-                decode_responses=True
-            )
-            self.redis_client.ping()
-            print("✅ Redis connected for visual grounding cache.", flush=True)
-        except Exception as e:
-            print(f"⚠️ Redis not available for grounding cache: {e}", flush=True)
-            self.redis_client = None
-        
-        # Action verb categories for visual verification
-        # These help match script verbs to visual actions
-        self.action_verbs = {
-            'motion': {
-                'walk', 'run', 'jump', 'fly', 'swim', 'climb', 'fall', 'move',
-                'step', 'sprint', 'dash', 'leap', 'dive', 'crawl', 'slide',
-                'roll', 'tumble', 'stumble', 'stagger', 'rush', 'hurry'
-            },
-            'interaction': {
-                'grab', 'hold', 'throw', 'catch', 'push', 'pull', 'lift',
-                'carry', 'drop', 'pick', 'place', 'put', 'take', 'give',
-                'hand', 'pass', 'toss', 'release', 'grip', 'grasp'
-            },
-            'combat': {
-                'punch', 'kick', 'slash', 'block', 'dodge', 'attack', 'fight',
-                'strike', 'hit', 'swing', 'stab', 'shoot', 'fire', 'aim',
-                'defend', 'counter', 'parry', 'evade', 'charge', 'lunge'
-            },
-            'transformation': {
-                'open', 'close', 'break', 'build', 'create', 'destroy',
-                'transform', 'change', 'morph', 'shatter', 'explode', 'collapse',
-                'assemble', 'disassemble', 'repair', 'fix', 'unlock', 'lock'
-            },
-            'communication': {
-                'speak', 'shout', 'whisper', 'listen', 'read', 'write',
-                'talk', 'yell', 'scream', 'cry', 'laugh', 'smile', 'frown',
-                'nod', 'shake', 'gesture', 'point', 'wave', 'signal'
-            },
-            'perception': {
-                'look', 'see', 'watch', 'stare', 'glance', 'gaze', 'observe',
-                'notice', 'spot', 'find', 'discover', 'search', 'scan'
-            },
-            'state_change': {
-                'stand', 'sit', 'lie', 'kneel', 'crouch', 'lean', 'turn',
-                'face', 'enter', 'exit', 'leave', 'arrive', 'appear', 'disappear',
-                'emerge', 'vanish', 'rise', 'lower', 'raise'
-            }
-        }
+        self.redis_client = _get_redis_client(self.settings)
+        
+        # Bounds Memories.ai request rate on top of the per-pass concurrency semaphore
+        self._limiter = _RateLimiter(
+            getattr(config, 'grounding_requests_per_second', 10.0),
+            getattr(config, 'grounding_request_burst', 1)
+        )
+        
+        # Parsed requirements keyed by _requirements_key() (see _cached_requirements)
+        self._requirements_cache: Dict[str, Dict] = {}
+        # Response-scan automata keyed by their pattern set (see _requirement_patterns)
+        self._pattern_automata: Dict[frozenset, object] = {}
         
-        # Create reverse lookup: verb -> category
-        self.verb_to_category = {}
-        for category, verbs in self.action_verbs.items():
-            for verb in verbs:
-                self.verb_to_category[verb] = category
+        # Action verb categories (module-level tables, shared by every instance)
+        self.action_verbs = _ACTION_VERBS
+        self.verb_to_category = _VERB_TO_CATEGORY
+        self.all_action_verbs = _ALL_ACTION_VERBS
         
-        # Get all action verbs as a flat set
-        self.all_action_verbs = set()
-        for verbs in self.action_verbs.values():
-            self.all_action_verbs.update(verbs)
+        # Matchers run inside spaCy's Cython loop: action verbs labelled by category,
+        # and spatial preposition/object pairs from the dependency parse
+        self._verb_matcher, self._spatial_matcher = _get_matchers()
+        
+        # Dependency labels (as StringStore ids) of verbs that can head a WHO-DOES-WHAT binding
+        self._binding_dep_ids = np.array([
+            self.nlp.vocab.strings.add(dep)
+            for dep in ("ROOT", "conj", "advcl", "relcl", "ccomp", "xcomp")
+        ], dtype=np.uint64)
         
         print(f"👁️ VisualGroundingFilter initialized with {len(self.all_action_verbs)} action verbs", flush=True)
 
@@ -138,8 +323,118 @@ class VisualGroundingFilter:
         Returns:
             Dict with required_objects, required_actions, spatial_relations, required_states, agent_action_bindings
         """
-        doc = self.nlp(script_segment)
+        requirements = self._cached_requirements(script_segment)
+        if requirements is None:
+            requirements = self._requirements_from_doc(self.nlp(script_segment), script_segment)
+            self._store_requirements(script_segment, requirements)
+        return requirements
+    
+    def extract_visual_requirements_batch(self, segments: List[str]) -> List[Dict]:
+        """
+        Extract visual requirements for many script segments at once.
+        
+        Segments are parsed through nlp.pipe() so spaCy can batch its work instead
+        of running the pipeline once per segment (across several processes once
+        there are at least grounding_mp_threshold uncached segments).
+        
+        Args:
+            segments: Script texts to analyze
+            
+        Returns:
+            One requirements dict per segment, in input order
+        """
+        results = [self._cached_requirements(segment) for segment in segments]
+        pending = list(dict.fromkeys(seg for seg, req in zip(segments, results) if req is None))
+        
+        batch_size = getattr(self.config, 'grounding_nlp_batch_size', 32)
+        # Large batches are split across worker processes; below the threshold IPC costs more than it saves
+        n_process = 1
+        if len(pending) >= getattr(self.config, 'grounding_mp_threshold', 64):
+            n_process = max(1, min((os.cpu_count() or 1) - 1, 4))
+        
+        parsed = {}
+        for segment, doc in zip(pending, self.nlp.pipe(pending, batch_size=batch_size, n_process=n_process)):
+            parsed[segment] = self._requirements_from_doc(doc, segment)
+            self._store_requirements(segment, parsed[segment])
+        
+        return [
+            req if req is not None else dict(parsed[segment])
+            for segment, req in zip(segments, results)
+        ]
+    
+    _REQUIREMENTS_CACHE_SIZE = 2048
+    _REQUIREMENTS_CACHE_TTL = 7 * 24 * 60 * 60
+    _REQUIREMENT_SETS = ('required_objects', 'required_actions', 'action_categories', 'required_states')
+    # Bump when _requirements_from_doc's output changes so stale Redis entries aren't served
+    _REQUIREMENTS_SCHEMA_VERSION = 2
+    
+    def _requirements_key(self, script_segment: str) -> str:
+        """Cache key for script_segment's requirements: schema version, binding flag and md5 of the text."""
+        # Bindings are only extracted with grounding_requires_action_binding on
+        bindings = int(bool(getattr(self.config, 'grounding_requires_action_binding', True)))
+        script_hash = hashlib.md5(script_segment.encode()).hexdigest()
+        return f"v{self._REQUIREMENTS_SCHEMA_VERSION}:b{bindings}:{script_hash}"
+    
+    def _cached_requirements(self, script_segment: str) -> Optional[Dict]:
+        """
+        Previously extracted requirements for script_segment (in-process first, then Redis).
+        
+        Returns a shallow copy of the frozen cached dict (see _freeze_requirements),
+        or None on a miss.
+        """
+        script_hash = self._requirements_key(script_segment)
+        requirements = self._requirements_cache.get(script_hash)
         
+        if requirements is None and self.redis_client:
+            try:
+                cached = self.redis_client.get(f"grounding:req:{script_hash}")
+                if cached:
+                    requirements = self._freeze_requirements(_loads_json(cached))
+                    self._remember_requirements(script_hash, requirements)
+            except Exception:
+                requirements = None
+        
+        return dict(requirements) if requirements is not None else None
+    
+    def _store_requirements(self, script_segment: str, requirements: Dict):
+        """Cache freshly extracted (frozen) requirements in-process and in Redis."""
+        script_hash = self._requirements_key(script_segment)
+        self._remember_requirements(script_hash, requirements)
+        
+        if self.redis_client:
+            try:
+                payload = dict(requirements)
+                for field in self._REQUIREMENT_SETS:
+                    payload[field] = sorted(payload[field])
+                self.redis_client.setex(
+                    f"grounding:req:{script_hash}", self._REQUIREMENTS_CACHE_TTL, _dumps_json(payload)
+                )
+            except Exception:
+                pass
+    
+    def _remember_requirements(self, script_hash: str, requirements: Dict):
+        """Insert into the in-process cache, evicting the oldest entries past its size limit."""
+        self._requirements_cache[script_hash] = requirements
+        while len(self._requirements_cache) > self._REQUIREMENTS_CACHE_SIZE:
+            self._requirements_cache.pop(next(iter(self._requirements_cache)))
+    
+    def _freeze_requirements(self, requirements: Dict) -> Dict:
+        """
+        Make a requirements dict safe to share between callers.
+        
+        Set fields become frozensets and list fields tuples, so the cached dict
+        can be handed out by reference (plus a shallow top-level copy) instead
+        of deep-copied per lookup. Binding and spatial entries stay plain dicts
+        and are read-only by convention.
+        """
+        for field in self._REQUIREMENT_SETS:
+            requirements[field] = frozenset(requirements[field])
+        for field in ('spatial_relations', 'agent_action_bindings'):
+            requirements[field] = tuple(requirements.get(field, ()))
+        return requirements
+    
+    def _requirements_from_doc(self, doc, script_segment: str) -> Dict:
+        """Build the requirements dict for an already-parsed script segment."""
         requirements = {
             'required_objects': set(),
             'required_actions': set(),
@@ -150,51 +445,48 @@ class VisualGroundingFilter:
             'raw_text': script_segment
         }
         
-        for token in doc:
-            # Extract objects (nouns, proper nouns)
-            if token.pos_ in ['NOUN', 'PROPN'] and not token.is_stop:
-                lemma = token.lemma_.lower()
-                # Filter out very common/generic nouns
-                if len(lemma) > 2 and lemma not in {'way', 'thing', 'time', 'moment', 'day'}:
-                    requirements['required_objects'].add(lemma)
-            
-            # Extract actions (verbs)
-            if token.pos_ == 'VERB' and not token.is_stop:
-                action = token.lemma_.lower()
-                # Filter auxiliary verbs
-                if action not in {'be', 'have', 'do', 'will', 'would', 'could', 'should', 'may', 'might', 'can'}:
-                    requirements['required_actions'].add(action)
-                    
-                    # Categorize action for better matching
-                    if action in self.verb_to_category:
-                        requirements['action_categories'].add(self.verb_to_category[action])
-            
-            # Extract spatial prepositions with their objects
-            if token.dep_ == 'prep' and token.text.lower() in {
-                'in', 'on', 'near', 'behind', 'above', 'below', 'beside',
-                'under', 'over', 'through', 'into', 'onto', 'toward', 'towards'
-            }:
-                # Find the object of the preposition
-                for child in token.children:
-                    if child.dep_ == 'pobj' and child.pos_ in ['NOUN', 'PROPN']:
-                        requirements['spatial_relations'].append({
-                            'preposition': token.text.lower(),
-                            'object': child.lemma_.lower()
-                        })
-            
-            # Extract states (adjectives)
-            if token.pos_ == 'ADJ' and not token.is_stop:
-                state = token.text.lower()
-                # Filter common/non-visual adjectives
-                if state not in {'good', 'bad', 'new', 'old', 'great', 'little', 'big', 'small'}:
-                    requirements['required_states'].add(state)
+        # Filter on POS/stopword flags in NumPy, then touch only the surviving tokens
+        pos, is_stop = doc.to_array([POS, IS_STOP]).T
+        content = is_stop == 0
+        
+        # Extract objects (nouns, proper nouns)
+        for i in np.flatnonzero(((pos == NOUN) | (pos == PROPN)) & content).tolist():
+            lemma = doc[i].lemma_.lower()
+            # Filter out very common/generic nouns
+            if len(lemma) > 2 and lemma not in _GENERIC_NOUNS:
+                requirements['required_objects'].add(lemma)
+        
+        # Extract actions (verbs)
+        for i in np.flatnonzero((pos == VERB) & content).tolist():
+            action = doc[i].lemma_.lower()
+            # Filter auxiliary verbs
+            if action not in _AUX_VERBS:
+                requirements['required_actions'].add(action)
+        
+        # Extract states (adjectives)
+        for i in np.flatnonzero((pos == ADJ) & content).tolist():
+            state = doc[i].text.lower()
+            # Filter common/non-visual adjectives
+            if state not in _NON_VISUAL_ADJ:
+                requirements['required_states'].add(state)
+        
+        # Categorize actions for better matching
+        for match_id, _, _ in self._verb_matcher(doc):
+            requirements['action_categories'].add(self.nlp.vocab.strings[match_id])
+        
+        # Extract spatial prepositions with their objects (in document order)
+        for _, (prep_i, object_i) in sorted(self._spatial_matcher(doc), key=lambda match: match[1]):
+            requirements['spatial_relations'].append({
+                'preposition': doc[prep_i].text.lower(),
+                'object': doc[object_i].lemma_.lower()
+            })
         
         # NEW: Extract agent-action bindings (WHO-DOES-WHAT)
         # This is critical for preventing the binding hallucination problem
         if getattr(self.config, 'grounding_requires_action_binding', True):
             requirements['agent_action_bindings'] = self._extract_agent_action_bindings(doc)
         
-        return requirements
+        return self._freeze_requirements(requirements)
     
     def _extract_agent_action_bindings(self, doc) -> List[Dict]:
         """
@@ -212,42 +504,49 @@ class VisualGroundingFilter:
         """
         bindings = []
         
-        for token in doc:
-            if token.pos_ == "VERB" and token.dep_ in ("ROOT", "conj", "advcl", "relcl", "ccomp", "xcomp"):
-                action = token.lemma_.lower()
-                
-                # Skip auxiliary verbs
-                if action in {'be', 'have', 'do', 'will', 'would', 'could', 'should', 'may', 'might', 'can'}:
-                    continue
-                
-                # Find subject (agent) - the one DOING the action
-                agents = []
-                for child in token.children:
-                    if child.dep_ in ("nsubj", "nsubjpass"):
-                        # Get full noun phrase for the agent
-                        agent_phrase = " ".join([w.text for w in child.subtree])
-                        agents.append(agent_phrase.strip())
-                
-                # Find object (patient) - the one RECEIVING the action
-                patients = []
-                for child in token.children:
-                    if child.dep_ in ("dobj", "pobj", "attr", "iobj"):
-                        patient_phrase = " ".join([w.text for w in child.subtree])
-                        patients.append(patient_phrase.strip())
-                
-                # Create bindings for each agent
-                for agent in agents:
-                    binding = {
-                        'agent': agent,
-                        'action': action,
-                        'patient': patients[0] if patients else None,
-                        'full_phrase': f"{agent} {token.text}" + (f" {patients[0]}" if patients else "")
-                    }
-                    bindings.append(binding)
+        pos, dep = doc.to_array([POS, DEP]).T
+        candidates = np.flatnonzero((pos == VERB) & np.isin(dep, self._binding_dep_ids)).tolist()
+        
+        for token in (doc[i] for i in candidates):
+            action = token.lemma_.lower()
+            
+            # Skip auxiliary verbs
+            if action in _AUX_VERBS:
+                continue
+            
+            # Find subject (agent) - the one DOING the action
+            agents = []
+            for child in token.children:
+                if child.dep_ in ("nsubj", "nsubjpass"):
+                    # Get full noun phrase for the agent (contiguous edge-to-edge span)
+                    agent_phrase = doc[child.left_edge.i:child.right_edge.i + 1].text
+                    agents.append(agent_phrase.strip())
+            
+            # Find object (patient) - the one RECEIVING the action
+            patients = []
+            for child in token.children:
+                if child.dep_ in ("dobj", "pobj", "attr", "iobj"):
+                    patient_phrase = doc[child.left_edge.i:child.right_edge.i + 1].text
+                    patients.append(patient_phrase.strip())
+            
+            # Create bindings for each agent
+            for agent in agents:
+                binding = {
+                    'agent': agent,
+                    'action': action,
+                    'patient': patients[0] if patients else None,
+                    'full_phrase': f"{agent} {token.text}" + (f" {patients[0]}" if patients else "")
+                }
+                bindings.append(binding)
         
         return bindings[:5]  # Limit to 5 most important bindings
 
-    def _build_targeted_visual_query(self, timestamp: float, requirements: Dict) -> str:
+    def _build_targeted_visual_query(
+        self,
+        timestamp: float,
+        requirements: Dict,
+        template: Optional[List[str]] = None
+    ) -> str:
         """
         Build Memories.ai prompt focused on specific visual elements from script.
         
@@ -258,10 +557,43 @@ class VisualGroundingFilter:
         Args:
             timestamp: The timestamp to query
             requirements: Dict from _extract_visual_requirements()
+            template: Result of _build_query_template(requirements), when the
+                caller queries several frames for the same requirements
             
         Returns:
             Targeted prompt string for Memories.ai
         """
+        if template is None:
+            template = self._build_query_template(requirements)
+        return f"{timestamp:.2f}".join(template)
+    
+    def _build_query_template(self, requirements: Dict) -> List[str]:
+        """
+        The parts of the targeted prompt that don't depend on the frame.
+        
+        Returns:
+            Prompt text split at each place the timestamp goes
+        """
+        return [
+            "At timestamp ",
+            " seconds, provide a FACTUAL INVENTORY:\n\n"
+            + self._build_query_checklist(requirements)
+            + "\n\nBe LITERAL. Only describe what is directly visible at ",
+            "s.\nDo NOT infer, interpret, or fill gaps with context."
+        ]
+    
+    def _build_batch_query_instructions(self, requirements: Dict) -> str:
+        """Instructions for answering the targeted checklist for several frames in one request."""
+        return (
+            "For each segment below, provide a FACTUAL INVENTORY of what is visible in it:\n\n"
+            + self._build_query_checklist(requirements)
+            + "\n\nBe LITERAL. Only describe what is directly visible in each segment.\n"
+            "Do NOT infer, interpret, or fill gaps with context.\n"
+            "Answer every segment's checklist as one string."
+        )
+    
+    def _build_query_checklist(self, requirements: Dict) -> str:
+        """The numbered object/action/layout/state (and binding) checklist shared by all prompts."""
         objects_str = ', '.join(requirements['required_objects']) if requirements['required_objects'] else "any visible characters or objects"
         actions_str = ', '.join(requirements['required_actions']) if requirements['required_actions'] else "any actions"
         
@@ -292,9 +624,7 @@ class VisualGroundingFilter:
    IMPORTANT: If Agent A is doing Action X but script claims Agent B is doing Action X,
    mark the binding as INVALID and explain the mismatch."""
         
-        return f"""At timestamp {timestamp:.2f} seconds, provide a FACTUAL INVENTORY:
-
-1. OBJECT PRESENCE CHECK:
+        return f"""1. OBJECT PRESENCE CHECK:
    Looking specifically for: {objects_str}
    - Which of these objects/characters are VISIBLE in the frame?
    - List ONLY what you can actually see, not inferred ones
@@ -312,11 +642,43 @@ class VisualGroundingFilter:
 
 4. VISUAL STATES:
    - What is the condition/state of key objects? (open/closed, standing/sitting, etc.)
-{binding_section}
-
-Be LITERAL. Only describe what is directly visible at {timestamp:.2f}s.
-Do NOT infer, interpret, or fill gaps with context."""
+{binding_section}"""
 
+    _PATTERN_AUTOMATA_SIZE = 256
+    
+    def _requirement_patterns(self, requirements: Dict):
+        """
+        Every string _parse_visual_response looks for, plus an automaton matching them all.
+        
+        Covers required objects, actions and their category synonyms, states and
+        binding agents. The automaton is built once per pattern set and reused for
+        every frame response checked against the same requirements.
+        """
+        patterns = {obj.lower() for obj in requirements['required_objects']}
+        for action in requirements['required_actions']:
+            action_lower = action.lower()
+            patterns.add(action_lower)
+            if action_lower in self.verb_to_category:
+                patterns.update(self.action_verbs[self.verb_to_category[action_lower]])
+        patterns.update(state.lower() for state in requirements['required_states'])
+        patterns.update(b.get('agent', '').lower() for b in requirements.get('agent_action_bindings', []))
+        patterns.discard('')
+        patterns = frozenset(patterns)
+        
+        if not AHOCORASICK_AVAILABLE or not patterns:
+            return patterns, None
+        
+        automaton = self._pattern_automata.get(patterns)
+        if automaton is None:
+            automaton = ahocorasick.Automaton()
+            for pattern in patterns:
+                automaton.add_word(pattern, pattern)
+            automaton.make_automaton()
+            self._pattern_automata[patterns] = automaton
+            while len(self._pattern_automata) > self._PATTERN_AUTOMATA_SIZE:
+                self._pattern_automata.pop(next(iter(self._pattern_automata)))
+        return patterns, automaton
+    
     def _parse_visual_response(self, response: str, requirements: Dict) -> Dict:
         """
         Parse Memories.ai response to extract detected elements.
@@ -331,6 +693,8 @@ Do NOT infer, interpret, or fill gaps with context."""
             Dict with detected objects, actions, states, binding_results
         """
         response_lower = response.lower()
+        # First mention of every requirement pattern, from a single pass over the response
+        positions = _first_positions(response_lower, *self._requirement_patterns(requirements))
         
         frame_data = {
             'objects': set(),
@@ -346,10 +710,9 @@ Do NOT infer, interpret, or fill gaps with context."""
         for obj in requirements['required_objects']:
             # Look for object mention AND confirmation it's visible
             # Avoid false positives where "NOT VISIBLE" follows the object
-            obj_lower = obj.lower()
-            if obj_lower in response_lower:
+            obj_idx = positions.get(obj.lower())
+            if obj_idx is not None:
                 # Check if "not visible" appears near the object mention
-                obj_idx = response_lower.find(obj_lower)
                 context_after = response_lower[obj_idx:obj_idx + 50]
                 context_before = response_lower[max(0, obj_idx - 30):obj_idx]
                 
@@ -360,7 +723,9 @@ Do NOT infer, interpret, or fill gaps with context."""
         # NEW: Parse agent-action binding results
         bindings = requirements.get('agent_action_bindings', [])
         if bindings:
-            frame_data['binding_results'] = self._parse_binding_results(response, bindings)
+            frame_data['binding_results'] = self._parse_binding_results(
+                response, bindings, positions, response_lower=response_lower
+            )
             frame_data['binding_valid_count'] = sum(
                 1 for b in frame_data['binding_results'] if b.get('is_valid', False)
             )
@@ -372,38 +737,32 @@ Do NOT infer, interpret, or fill gaps with context."""
         for action in requirements['required_actions']:
             action_lower = action.lower()
             
-            # Direct match
-            if action_lower in response_lower:
+            # Direct match (also covers -ing/-ed forms like "punching", which contain the base)
+            if action_lower in positions:
                 frame_data['actions'].add(action)
                 continue
             
             # Check for synonyms within same category
             if action_lower in self.verb_to_category:
                 category = self.verb_to_category[action_lower]
-                for synonym in self.action_verbs[category]:
-                    if synonym in response_lower:
-                        # Map back to the required action
-                        frame_data['actions'].add(action)
-                        break
-            
-            # Check for -ing forms (e.g., "punch" -> "punching")
-            ing_form = action_lower + 'ing'
-            if ing_form in response_lower:
-                frame_data['actions'].add(action)
-            
-            # Check for -ed forms
-            ed_form = action_lower + 'ed'
-            if ed_form in response_lower:
-                frame_data['actions'].add(action)
+                if any(synonym in positions for synonym in self.action_verbs[category]):
+                    # Map back to the required action
+                    frame_data['actions'].add(action)
         
         # Check for states
         for state in requirements['required_states']:
-            if state.lower() in response_lower:
+            if state.lower() in positions:
                 frame_data['states'].add(state)
         
         return frame_data
     
-    def _parse_binding_results(self, response: str, bindings: List[Dict]) -> List[Dict]:
+    def _parse_binding_results(
+        self,
+        response: str,
+        bindings: List[Dict],
+        positions: Optional[Dict[str, int]] = None,
+        response_lower: Optional[str] = None
+    ) -> List[Dict]:
         """
         Parse agent-action binding validation results from the response.
         
@@ -413,13 +772,21 @@ Do NOT infer, interpret, or fill gaps with context."""
         Args:
             response: Raw response from Memories.ai
             bindings: List of agent-action bindings to check
+            positions: First-mention index per pattern from _first_positions(), if
+                already computed for this response
+            response_lower: response.lower(), if the caller already has it
             
         Returns:
             List of binding result dicts with 'agent', 'action', 'is_valid', 'reason'
         """
-        response_lower = response.lower()
+        if response_lower is None:
+            response_lower = response.lower()
         results = []
         
+        # One find() per distinct agent (bindings often share an agent)
+        if positions is None:
+            positions = _first_positions(response_lower, {b.get('agent', '').lower() for b in bindings})
+        
         for binding in bindings:
             agent = binding.get('agent', '').lower()
             action = binding.get('action', '').lower()
@@ -432,21 +799,27 @@ Do NOT infer, interpret, or fill gaps with context."""
             }
             
             # Look for explicit "Binding valid: YES/NO" near the agent mention
-            if agent in response_lower:
-                agent_idx = response_lower.find(agent)
+            agent_idx = positions.get(agent, 0 if not agent else None)
+            if agent_idx is not None:
                 # Look in a window around the agent mention
                 window_start = max(0, agent_idx - 50)
                 window_end = min(len(response_lower), agent_idx + 200)
                 context = response_lower[window_start:window_end]
                 
+                # Which kinds of marker appear anywhere in the window: 'yes', 'no' or 'negated'
+                markers = {
+                    m.group(1) or ('no' if m.group(2) else 'negated')
+                    for m in _BINDING_MARKER_RE.finditer(context)
+                }
+                
                 # Check for explicit binding validity markers
-                if 'binding valid: yes' in context or 'binding: yes' in context:
+                if 'yes' in markers:
                     result['is_valid'] = True
                     result['reason'] = 'Explicit binding validation passed'
-                elif 'binding valid: no' in context or 'binding: no' in context or 'binding invalid' in context:
+                elif 'no' in markers:
                     result['is_valid'] = False
                     result['reason'] = 'Explicit binding validation failed'
-                elif 'not visible' in context or 'cannot see' in context:
+                elif 'negated' in markers:
                     result['is_valid'] = False
                     result['reason'] = f'Agent "{binding.get("agent")}" not visible'
                 elif action in context:
@@ -469,6 +842,45 @@ Do NOT infer, interpret, or fill gaps with context."""
         
         return results
 
+    def _has_no_visual_requirements(self, requirements: Dict) -> bool:
+        """True when _compute_grounding_score would score nothing (and so return 1.0) for any analysis."""
+        bindings_scored = (
+            bool(requirements.get('agent_action_bindings'))
+            and getattr(self.config, 'grounding_requires_action_binding', True)
+        )
+        return not (
+            requirements['required_objects']
+            or requirements['required_actions']
+            or requirements['required_states']
+            or bindings_scored
+        )
+    
+    def _requirements_covered(self, requirements: Dict, analysis: Dict) -> bool:
+        """
+        True once more frames can no longer change _compute_grounding_score.
+        
+        Object, action and state recall only grow as frames are added, so once
+        every required set is detected the score is fixed at 1.0. The binding
+        score can still drop on a later invalid binding, so clips it scores are
+        never considered covered.
+        """
+        if requirements.get('agent_action_bindings') and getattr(self.config, 'grounding_requires_action_binding', True):
+            return False
+        return (
+            requirements['required_objects'] <= analysis['detected_objects']
+            and requirements['required_actions'] <= analysis['detected_actions']
+            and requirements['required_states'] <= analysis['detected_states']
+        )
+    
+    def _frames_cover_requirements(self, requirements: Dict, frames: List[Dict]) -> bool:
+        """_requirements_covered() for the detections merged from frames (frame_data dicts)."""
+        covered = {'detected_objects': set(), 'detected_actions': set(), 'detected_states': set()}
+        for frame_data in frames:
+            covered['detected_objects'].update(frame_data.get('objects', set()))
+            covered['detected_actions'].update(frame_data.get('actions', set()))
+            covered['detected_states'].update(frame_data.get('states', set()))
+        return self._requirements_covered(requirements, covered)
+    
     def _compute_grounding_score(self, requirements: Dict, analysis: Dict) -> float:
         """
         Compute how well the clip is grounded in required visual elements.
@@ -486,21 +898,25 @@ Do NOT infer, interpret, or fill gaps with context."""
         Returns:
             Grounding score between 0.0 and 1.0
         """
+        # (score, weight) per applicable component; weights are summed as they're added
         scores = []
+        total_weight = 0.0
         
         # Object grounding (30% weight - reduced)
         if requirements['required_objects']:
             detected = analysis.get('detected_objects', set())
             required = requirements['required_objects']
             object_recall = len(detected & required) / len(required)
-            scores.append(('objects', object_recall, 0.30))
+            scores.append((object_recall, 0.30))
+            total_weight += 0.30
         
         # Action grounding (30% weight - reduced)
         if requirements['required_actions']:
             detected = analysis.get('detected_actions', set())
             required = requirements['required_actions']
             action_recall = len(detected & required) / len(required)
-            scores.append(('actions', action_recall, 0.30))
+            scores.append((action_recall, 0.30))
+            total_weight += 0.30
         
         # NEW: Agent-action binding grounding (25% weight - critical)
         # This verifies WHO is doing WHAT, not just that objects/actions exist
@@ -522,45 +938,185 @@ Do NOT infer, interpret, or fill gaps with context."""
                 if binding_invalid_count > 0:
                     binding_score *= 0.7  # 30% penalty for any invalid binding
                 
-                scores.append(('bindings', binding_score, 0.25))
+                scores.append((binding_score, 0.25))
+                total_weight += 0.25
         
         # State grounding (15% weight - reduced)
         if requirements['required_states']:
             detected = analysis.get('detected_states', set())
             required = requirements['required_states']
             state_recall = len(detected & required) / len(required)
-            scores.append(('states', state_recall, 0.15))
+            scores.append((state_recall, 0.15))
+            total_weight += 0.15
         
         # Weighted average
-        if not scores:
-            return 1.0  # No specific requirements, all clips are valid
-        
-        # Normalize weights
-        total_weight = sum(weight for _, _, weight in scores)
         if total_weight == 0:
-            return 1.0
-        
-        normalized_scores = [(name, score, weight / total_weight) for name, score, weight in scores]
-        final_score = sum(score * norm_weight for _, score, norm_weight in normalized_scores)
+            return 1.0  # No specific requirements, all clips are valid
         
-        return final_score
+        # Normalize weights in the same pass (same arithmetic order, so scores sitting
+        # exactly on a threshold land on the same side as before)
+        return sum(score * (weight / total_weight) for score, weight in scores)
 
     def _get_cache_key(self, video_no: str, timestamp: float, requirements: Dict) -> str:
         """Generate cache key for grounding query."""
-        # Create hash of requirements for cache key
-        req_str = json.dumps({
-            'objects': sorted(requirements['required_objects']),
-            'actions': sorted(requirements['required_actions'])
-        }, sort_keys=True)
-        req_hash = hashlib.md5(req_str.encode()).hexdigest()[:8]
+        # Create hash of requirements for cache key (64-bit BLAKE2b of a canonical string)
+        req_str = "|".join(sorted(requirements['required_objects'])) + "#" + "|".join(sorted(requirements['required_actions']))
+        req_hash = hashlib.blake2b(req_str.encode(), digest_size=8).hexdigest()
         return f"grounding:{video_no}:{timestamp:.2f}:{req_hash}"
+    
+    def _get_clip_cache_key(self, video_no: str, start_time: float, end_time: float, requirements: Dict) -> str:
+        """Generate cache key for a whole clip's aggregated grounding analysis."""
+        # States and bindings change the aggregate (not just the frame prompt), so they're hashed
+        # too, as is the frame count (grounding_sample_frames decides how many frames are merged)
+        req_str = "#".join([
+            "|".join(sorted(requirements['required_objects'])),
+            "|".join(sorted(requirements['required_actions'])),
+            "|".join(sorted(requirements['required_states'])),
+            "|".join(sorted(b['full_phrase'] for b in requirements.get('agent_action_bindings', []))),
+            f"n{len(self._sample_times(start_time, end_time))}"
+        ])
+        req_hash = hashlib.blake2b(req_str.encode(), digest_size=8).hexdigest()
+        return f"grounding:clip:{video_no}:{start_time:.2f}:{end_time:.2f}:{req_hash}"
+    
+    def _fetch_cached_clips(self, cache_keys: List[str]) -> Dict[str, Dict]:
+        """
+        Look up cached clip analyses with a single MGET.
+        
+        Returns:
+            Dict mapping each cache key that hit to an analysis dict shaped like
+            _analyze_clip_visual_content()'s (without per-frame detail)
+        """
+        cached_clips = {}
+        if not self.redis_client or not cache_keys:
+            return cached_clips
+        
+        try:
+            cached_values = self.redis_client.mget(cache_keys)
+        except Exception:
+            return cached_clips
+        
+        for key, cached in zip(cache_keys, cached_values):
+            if not cached:
+                continue
+            try:
+                clip_data = _loads_json(cached)
+            except Exception:
+                continue
+            cached_clips[key] = {
+                'detected_objects': set(clip_data.get('detected_objects', [])),
+                'detected_actions': set(clip_data.get('detected_actions', [])),
+                'detected_states': set(clip_data.get('detected_states', [])),
+                'binding_valid_count': clip_data.get('binding_valid_count', 0),
+                'binding_invalid_count': clip_data.get('binding_invalid_count', 0),
+                'binding_results': [],
+                'frame_analyses': [],
+                'cache_hits': 1,
+                'api_calls': 0,
+                'query_errors': 0
+            }
+        return cached_clips
+    
+    def _cache_clips(self, clips: List[tuple]):
+        """Write (cache_key, analysis) pairs to Redis with one pipelined round-trip."""
+        if not self.redis_client or not clips:
+            return
+        
+        try:
+            with self.redis_client.pipeline(transaction=False) as pipe:
+                for cache_key, analysis in clips:
+                    cache_data = {
+                        'detected_objects': list(analysis['detected_objects']),
+                        'detected_actions': list(analysis['detected_actions']),
+                        'detected_states': list(analysis['detected_states']),
+                        'binding_valid_count': analysis['binding_valid_count'],
+                        'binding_invalid_count': analysis['binding_invalid_count']
+                    }
+                    pipe.setex(cache_key, 7 * 24 * 60 * 60, _dumps_json(cache_data))
+                pipe.execute()
+        except Exception:
+            pass
+    
+    def _cache_frames(self, frames: List[tuple]):
+        """Write (cache_key, frame_data) pairs to Redis with one pipelined round-trip."""
+        if not self.redis_client or not frames:
+            return
+        
+        try:
+            with self.redis_client.pipeline(transaction=False) as pipe:
+                for cache_key, frame_data in frames:
+                    cache_data = {
+                        'objects': list(frame_data['objects']),
+                        'actions': list(frame_data['actions']),
+                        'states': list(frame_data['states']),
+                        'binding_results': frame_data.get('binding_results', []),
+                        'binding_valid_count': frame_data.get('binding_valid_count', 0),
+                        'binding_invalid_count': frame_data.get('binding_invalid_count', 0)
+                    }
+                    # The prose response is never read back after parsing; keep a snippet only for debugging
+                    if getattr(self.config, 'grounding_store_raw_response', False):
+                        cache_data['raw_response'] = frame_data.get('raw_response', '')[:512]
+                    pipe.setex(cache_key, 24 * 60 * 60, _dumps_json(cache_data))
+                pipe.execute()
+        except Exception:
+            pass
+    
+    def _sample_times(self, start_time: float, end_time: float) -> List[float]:
+        """Frame timestamps to analyze for a clip (more samples for longer clips)."""
+        duration = end_time - start_time
+        
+        # Sample frames depending on duration
+        sample_count = getattr(self.config, 'grounding_sample_frames', 3)
+        if duration < 3:
+            sample_count = min(2, sample_count)
+        elif duration > 10:
+            sample_count = min(5, sample_count + 1)
+        
+        # Evenly spaced like np.linspace, without allocating an array for 2-5 floats
+        if sample_count < 2:
+            return [start_time][:sample_count]
+        step = (end_time - start_time) / (sample_count - 1)
+        return [start_time + i * step for i in range(sample_count - 1)] + [end_time]
+    
+    def _fetch_cached_frames(self, cache_keys: List[str]) -> Dict[str, Dict]:
+        """
+        Look up cached frame analyses with a single MGET.
+        
+        Returns:
+            Dict mapping each cache key that hit to its decoded frame data
+        """
+        cached_frames = {}
+        if not self.redis_client or not cache_keys:
+            return cached_frames
+        
+        try:
+            cached_values = self.redis_client.mget(cache_keys)
+        except Exception:
+            return cached_frames
+        
+        for key, cached in zip(cache_keys, cached_values):
+            if not cached:
+                continue
+            try:
+                frame_data = _loads_json(cached)
+            except Exception:
+                continue
+            # Convert lists back to sets
+            frame_data['objects'] = set(frame_data.get('objects', []))
+            frame_data['actions'] = set(frame_data.get('actions', []))
+            frame_data['states'] = set(frame_data.get('states', []))
+            cached_frames[key] = frame_data
+        return cached_frames
 
     async def _analyze_clip_visual_content(
         self,
         video_no: str,
         start_time: float,
         end_time: float,
-        requirements: Dict
+        requirements: Dict,
+        cached_frames: Optional[Dict[str, Dict]] = None,
+        semaphore: Optional[asyncio.Semaphore] = None,
+        batched_frames: Optional[Dict[str, Dict]] = None,
+        inflight: Optional[Dict[str, asyncio.Future]] = None
     ) -> Dict:
         """
         Get DETAILED visual analysis of clip focusing on required elements.
@@ -571,21 +1127,18 @@ Do NOT infer, interpret, or fill gaps with context."""
             start_time: Clip start time
             end_time: Clip end time
             requirements: Visual requirements from script
+            cached_frames: Frame analyses already fetched by _fetch_cached_frames();
+                looked up here with one MGET when omitted
+            semaphore: Bounds in-flight Memories.ai queries (shared across clips by
+                filter_candidates_by_visual_grounding); grounding_concurrency when omitted
+            batched_frames: Frames already answered by _query_frames_batch(); only
+                frames missing from both dicts get their own query
+            inflight: Per-frame queries shared between clips by cache key, so
+                overlapping candidates that sample the same frame query it once
             
         Returns:
             Dict with detected_objects, detected_actions, detected_states, frame_analyses
         """
-        duration = end_time - start_time
-        
-        # Sample frames depending on duration
-        sample_count = getattr(self.config, 'grounding_sample_frames', 3)
-        if duration < 3:
-            sample_count = min(2, sample_count)
-        elif duration > 10:
-            sample_count = min(5, sample_count + 1)
-        
-        sample_times = np.linspace(start_time, end_time, sample_count)
-        
         analysis = {
             'detected_objects': set(),
             'detected_actions': set(),
@@ -595,34 +1148,38 @@ Do NOT infer, interpret, or fill gaps with context."""
             'binding_results': [],
             'frame_analyses': [],
             'cache_hits': 0,
-            'api_calls': 0
+            'api_calls': 0,
+            'query_errors': 0
         }
         
-        # Process each sample frame
-        for timestamp in sample_times:
-            # Check cache first
-            cache_key = self._get_cache_key(video_no, timestamp, requirements)
-            cached_result = None
-            
-            if self.redis_client:
-                try:
-                    cached_result = self.redis_client.get(cache_key)
-                    if cached_result:
-                        frame_data = json.loads(cached_result)
-                        # Convert lists back to sets
-                        frame_data['objects'] = set(frame_data.get('objects', []))
-                        frame_data['actions'] = set(frame_data.get('actions', []))
-                        frame_data['states'] = set(frame_data.get('states', []))
-                        analysis['cache_hits'] += 1
-                except Exception:
-                    cached_result = None
+        # Nothing to look for: _compute_grounding_score gives 1.0 regardless of what the frames show
+        if self._has_no_visual_requirements(requirements):
+            return analysis
+        
+        sample_times = self._sample_times(start_time, end_time)
+        cache_keys = [self._get_cache_key(video_no, t, requirements) for t in sample_times]
+        if cached_frames is None:
+            cached_frames = self._fetch_cached_frames(cache_keys)
+        if batched_frames is None:
+            batched_frames = {}
+        if inflight is None:
+            inflight = {}
+        pending_writes = []
+        
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(getattr(self.config, 'grounding_concurrency', 8))
+        
+        # The prompt only varies by timestamp across a clip's frames
+        query_template = self._build_query_template(requirements)
+        
+        async def query_frame(timestamp: float, cache_key: str):
+            """Query Memories.ai for one uncached frame; returns (frame_data, api_call_succeeded)."""
+            # Build targeted prompt
+            prompt = self._build_targeted_visual_query(timestamp, requirements, query_template)
             
-            if cached_result is None:
-                # Build targeted prompt
-                prompt = self._build_targeted_visual_query(timestamp, requirements)
-                
-                # Query Memories.ai
-                try:
+            # Query Memories.ai
+            try:
+                async with semaphore, self._limiter:
                     response = await self.memories.get_visual_description(
                         video_no=video_no,
                         start_time=max(0, timestamp - 0.5),
@@ -630,31 +1187,56 @@ Do NOT infer, interpret, or fill gaps with context."""
                         unique_id=f"grounding_{video_no}",
                         custom_prompt=prompt
                     )
-                    analysis['api_calls'] += 1
-                    
-                    # Parse response
-                    frame_data = self._parse_visual_response(response, requirements)
-                    
-                    # Cache the result
-                    if self.redis_client:
-                        try:
-                            cache_data = {
-                                'objects': list(frame_data['objects']),
-                                'actions': list(frame_data['actions']),
-                                'states': list(frame_data['states']),
-                                'binding_results': frame_data.get('binding_results', []),
-                                'binding_valid_count': frame_data.get('binding_valid_count', 0),
-                                'binding_invalid_count': frame_data.get('binding_invalid_count', 0),
-                                'raw_response': frame_data.get('raw_response', '')
-                            }
-                            self.redis_client.setex(cache_key, 24 * 60 * 60, json.dumps(cache_data))
-                        except Exception:
-                            pass
-                            
-                except Exception as e:
-                    print(f"    ⚠️ Grounding query error at {timestamp:.1f}s: {e}", flush=True)
-                    frame_data = {'objects': set(), 'actions': set(), 'states': set(), 
-                                  'binding_results': [], 'binding_valid_count': 0, 'binding_invalid_count': 0}
+                
+                # Parse response
+                frame_data = self._parse_visual_response(response, requirements)
+                
+                # Cache the result (written with the rest of the clip's frames below)
+                pending_writes.append((cache_key, frame_data))
+                return frame_data, True
+                        
+            except Exception as e:
+                print(f"    ⚠️ Grounding query error at {timestamp:.1f}s: {e}", flush=True)
+                return {'objects': set(), 'actions': set(), 'states': set(), 
+                        'binding_results': [], 'binding_valid_count': 0, 'binding_invalid_count': 0}, False
+        
+        # Stop before any new query when the frames already in hand (cache hits and
+        # batch answers) detect everything required; the rest can't raise the score
+        known = [
+            (timestamp, cache_key) for timestamp, cache_key in zip(sample_times, cache_keys)
+            if cache_key in cached_frames or cache_key in batched_frames
+        ]
+        if len(known) < len(sample_times) and self._frames_cover_requirements(requirements, [
+            cached_frames.get(cache_key) or batched_frames[cache_key] for _, cache_key in known
+        ]):
+            sample_times, cache_keys = (list(col) for col in zip(*known))
+        
+        # Query every uncached frame concurrently (bounded by the shared semaphore), joining
+        # a query another clip already started for the same frame instead of repeating it
+        owned = set()
+        frame_queries = []
+        for timestamp, cache_key in zip(sample_times, cache_keys):
+            if cache_key in cached_frames or cache_key in batched_frames:
+                continue
+            if cache_key not in inflight:
+                inflight[cache_key] = asyncio.ensure_future(query_frame(timestamp, cache_key))
+                owned.add(cache_key)
+            frame_queries.append(inflight[cache_key])
+        fresh_frames = iter(await asyncio.gather(*frame_queries))
+        
+        # Aggregate in sample order
+        for timestamp, cache_key in zip(sample_times, cache_keys):
+            frame_data = cached_frames.get(cache_key)
+            if frame_data is not None:
+                analysis['cache_hits'] += 1
+            elif cache_key in batched_frames:
+                frame_data = batched_frames[cache_key]
+            else:
+                frame_data, queried = next(fresh_frames)
+                if cache_key in owned:
+                    analysis['api_calls'] += int(queried)
+                    owned.discard(cache_key)
+                analysis['query_errors'] += int(not queried)
             
             analysis['frame_analyses'].append({
                 'timestamp': timestamp,
@@ -671,14 +1253,74 @@ Do NOT infer, interpret, or fill gaps with context."""
             analysis['binding_invalid_count'] += frame_data.get('binding_invalid_count', 0)
             analysis['binding_results'].extend(frame_data.get('binding_results', []))
         
+        # Flush this clip's cache writes in one round-trip
+        self._cache_frames(pending_writes)
+        
         return analysis
 
+    async def _query_frames_batch(
+        self,
+        video_no: str,
+        frames: Dict[str, float],
+        requirements: Dict,
+        semaphore: asyncio.Semaphore
+    ) -> tuple:
+        """
+        Answer many uncached frames with batched Memories.ai chat requests.
+        
+        Frames are sent grounding_batch_size at a time, each as a 1-second
+        segment around its timestamp, with the same checklist as the per-frame
+        prompt. Parsed results are cached like per-frame answers.
+        
+        Args:
+            frames: Cache key -> timestamp for every frame to query
+            requirements: Visual requirements from script
+            semaphore: Shared limit on in-flight Memories.ai requests
+            
+        Returns:
+            Tuple of (cache key -> frame data for each frame a batch answered,
+            number of batch requests made). Frames whose answer came back empty
+            (including every frame of a reply that wasn't an exact JSON array)
+            are left out, and not cached, so the per-frame path queries them.
+        """
+        batch_size = max(1, getattr(self.config, 'grounding_batch_size', 10))
+        items = list(frames.items())
+        chunks = [items[i:i + batch_size] for i in range(0, len(items), batch_size)]
+        instructions = self._build_batch_query_instructions(requirements)
+        
+        async def query_chunk(chunk):
+            async with semaphore, self._limiter:
+                return await self.memories.get_visual_description_batch(
+                    video_no=video_no,
+                    batch_segments=[(max(0, t - 0.5), t + 0.5) for _, t in chunk],
+                    unique_id=f"grounding_{video_no}",
+                    instructions=instructions,
+                    # The checklist answer is multi-line and numbered, so a newline
+                    # split would smear one frame's answer across several frames
+                    strict=True
+                )
+        
+        responses = await asyncio.gather(*[query_chunk(c) for c in chunks], return_exceptions=True)
+        
+        batched_frames = {}
+        for chunk, descriptions in zip(chunks, responses):
+            if isinstance(descriptions, Exception):
+                print(f"    ⚠️ Grounding batch query error: {descriptions}", flush=True)
+                continue
+            for (cache_key, _), response in zip(chunk, descriptions):
+                if response:
+                    batched_frames[cache_key] = self._parse_visual_response(response, requirements)
+        
+        self._cache_frames(list(batched_frames.items()))
+        return batched_frames, len(chunks)
+
     async def filter_candidates_by_visual_grounding(
         self,
         script_segment: str,
         video_no: str,
         candidate_clips: List[Dict],
-        min_grounding_score: float = None
+        min_grounding_score: float = None,
+        requirements: Optional[Dict] = None
     ) -> List[Dict]:
         """
         Filter candidates by checking if they actually contain
@@ -691,6 +1333,8 @@ Do NOT infer, interpret, or fill gaps with context."""
             video_no: Video identifier
             candidate_clips: List of candidate clip dicts
             min_grounding_score: Minimum score to pass (default from config)
+            requirements: Pre-extracted requirements for script_segment (e.g. from
+                extract_visual_requirements_batch); parsed on demand when omitted
             
         Returns:
             List of candidates that passed visual grounding filter
@@ -699,7 +1343,8 @@ Do NOT infer, interpret, or fill gaps with context."""
             min_grounding_score = getattr(self.config, 'grounding_score_threshold', 0.65)
         
         # Step 1: Extract visual requirements from script
-        requirements = self._extract_visual_requirements(script_segment)
+        if requirements is None:
+            requirements = self._extract_visual_requirements(script_segment)
         
         # If no specific visual requirements, skip filtering
         if not requirements['required_objects'] and not requirements['required_actions']:
@@ -709,69 +1354,156 @@ Do NOT infer, interpret, or fill gaps with context."""
                 candidate['grounding_details'] = {'skipped': True}
             return candidate_clips
         
-        print(f"    🔍 Grounding filter: objects={list(requirements['required_objects'])[:5]}, actions={list(requirements['required_actions'])[:3]}", flush=True)
+        # Opt-in: too few candidates for grounding to change the pick (a lone candidate is
+        # used even when it fails), so skip the Memories.ai round-trips. The clip is
+        # unverified, so it gets no grounding_score and the matcher's neutral default
+        # applies - which scores it above the 0.3 fallback a failed clip would get, hence
+        # grounding_min_candidates defaults to 0
+        if 0 < len(candidate_clips) <= getattr(self.config, 'grounding_min_candidates', 0):
+            print(f"    ℹ️ Only {len(candidate_clips)} candidate(s), skipping grounding filter", flush=True)
+            for candidate in candidate_clips:
+                candidate.pop('grounding_score', None)
+                candidate['grounding_details'] = {'skipped': True}
+            return candidate_clips
+        
+        print(f"    🔍 Grounding filter: objects={list(islice(requirements['required_objects'], 5))}, actions={list(islice(requirements['required_actions'], 3))}", flush=True)
         
         # Step 2: Check each candidate for visual grounding
-        grounded_candidates = []
         rejected_count = 0
         total_api_calls = 0
         total_cache_hits = 0
         
-        # Process candidates with rate limiting
-        semaphore = asyncio.Semaphore(3)  # Max 3 concurrent Memories.ai requests
+        # Clips analyzed before (this process or another) skip frame lookups and queries entirely
+        clip_keys = [
+            self._get_clip_cache_key(video_no, c['start_time'], c['end_time'], requirements)
+            for c in candidate_clips
+        ]
+        cached_clips = self._fetch_cached_clips(clip_keys)
+        uncached_clips = [c for c, key in zip(candidate_clips, clip_keys) if key not in cached_clips]
         
-        async def analyze_candidate(candidate):
-            async with semaphore:
-                start = candidate['start_time']
-                end = candidate['end_time']
-                
-                # Get dense visual analysis for this clip
-                visual_analysis = await self._analyze_clip_visual_content(
-                    video_no, start, end, requirements
+        # Look up every remaining candidate's cached frames with one MGET before any Memories.ai call
+        cached_frames = self._fetch_cached_frames([
+            self._get_cache_key(video_no, t, requirements)
+            for c in uncached_clips
+            for t in self._sample_times(c['start_time'], c['end_time'])
+        ])
+        
+        # Rate limit Memories.ai frame queries across all candidates
+        semaphore = asyncio.Semaphore(getattr(self.config, 'grounding_concurrency', 8))
+        # Per-frame queries shared across candidates (overlapping windows often sample the same frame)
+        inflight = {}
+        
+        # Answer the frames the cache missed with batched requests; the per-clip
+        # analysis below only queries frames a batch left unanswered
+        batched_frames = {}
+        if getattr(self.config, 'grounding_batch_queries', True):
+            uncached = {}
+            for c in uncached_clips:
+                frame_keys = {
+                    self._get_cache_key(video_no, t, requirements): t
+                    for t in self._sample_times(c['start_time'], c['end_time'])
+                }
+                # Clips whose cached frames already detect everything required skip their
+                # remaining frames (see _analyze_clip_visual_content), so don't batch them
+                if self._frames_cover_requirements(
+                    requirements, [cached_frames[k] for k in frame_keys if k in cached_frames]
+                ):
+                    continue
+                for cache_key, t in frame_keys.items():
+                    if cache_key not in cached_frames:
+                        uncached.setdefault(cache_key, t)
+            if len(uncached) > 1:
+                batched_frames, batch_calls = await self._query_frames_batch(
+                    video_no, uncached, requirements, semaphore
                 )
+                total_api_calls += batch_calls
+        
+        async def analyze_candidate(candidate, clip_key):
+            """Analyze and score one candidate; None when its analysis failed."""
+            start = candidate['start_time']
+            end = candidate['end_time']
+            
+            try:
+                # Get dense visual analysis for this clip
+                visual_analysis = cached_clips.get(clip_key)
+                if visual_analysis is None:
+                    visual_analysis = await self._analyze_clip_visual_content(
+                        video_no, start, end, requirements, cached_frames, semaphore, batched_frames, inflight
+                    )
                 
                 # Compute grounding score
                 grounding_score = self._compute_grounding_score(requirements, visual_analysis)
+            except Exception as e:
+                print(f"    ⚠️ Grounding analysis error: {e}", flush=True)
+                return None
+            
+            return {
+                'candidate': candidate,
+                'grounding_score': grounding_score,
+                'visual_analysis': visual_analysis
+            }
+        
+        # Analyze candidates through a bounded window (grounding_concurrency in flight) and
+        # settle each as it finishes, so rejected clips' analyses are freed before later
+        # clips start instead of every result buffering until the last one completes
+        window = max(1, getattr(self.config, 'grounding_concurrency', 8))
+        queued = iter(enumerate(zip(candidate_clips, clip_keys)))
+        pending = {}
+        passed = {}
+        clip_writes = []
+        while True:
+            for index, (candidate, clip_key) in queued:
+                pending[asyncio.ensure_future(analyze_candidate(candidate, clip_key))] = (index, clip_key)
+                if len(pending) >= window:
+                    break
+            if not pending:
+                break
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            
+            for task in done:
+                index, clip_key = pending.pop(task)
+                result = task.result()
+                if result is None:
+                    continue
                 
-                return {
-                    'candidate': candidate,
-                    'grounding_score': grounding_score,
-                    'visual_analysis': visual_analysis
-                }
+                candidate = result['candidate']
+                grounding_score = result['grounding_score']
+                visual_analysis = result['visual_analysis']
+                
+                total_api_calls += visual_analysis.get('api_calls', 0)
+                total_cache_hits += visual_analysis.get('cache_hits', 0)
+                
+                # Remember fully answered clips; a frame that errored may answer differently next time
+                if clip_key not in cached_clips and not visual_analysis.get('query_errors'):
+                    clip_writes.append((clip_key, {
+                        key: visual_analysis[key] for key in (
+                            'detected_objects', 'detected_actions', 'detected_states',
+                            'binding_valid_count', 'binding_invalid_count'
+                        )
+                    }))
+                
+                if grounding_score >= min_grounding_score:
+                    candidate['grounding_score'] = grounding_score
+                    candidate['grounding_details'] = {
+                        'detected_objects': list(visual_analysis['detected_objects']),
+                        'detected_actions': list(visual_analysis['detected_actions']),
+                        'detected_states': list(visual_analysis['detected_states']),
+                        'required_objects': list(requirements['required_objects']),
+                        'required_actions': list(requirements['required_actions'])
+                    }
+                    passed[index] = candidate
+                else:
+                    rejected_count += 1
+                    # Log rejected candidates for debugging
+                    if getattr(self.config, 'enable_validation_debug', False):
+                        print(f"    ❌ REJECTED (grounding={grounding_score:.2f}): {candidate['start_time']:.1f}-{candidate['end_time']:.1f}s", flush=True)
+                        print(f"       Required: obj={list(islice(requirements['required_objects'], 3))}, act={list(islice(requirements['required_actions'], 3))}", flush=True)
+                        print(f"       Found: obj={list(visual_analysis['detected_objects'])[:3]}, act={list(visual_analysis['detected_actions'])[:3]}", flush=True)
         
-        # Analyze all candidates
-        tasks = [analyze_candidate(c) for c in candidate_clips]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        self._cache_clips(clip_writes)
         
-        for result in results:
-            if isinstance(result, Exception):
-                print(f"    ⚠️ Grounding analysis error: {result}", flush=True)
-                continue
-            
-            candidate = result['candidate']
-            grounding_score = result['grounding_score']
-            visual_analysis = result['visual_analysis']
-            
-            total_api_calls += visual_analysis.get('api_calls', 0)
-            total_cache_hits += visual_analysis.get('cache_hits', 0)
-            
-            if grounding_score >= min_grounding_score:
-                candidate['grounding_score'] = grounding_score
-                candidate['grounding_details'] = {
-                    'detected_objects': list(visual_analysis['detected_objects']),
-                    'detected_actions': list(visual_analysis['detected_actions']),
-                    'detected_states': list(visual_analysis['detected_states']),
-                    'required_objects': list(requirements['required_objects']),
-                    'required_actions': list(requirements['required_actions'])
-                }
-                grounded_candidates.append(candidate)
-            else:
-                rejected_count += 1
-                # Log rejected candidates for debugging
-                if getattr(self.config, 'enable_validation_debug', False):
-                    print(f"    ❌ REJECTED (grounding={grounding_score:.2f}): {candidate['start_time']:.1f}-{candidate['end_time']:.1f}s", flush=True)
-                    print(f"       Required: obj={list(requirements['required_objects'])[:3]}, act={list(requirements['required_actions'])[:3]}", flush=True)
-                    print(f"       Found: obj={list(visual_analysis['detected_objects'])[:3]}, act={list(visual_analysis['detected_actions'])[:3]}", flush=True)
+        # Keep the caller's candidate order regardless of completion order
+        grounded_candidates = [passed[index] for index in sorted(passed)]
         
         print(f"    ✅ Grounding: {len(grounded_candidates)}/{len(candidate_clips)} passed (API calls: {total_api_calls}, cache hits: {total_cache_hits})", flush=True)
         
@@ -18,6 +18,8 @@ import redis
 from app.config import get_settings
 from app.services.memories_client import MemoriesAIClient
 
+# Only _extract_entities reads doc.ents; every other parse skips the NER pass.
+_NO_NER = ["ner"]
 
 class VisualTemporalValidator:
     """
@@ -505,7 +507,7 @@ Be concise and factual."""
             return {'has_direction_conflicts': False, 'conflicts': [], 'penalty': 0.0}
         
         # Extract action verbs from script
-        script_doc = self.nlp(script_text)
+        script_doc = self.nlp(script_text, disable=_NO_NER)
         script_verbs = []
         for token in script_doc:
             if token.pos_ == "VERB":
@@ -518,7 +520,7 @@ Be concise and factual."""
             if not frame.get('description'):
                 continue
             
-            frame_doc = self.nlp(frame['description'])
+            frame_doc = self.nlp(frame['description'], disable=_NO_NER)
             frame_verbs = [token.lemma_.lower() for token in frame_doc if token.pos_ == "VERB"]
             
             for script_verb in script_verbs:
@@ -557,15 +559,13 @@ Be concise and factual."""
         if not text:
             return {'actions': [], 'states': [], 'temporal_markers': []}
         
-        doc = self.nlp(text)
+        doc = self.nlp(text, disable=_NO_NER)
         
         actions = []
         for token in doc:
             if token.pos_ == "VERB":
-                # Get verb with its modifiers
-                action_phrase = " ".join([
-                    child.text for child in token.subtree
-                ])
+                # Get verb with its modifiers (contiguous edge-to-edge span)
+                action_phrase = doc[token.left_edge.i:token.right_edge.i + 1].text
                 actions.append(action_phrase.lower())
         
         # Also extract state indicators
@@ -768,7 +768,7 @@ Be concise and factual."""
         if not text or not entity:
             return "not mentioned"
         
-        doc = self.nlp(text)
+        doc = self.nlp(text, disable=_NO_NER)
         
         # Find sentences mentioning the entity
         entity_sentences = [
@@ -782,7 +782,7 @@ Be concise and factual."""
         # Extract state descriptors (adjectives, prepositions, verbs)
         state_words = []
         for sent in entity_sentences:
-            sent_doc = self.nlp(sent)
+            sent_doc = self.nlp(sent, disable=_NO_NER)
             for token in sent_doc:
                 if token.pos_ in ['ADJ', 'ADP', 'VERB']:
                     # Check if related to the entity
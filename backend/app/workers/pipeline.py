@@ -35,13 +35,13 @@ from app.config import get_settings
 from app.models import JobStatus
 from app.services.job_manager import JobManager
 from app.services.storage import StorageService
-from app.services.memories_client import MemoriesAIClient
+from app.services.memories_client import MemoriesAIClient, close_shared_http_client
 from app.services.script_generator import ScriptGenerator
 from app.services.elevenlabs_client import ElevenLabsClient
 from app.services.video_editor import VideoEditorService
-from app.services.video_compressor import VideoCompressor
+from app.services.video_compressor import get_video_compressor
 from app.services.audio_segmenter import AudioSegmenter
-from app.services.video_converter import VideoConverterService
+from app.services.video_converter import get_video_converter
 from app.services.copyright_protector import CopyrightProtector, ProtectedScene
 from app.services.character_extractor import CharacterExtractor
 from app.services.character_database import CharacterDatabase
@@ -194,9 +194,9 @@ class PipelineWorker:
         self.script_generator = ScriptGenerator()
         self.elevenlabs = ElevenLabsClient()
         self.video_editor = VideoEditorService()
-        self.video_compressor = VideoCompressor()
+        self.video_compressor = get_video_compressor()
         self.audio_segmenter = AudioSegmenter()
-        self.video_converter = VideoConverterService()
+        self.video_converter = get_video_converter()
         self.character_extractor = CharacterExtractor()
     
     def _clean_narrations(self, narrations: List[str]) -> List[str]:
@@ -810,6 +810,14 @@ class PipelineWorker:
         Args:
             job_id: The job ID to process
         """
+        try:
+            await self._process_job(job_id)
+        finally:
+            # Each job runs under its own asyncio.run() loop; drop the keep-alive
+            # client so its pooled connections don't outlive the loop.
+            await close_shared_http_client()
+
+    async def _process_job(self, job_id: str):
         job_data = self.job_manager.get_job(job_id)
         if not job_data:
             print(f"Job {job_id} not found")
@@ -2139,33 +2147,23 @@ class PipelineWorker:
                             )
                             protected_scenes.append(fallback_scene)
                     
-                    # Stitch protected scenes
-                    raw_output_path = os.path.join(work_dir, "raw_recap.mp4")
-                    await asyncio.to_thread(
-                        self.video_editor.elastic_stitch_protected_scenes,
-                        stitch_video,
-                        protected_scenes,
-                        raw_output_path
-                    )
-                    
-                    # Apply final post-processing transforms
+                    # Stitch protected scenes with the final post-processing transforms
+                    # applied inside the stitch encode (no separate re-encode pass)
                     import random
                     output_path = os.path.join(work_dir, "final_recap.mp4")
-                    await asyncio.to_thread(
-                        self.video_editor.apply_post_transforms,
-                        raw_output_path,
-                        output_path,
+                    post_filter = self.video_editor.post_transform_filter(
                         brightness=random.uniform(0.97, 1.03),
                         saturation=random.uniform(0.97, 1.03),
                         contrast=random.uniform(0.98, 1.02),
                         hue_shift=random.uniform(-2, 2)
                     )
-                    
-                    # Cleanup raw output
-                    try:
-                        os.remove(raw_output_path)
-                    except:
-                        pass
+                    await asyncio.to_thread(
+                        self.video_editor.elastic_stitch_protected_scenes,
+                        stitch_video,
+                        protected_scenes,
+                        output_path,
+                        post_filter=post_filter
+                    )
                     
                     print(f"✅ Copyright protection complete", flush=True)
                     print(f"{'='*60}\n", flush=True)
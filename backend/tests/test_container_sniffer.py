@@ -0,0 +1,85 @@
+import os
+import struct
+import tempfile
+import unittest
+
+
+from app.services.container_sniffer import probe_mp4, sniff_video_codec
+
+
+def _box(box_type: bytes, payload: bytes = b"") -> bytes:
+    return struct.pack(">I4s", 8 + len(payload), box_type) + payload
+
+
+def _trak(handler: bytes, fourcc: bytes) -> bytes:
+    hdlr = _box(b"hdlr", b"\x00" * 8 + handler + b"\x00" * 12)
+    stsd = _box(b"stsd", b"\x00" * 4 + struct.pack(">I", 1) + _box(fourcc, b"\x00" * 16))
+    minf = _box(b"minf", _box(b"stbl", stsd))
+    return _box(b"trak", _box(b"mdia", hdlr + minf))
+
+
+class TestSniffVideoCodec(unittest.TestCase):
+    def _write(self, data: bytes) -> str:
+        fd, path = tempfile.mkstemp()
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        self.addCleanup(os.remove, path)
+        return path
+
+    def test_mp4_video_track_after_audio_and_mdat(self) -> None:
+        ftyp = _box(b"ftyp", b"isom" + b"\x00" * 4)
+        moov = _box(b"moov", _trak(b"soun", b"mp4a") + _trak(b"vide", b"avc1"))
+        path = self._write(ftyp + _box(b"mdat", b"\x00" * 64) + moov)
+        self.assertEqual(sniff_video_codec(path), "h264")
+
+    def test_mp4_hevc(self) -> None:
+        ftyp = _box(b"ftyp", b"mp42" + b"\x00" * 4)
+        path = self._write(ftyp + _box(b"moov", _trak(b"vide", b"hvc1")))
+        self.assertEqual(sniff_video_codec(path), "hevc")
+
+    def test_webm_codec_id(self) -> None:
+        head = b"\x1a\x45\xdf\xa3" + b"\x00" * 32 + b"\x86\x85V_VP9" + b"\x00" * 16
+        self.assertEqual(sniff_video_codec(self._write(head)), "vp9")
+
+    def test_unknown_container_returns_none(self) -> None:
+        self.assertIsNone(sniff_video_codec(self._write(b"RIFF" + b"\x00" * 64)))
+        self.assertIsNone(sniff_video_codec("/nonexistent/file.mp4"))
+
+
+class TestProbeMp4(unittest.TestCase):
+    def _write(self, data: bytes) -> str:
+        fd, path = tempfile.mkstemp()
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        self.addCleanup(os.remove, path)
+        return path
+
+    def _moov(self) -> bytes:
+        mvhd = _box(b"mvhd", b"\x00" * 12 + struct.pack(">II", 1000, 10000))
+        mdhd = _box(b"mdhd", b"\x00" * 12 + struct.pack(">II", 30000, 300300))
+        hdlr = _box(b"hdlr", b"\x00" * 8 + b"vide" + b"\x00" * 12)
+        avc1 = _box(b"avc1", b"\x00" * 24 + struct.pack(">HH", 1920, 1080) + b"\x00" * 50)
+        stsd = _box(b"stsd", b"\x00" * 4 + struct.pack(">I", 1) + avc1)
+        stts = _box(b"stts", b"\x00" * 4 + struct.pack(">III", 1, 300, 1001))
+        minf = _box(b"minf", _box(b"stbl", stsd + stts))
+        trak = _box(b"trak", _box(b"mdia", mdhd + hdlr + minf))
+        return _box(b"moov", mvhd + trak)
+
+    def test_moov_after_mdat(self) -> None:
+        ftyp = _box(b"ftyp", b"isom" + b"\x00" * 4)
+        data = ftyp + _box(b"mdat", b"\x00" * 1000) + self._moov()
+        info = probe_mp4(self._write(data))
+        self.assertEqual(info["format"]["duration"], "10.000000")
+        self.assertEqual(int(info["format"]["bit_rate"]), len(data) * 8 // 10)
+        self.assertEqual(info["streams"][0]["codec_name"], "h264")
+        self.assertEqual((info["streams"][0]["width"], info["streams"][0]["height"]), (1920, 1080))
+        self.assertEqual(info["streams"][0]["r_frame_rate"], "30000/1001")
+        self.assertEqual(info["audio_streams"], [])
+
+    def test_non_mp4_returns_none(self) -> None:
+        self.assertIsNone(probe_mp4(self._write(b"\x1a\x45\xdf\xa3" + b"\x00" * 64)))
+        self.assertIsNone(probe_mp4("/nonexistent/file.mp4"))
+
+
+if __name__ == "__main__":
+    unittest.main()
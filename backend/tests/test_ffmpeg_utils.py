@@ -0,0 +1,26 @@
+import unittest
+
+
+from app.services.ffmpeg_utils import parse_ffmpeg_progress
+
+
+class TestParseFFmpegProgress(unittest.TestCase):
+    def test_returns_last_block(self) -> None:
+        output = (
+            "frame=10\nout_time_us=400000\nprogress=continue\n"
+            "frame=250\ntotal_size=1048576\nout_time_us=10000000\nprogress=end\n"
+        )
+        stats = parse_ffmpeg_progress(output)
+        self.assertIsNotNone(stats)
+        self.assertEqual(stats["progress"], "end")
+        self.assertEqual(stats["total_size"], "1048576")
+        self.assertEqual(stats["out_time_us"], "10000000")
+        self.assertEqual(stats["frame"], "250")
+
+    def test_none_without_progress_output(self) -> None:
+        self.assertIsNone(parse_ffmpeg_progress(""))
+        self.assertIsNone(parse_ffmpeg_progress("frame=  10 fps=0.0 q=28.0 size=0kB"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import importlib.util
+import unittest
+
+
+# The module imports spaCy at load time; these helpers never touch a model
+if importlib.util.find_spec("spacy") is not None:
+    from app.services import visual_grounding_filter as vgf
+else:
+    vgf = None
+
+
+def _bare_filter():
+    """A VisualGroundingFilter with only the attributes the text helpers read (no model load)."""
+    grounding = vgf.VisualGroundingFilter.__new__(vgf.VisualGroundingFilter)
+    grounding.action_verbs = vgf._ACTION_VERBS
+    grounding.verb_to_category = vgf._VERB_TO_CATEGORY
+    grounding._pattern_automata = {}
+    return grounding
+
+
+@unittest.skipUnless(vgf is not None, "spacy not installed")
+class TestFirstPositions(unittest.TestCase):
+    TEXT = "a dog runs past the dog house while the cat sleeps"
+    PATTERNS = frozenset({"dog", "dog house", "cat", "horse"})
+    EXPECTED = {"dog": 2, "dog house": 20, "cat": 40}
+
+    def test_substring_scan(self) -> None:
+        self.assertEqual(vgf._first_positions(self.TEXT, self.PATTERNS), self.EXPECTED)
+
+    @unittest.skipUnless(vgf is not None and vgf.AHOCORASICK_AVAILABLE, "pyahocorasick not installed")
+    def test_automaton_matches_substring_scan(self) -> None:
+        requirements = {
+            "required_objects": ["Dog", "dog house", "cat", "horse"],
+            "required_actions": [],
+            "required_states": [],
+        }
+        patterns, automaton = _bare_filter()._requirement_patterns(requirements)
+        self.assertIsNotNone(automaton)
+        self.assertEqual(patterns, self.PATTERNS)
+        self.assertEqual(vgf._first_positions(self.TEXT, patterns, automaton), self.EXPECTED)
+
+    def test_empty_text(self) -> None:
+        self.assertEqual(vgf._first_positions("", self.PATTERNS), {})
+
+
+@unittest.skipUnless(vgf is not None, "spacy not installed")
+class TestParseBindingResults(unittest.TestCase):
+    BINDINGS = [{"agent": "man", "action": "running"}]
+
+    def _parse(self, response: str) -> dict:
+        return _bare_filter()._parse_binding_results(response, self.BINDINGS)[0]
+
+    def test_yes_beats_no_and_negation(self) -> None:
+        result = self._parse("The man is not visible at first. Binding valid: NO. Later: binding valid: yes")
+        self.assertIs(result["is_valid"], True)
+        self.assertEqual(result["reason"], "Explicit binding validation passed")
+
+    def test_no_beats_negation(self) -> None:
+        result = self._parse("The man cannot see the road. Binding invalid.")
+        self.assertIs(result["is_valid"], False)
+        self.assertEqual(result["reason"], "Explicit binding validation failed")
+
+    def test_negation_alone(self) -> None:
+        result = self._parse("The man running is not visible in this frame.")
+        self.assertIs(result["is_valid"], False)
+        self.assertEqual(result["reason"], 'Agent "man" not visible')
+
+    def test_binding_not_visible_is_explicit_no(self) -> None:
+        # "binding: no" and "not visible" overlap; the explicit marker wins
+        result = self._parse("A man running. Binding: not visible.")
+        self.assertIs(result["is_valid"], False)
+        self.assertEqual(result["reason"], "Explicit binding validation failed")
+
+    def test_action_in_context_without_markers(self) -> None:
+        self.assertIs(self._parse("A man running down the street.")["is_valid"], True)
+        self.assertIs(self._parse("A man sitting instead of running.")["is_valid"], False)
+
+    def test_agent_not_mentioned(self) -> None:
+        result = self._parse("A dog running. Binding valid: yes")
+        self.assertIs(result["is_valid"], False)
+        self.assertEqual(result["reason"], 'Agent "man" not mentioned in response')
+
+
+if __name__ == "__main__":
+    unittest.main()